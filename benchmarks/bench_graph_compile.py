@@ -0,0 +1,40 @@
+"""Per-call graph setup cost: fresh `build_graph()` vs the shared `get_graph()` registry.
+
+    python benchmarks/bench_graph_compile.py --calls 200
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")  # clients are never called here
+
+from echodraft.graph.builder import build_graph, get_graph, clear_graphs
+
+
+def _per_call_ms(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=200)
+    args = ap.parse_args()
+
+    clear_graphs()
+    before = _per_call_ms(build_graph, args.calls)
+    t0 = time.perf_counter()
+    get_graph()  # first call compiles (warm-up)
+    warm = (time.perf_counter() - t0) * 1000
+    after = _per_call_ms(get_graph, args.calls)
+
+    print(f"build_graph() per call : {before:9.3f} ms")
+    print(f"get_graph() warm-up    : {warm:9.3f} ms (once per process)")
+    print(f"get_graph() per call   : {after:9.3f} ms")
+    print(f"saved over {args.calls} calls : {(before - after) * args.calls:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""End-to-end CLI paths against a fake chat model: EchoDraft's own overhead, no network.
+
+    python benchmarks/bench_offline.py --n 50 --latency 0.05 --jitter 0.02
+    python benchmarks/bench_offline.py --only triage,learn-edits --latency 0 --json out.json
+    python benchmarks/bench_offline.py --only triage-single,triage-packed --triage-dataset datasets/triage.jsonl
+
+Each path reports throughput, p50/p95/p99 latency and the mean time per op spent
+outside the (simulated) model — the part a regression would show up in.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+os.environ["ECHODRAFT_HOME"] = tempfile.mkdtemp(prefix="echodraft_bench_")  # before echodraft imports
+os.environ["ECHODRAFT_REPORTS_DIR"] = os.path.join(os.environ["ECHODRAFT_HOME"], "reports")
+
+from echodraft import config, llm
+from echodraft.evaluation.fake_llm import use_fake_llms
+from echodraft.memory import llm_cache, telemetry
+
+WORDS = ("team ship friday quick note hey regards please update launch metrics customer "
+         "we will the a to honestly cheers onboarding pricing roadmap").split()
+SURFACES = ("email", "notion", "linkedin", "blog")
+STYLES = ("professional", "persuasive", "story")
+
+
+def _text(rng, lines: int, words: int = 14) -> str:
+    out = []
+    for i in range(lines):
+        if i % 12 == 0:
+            out.append(f"## {rng.choice(WORDS).title()} {i // 12 + 1}")
+        out.append(" ".join(rng.choice(WORDS) for _ in range(words)))
+    return "\n".join(out)
+
+
+def _item(rng, i: int) -> dict:
+    # realistic sizes: a Notion page / email thread of ~30-150 lines
+    return {"surface": rng.choice(SURFACES), "title": f"Item {i}: {rng.choice(WORDS)} {rng.choice(WORDS)}",
+            "content": _text(rng, rng.randint(30, 150)), "label": "REVIEW"}
+
+
+def _edit(rng, doc: str) -> str:
+    lines = doc.splitlines()
+    for i in range(len(lines)):
+        if rng.random() < 0.2:
+            lines[i] = lines[i].replace(rng.choice(WORDS), rng.choice(WORDS))
+    return "\n".join(lines)
+
+
+def _pct(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(round(p / 100 * (len(sorted_vals) - 1))))]
+
+
+def _llm_calls() -> int:
+    return sum(getattr(c, "calls", 0) for c in llm._clients.values())
+
+
+def _llm_in_tokens(since: float) -> int:
+    return sum(e.get("in_tok", 0) for e in telemetry.iter_events(since) if e["kind"] == "llm")
+
+
+def _run(name: str, fn, inputs: list, items_per_op: int, model_s: float) -> dict:
+    lat = []
+    calls0 = _llm_calls()
+    since = time.time()
+    start = time.perf_counter()
+    for x in inputs:
+        t = time.perf_counter()
+        fn(x)
+        lat.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    calls = (_llm_calls() - calls0) / max(1, len(inputs))
+    in_tok = _llm_in_tokens(since) / max(1, len(inputs) * items_per_op)
+    lat.sort()
+    mean = elapsed / max(1, len(inputs))
+    return {"path": name, "ops": len(inputs), "items_per_s": round(len(inputs) * items_per_op / elapsed, 1),
+            "p50_ms": round(_pct(lat, 50) * 1000, 2), "p95_ms": round(_pct(lat, 95) * 1000, 2),
+            "p99_ms": round(_pct(lat, 99) * 1000, 2), "llm_calls_per_op": round(calls, 2),
+            "llm_in_tok_per_item": round(in_tok, 1),
+            "overhead_ms_per_op": round(max(0.0, mean - calls * model_s) * 1000, 2)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=50, help="ops per path")
+    ap.add_argument("--dataset-size", type=int, default=40, help="items per eval-triage/eval-drafts run")
+    ap.add_argument("--latency", type=float, default=0.05, help="fake model latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.02, help="± uniform jitter (s)")
+    ap.add_argument("--workers", type=int, default=4, help="eval-drafts workers")
+    ap.add_argument("--only", default="", help="comma-separated subset of paths")
+    ap.add_argument("--cache", action="store_true", help="keep the LLM response cache on")
+    ap.add_argument("--dedup", action="store_true", help="keep the near-duplicate triage index on")
+    ap.add_argument("--pack", type=int, default=8, help="items per call for triage-packed")
+    ap.add_argument("--triage-dataset", default="", help="labeled triage JSONL (default: synthetic)")
+    ap.add_argument("--json", default="", help="also write results here")
+    args = ap.parse_args()
+
+    use_fake_llms(latency=args.latency, jitter=args.jitter)
+    llm_cache.set_enabled(args.cache)
+    config.TRIAGE_DEDUP_ENABLED = args.dedup  # repeated ops would otherwise all be reused
+    rng = random.Random(0)
+    tmp = tempfile.mkdtemp(prefix="echodraft_bench_data_")
+
+    from echodraft.agents.drafter import draft_text, multi_draft_texts
+    from echodraft.agents.triager import run_triage, triage_item, triage_items
+    from echodraft.concurrency import chunked
+    from echodraft.evaluation.triage_eval import load_jsonl
+    from echodraft.evaluation.run_eval import eval_drafts_cli
+    from echodraft.evaluation.triage_eval import evaluate_triage
+    from echodraft.memory.diff_utils import word_level_diff
+    from echodraft.memory.style_rules import update_rules_from_diffs
+
+    triage_ds = args.triage_dataset or os.path.join(tmp, "triage.jsonl")
+    if not args.triage_dataset:
+        with open(triage_ds, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(_item(rng, i)) + "\n" for i in range(args.dataset_size))
+    triage_items_ds = list(load_jsonl(triage_ds))
+    drafts_ds = os.path.join(tmp, "drafts.jsonl")
+    with open(drafts_ds, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps({"topic": f"Topic {i}", "style": rng.choice(STYLES),
+                                 "expectations": "Intro, three points, a call to action."}) + "\n"
+                     for i in range(args.dataset_size))
+    docs = [_text(rng, 80) for _ in range(args.n)]
+    edits = [(d, _edit(rng, d)) for d in docs]
+    runs = max(3, args.n // 10)  # dataset-level paths are slower per op
+
+    paths = {
+        "draft": (lambda i: draft_text(f"Topic {i}", style=STYLES[i % 3], target_words=220),
+                  list(range(args.n)), 1),
+        "triage": (lambda it: run_triage(it["surface"], it["title"], it["content"]),
+                   [_item(rng, i) for i in range(args.n)], 1),
+        "multi-draft": (lambda i: multi_draft_texts(f"Topic {i}", count=3), list(range(args.n)), 1),
+        "eval-triage": (lambda _: evaluate_triage(triage_ds, dedup=args.dedup), list(range(runs)), len(triage_items_ds)),
+        # triage only, whole dataset per op: one call per item vs `--pack` items per call
+        "triage-single": (lambda _: [triage_item(it) for it in triage_items_ds], list(range(runs)),
+                          len(triage_items_ds)),
+        "triage-packed": (lambda _: [triage_items(c) for c in chunked(triage_items_ds, args.pack)],
+                          list(range(runs)), len(triage_items_ds)),
+        "eval-drafts": (lambda _: eval_drafts_cli(drafts_ds, workers=args.workers, rpm=0),
+                        list(range(runs)), args.dataset_size),
+        "learn-edits": (lambda pair: update_rules_from_diffs(word_level_diff(*pair)), edits, 1),
+    }
+    only = [p for p in args.only.split(",") if p]
+    results = [_run(name, fn, inputs, per_op, args.latency)
+               for name, (fn, inputs, per_op) in paths.items() if not only or name in only]
+
+    print(f"fake model: {args.latency * 1000:.0f} ms ± {args.jitter * 1000:.0f} ms")
+    print(f"{'path':<14} {'ops':>5} {'items/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'llm/op':>7} {'in tok/item':>12} {'overhead ms/op':>15}")
+    for r in results:
+        print(f"{r['path']:<14} {r['ops']:>5} {r['items_per_s']:>9} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+              f"{r['p99_ms']:>9} {r['llm_calls_per_op']:>7} {r['llm_in_tok_per_item']:>12} "
+              f"{r['overhead_ms_per_op']:>15}")
+    if args.cache:
+        st = llm_cache.get_cache().stats()
+        print(f"llm cache: hits={st['hits']} misses={st['misses']} entries={st['entries']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Style-index lookup latency at scale (synthetic samples, persisted + memory-mapped).
+
+    python benchmarks/bench_style_index.py --samples 100000
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from echodraft.memory.style_index import StyleIndex
+
+WORDS = ("team ship friday quick note hey regards please update launch metrics customer "
+         "we will the a to honestly cheers onboarding pricing roadmap").split()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--samples", type=int, default=100_000)
+    ap.add_argument("--batch", type=int, default=32)
+    ap.add_argument("--k", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    path = tempfile.mkdtemp(prefix="style_index_")
+    index = StyleIndex(path)
+    t0 = time.perf_counter()
+    for start in range(0, args.samples, 10_000):
+        n = min(10_000, args.samples - start)
+        index.add_samples(" ".join(rng.choice(WORDS) for _ in range(40)) for _ in range(n))
+    build = time.perf_counter() - t0
+
+    index = StyleIndex(path)  # reopen: vectors come back memory-mapped
+    queries = [" ".join(rng.choice(WORDS) for _ in range(12)) for _ in range(args.batch)]
+    index.query(queries[:1], args.k)  # warm page cache + row norms
+
+    t0 = time.perf_counter()
+    for q in queries:
+        index.query([q], args.k)
+    single = (time.perf_counter() - t0) * 1000 / len(queries)
+    t0 = time.perf_counter()
+    index.query(queries, args.k)
+    batched = (time.perf_counter() - t0) * 1000 / len(queries)
+
+    print(f"samples={len(index)} dim={index.dim} build={build:.1f}s")
+    print(f"single query : {single:7.2f} ms")
+    print(f"batched ({args.batch})  : {batched:7.2f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
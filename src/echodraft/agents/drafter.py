@@ -1,5 +1,9 @@
+from collections import defaultdict
 from textwrap import fill
-from ..graph.builder import build_graph
+from typing import Callable
+from .. import config
+from ..graph.builder import get_graph, get_multi_draft_graph
+from .streaming import stream_graph
 
 
 STYLES = {
@@ -19,9 +23,10 @@ def _scaffold_paragraphs(topic: str, style_key: str, target_words: int) -> list[
         parts.append(fill(body, width=88))
     return parts
 
-def draft_text(topic: str, style: str="professional", target_words: int=220, explain: bool=False, expectations: str="") -> str:
-    app = build_graph()
-    out = app.invoke({
+DRAFT_LABELS = ("DRAFT_EMAIL","DRAFT_NOTION","DRAFT_LINKEDIN")
+
+def _draft_inputs(topic: str, style: str, target_words: int, explain: bool, expectations: str) -> dict:
+    return {
         # triage inputs (for CLI we simulate a “content blob” to classify)
         "surface": "notion",
         "title": topic,
@@ -34,18 +39,97 @@ def draft_text(topic: str, style: str="professional", target_words: int=220, exp
         "words": target_words,
         "expectations": expectations,
         "explain": explain
-    })
+    }
+
+def _triage_message(out: dict) -> str:
+    return f"[triage:{out.get('triage_label')}] {out.get('triage_reason','')}".strip()
+
+def _result_text(out: dict, explain: bool) -> str:
     # If triage didn’t choose drafting, return reason.
-    if out.get("triage_label") not in ("DRAFT_EMAIL","DRAFT_NOTION","DRAFT_LINKEDIN"):
-        return f"[triage:{out.get('triage_label')}] {out.get('triage_reason','')}".strip()
+    if out.get("triage_label") not in DRAFT_LABELS:
+        return _triage_message(out)
     if explain and out.get("explanation"):
         return f'{out["draft"]}\n\n[why] {out["explanation"]}'
     return out["draft"]
 
-def multi_draft_texts(topic: str, count: int = 3) -> list[str]:
-    # quick loop with different styles; still uses the same graph
+def draft_text(topic: str, style: str="professional", target_words: int=220, explain: bool=False, expectations: str="",
+               speculate: bool | None = None) -> str:
+    """Triage the topic's skeleton and draft it. `speculate` (default: config.SPECULATE)
+    starts the draft while triage is still running; see graph/speculation.py."""
+    app = get_graph(speculate=config.SPECULATE if speculate is None else speculate)
+    out = app.invoke(_draft_inputs(topic, style, target_words, explain, expectations))
+    return _result_text(out, explain)
+
+def stream_draft_text(topic: str, on_token: Callable[[str], None], style: str="professional",
+                      target_words: int=220, explain: bool=False, expectations: str="") -> tuple[str, dict]:
+    """Like `draft_text`, but hands draft tokens to `on_token` as the model produces them.
+
+    Returns the `draft_text` result plus {"ttft_s", "total_s"} timings.
+    """
+    out, timing = stream_graph(get_graph(), _draft_inputs(topic, style, target_words, explain, expectations),
+                               lambda text, _variant: on_token(text))
+    return _result_text(out, explain), timing
+
+def multi_draft_texts(topic: str, count: int = 3, max_concurrency: int = 3) -> list[str]:
+    """Triage once, then draft `count` style variants in parallel (at most `max_concurrency` at a time)."""
     styles = ["professional", "persuasive", "story"]
-    results = []
-    for i in range(count):
-        results.append(draft_text(topic, style=styles[i % len(styles)], target_words=220, explain=False))
-    return results
+    inputs = _draft_inputs(topic, styles[0], 220, False, "")
+    inputs["styles"] = [styles[i % len(styles)] for i in range(count)]
+    out = get_multi_draft_graph().invoke(inputs, config={"max_concurrency": max(1, max_concurrency)})
+    # Triage ran once, so a non-drafting decision applies to every variant.
+    if out.get("triage_label") not in DRAFT_LABELS:
+        return [_triage_message(out)]
+    return [v["draft"] for v in sorted(out.get("variants", []), key=lambda v: v["index"])]
+
+def stream_multi_draft_texts(topic: str, on_token: Callable[[str], None], on_variant: Callable[[int], None],
+                             count: int = 3, max_concurrency: int = 3) -> tuple[list[str], dict]:
+    """Streaming `multi_draft_texts`: variants are emitted one after another.
+
+    The lowest unfinished variant streams live; the others draft in parallel and
+    their tokens are buffered until it is their turn, so output never interleaves.
+    `on_variant(i)` fires before variant i's first token.
+    """
+    styles = ["professional", "persuasive", "story"]
+    inputs = _draft_inputs(topic, styles[0], 220, False, "")
+    inputs["styles"] = [styles[i % len(styles)] for i in range(count)]
+    buffers: dict[int, list[str]] = defaultdict(list)
+    finished: dict[int, str] = {}
+    streamed: set[int] = set()
+    cur = {"idx": 0, "started": False}
+
+    def start(idx: int):
+        on_variant(idx)
+        cur["started"] = True
+        for text in buffers.pop(idx, []):
+            on_token(text)
+
+    def token(text: str, variant: int | None):
+        idx = variant or 0
+        streamed.add(idx)
+        if idx != cur["idx"]:
+            buffers[idx].append(text)
+            return
+        if not cur["started"]:
+            start(idx)
+        on_token(text)
+
+    def update(node: str, writes: dict):
+        if node != "draft_variant":
+            return
+        for v in writes.get("variants", []):
+            finished[v["index"]] = v["draft"]
+        while cur["idx"] in finished:
+            idx = cur["idx"]
+            if not cur["started"]:
+                start(idx)
+            if idx not in streamed:  # model didn't stream; emit the whole variant
+                on_token(finished[idx])
+            cur["idx"], cur["started"] = idx + 1, False
+            if buffers.get(cur["idx"]):
+                start(cur["idx"])
+
+    out, timing = stream_graph(get_multi_draft_graph(), inputs, token, nodes=("draft_variant",),
+                               config={"max_concurrency": max(1, max_concurrency)}, on_update=update)
+    if out.get("triage_label") not in DRAFT_LABELS:
+        return [_triage_message(out)], timing
+    return [v["draft"] for v in sorted(out.get("variants", []), key=lambda v: v["index"])], timing
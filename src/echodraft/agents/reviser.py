@@ -1,5 +1,15 @@
-from langchain_openai import ChatOpenAI
+import logging
+import re
 from langchain_core.prompts import PromptTemplate
+from typing import Callable
+from .streaming import stream_llm
+from .. import config
+from ..concurrency import imap_bounded
+from ..llm import SPECS, get_llm
+from ..io.prompt_budget import count_tokens, fit_prompt, budget_for
+from ..memory.diff_utils import line_level_diff
+
+log = logging.getLogger(__name__)
 
 REVISE_PROMPT = """You are a careful rewrite assistant.
 Revise the draft based on the FEEDBACK. Follow these rules:
@@ -16,11 +26,152 @@ DRAFT:
 {draft}
 >>>"""
 
-_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.4, max_tokens=700)
+REVISE_SECTION_PROMPT = """You are a careful rewrite assistant.
+Revise ONE SECTION of a longer document based on the FEEDBACK. Follow these rules:
+- Apply feedback faithfully (tone, brevity, clarity) to this section only.
+- Keep its heading line (if any) and its Markdown formatting.
+- Do NOT add introductions, conclusions or transitions that belong to other sections.
+- Return ONLY the revised section (no preamble, no commentary).
+
+FEEDBACK:
+"{feedback}"
+
+DOCUMENT OUTLINE (for context; section {position} is the one to revise):
+{outline}
+
+SECTION {position}:
+<<<
+{section}
+>>>"""
+
+def _revise_prompt(draft: str, feedback: str) -> str:
+    # over-budget drafts lose their middle; the trim is logged at INFO
+    return fit_prompt("revise", PromptTemplate.from_template(REVISE_PROMPT).format,
+                      {"feedback": feedback, "draft": draft},
+                      budget=budget_for("revise"), trim=("draft",), caps={"feedback": 500})
 
 def revise_text(draft: str, feedback: str) -> str:
-    prompt = PromptTemplate.from_template(REVISE_PROMPT).format(
-        feedback=feedback, draft=draft
-    )
-    resp = _llm.invoke(prompt)
+    resp = get_llm("revise").invoke(_revise_prompt(draft, feedback))
     return resp.content.strip()
+
+def stream_revise_text(draft: str, feedback: str, on_token: Callable[[str], None]) -> tuple[str, dict]:
+    """Like `revise_text`, streaming tokens to `on_token`; also returns {"ttft_s", "total_s"}."""
+    text, timing = stream_llm(get_llm("revise"), _revise_prompt(draft, feedback), on_token)
+    return text.strip(), timing
+
+
+_HEADING = re.compile(r"^#{1,6}\s")
+_FENCE = ("```", "~~~")
+_WORDCHAR = re.compile(r"\w")
+_QUOTED = re.compile(r'["“]([^"“”]{4,})["”]')
+_INTRO = re.compile(r"\b(intro|introduction|opening|first (paragraph|section))\b", re.I)
+_WHOLE = re.compile(r"\b(whole|entire|everything|overall|throughout|everywhere|all (the )?sections)\b", re.I)
+_OUTRO = re.compile(r"\b(conclusion|closing|ending|outro|sign-?off|last (paragraph|section)|final (paragraph|section))\b", re.I)
+
+def split_sections(text: str, max_words: int = config.REVISE_SECTION_WORDS) -> list[str]:
+    """Cut Markdown into consecutive sections; `"".join(sections) == text`.
+
+    Every heading (outside code fences) starts a section. Paragraphs are packed into a
+    section while it stays within `max_words`; only a single longer paragraph exceeds it.
+    """
+    blocks, cur, fenced = [], [], False  # (starts with a heading, lines) per paragraph
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith(_FENCE):
+            fenced = not fenced
+        heading = not fenced and _HEADING.match(line)
+        para = not fenced and line.strip() and cur and not cur[-1].strip()
+        if cur and (heading or para):
+            blocks.append(cur)
+            cur = []
+        cur.append(line)
+    if cur:
+        blocks.append(cur)
+
+    sections, cur, words = [], [], 0
+    for block in blocks:
+        n = sum(len(l.split()) for l in block)
+        if cur and (_HEADING.match(block[0]) or words + n > max_words):
+            sections.append("".join(cur))
+            cur, words = [], 0
+        cur.extend(block)
+        words += n
+    if cur:
+        sections.append("".join(cur))
+    return sections
+
+def _heading(section: str) -> str:
+    first = section.lstrip("\n").split("\n", 1)[0]
+    return first.strip() if _HEADING.match(first) else ""
+
+def _targets(sections: list[str], feedback: str) -> set[int] | None:
+    """Sections the feedback names (by heading, quoted phrase, intro/conclusion), or
+    None when it names none or also speaks to the whole document ("especially the intro")."""
+    if _WHOLE.search(feedback):
+        return None
+    fb = feedback.lower()
+    hit = set()
+    for i, sec in enumerate(sections):
+        title = _heading(sec).lstrip("#").strip().lower()
+        if len(title) >= 3 and title in fb:
+            hit.add(i)
+    for phrase in _QUOTED.findall(feedback):
+        hit.update(i for i, sec in enumerate(sections) if phrase.lower() in sec.lower())
+    body = [i for i, sec in enumerate(sections) if _WORDCHAR.search(sec)]
+    if body and _INTRO.search(feedback):
+        hit.add(body[0])
+    if body and _OUTRO.search(feedback):
+        hit.add(body[-1])
+    return hit or None
+
+def _outline(sections: list[str]) -> str:
+    lines = []
+    for i, sec in enumerate(sections, 1):
+        head = _heading(sec) or " ".join(sec.split()[:8]) + " …"
+        lines.append(f"{i}. {head}")
+    return "\n".join(lines)
+
+def _revise_section(section: str, feedback: str, outline: str, position: int) -> str:
+    prompt = fit_prompt("revise", PromptTemplate.from_template(REVISE_SECTION_PROMPT).format,
+                        {"feedback": feedback, "outline": outline, "position": str(position), "section": section},
+                        budget=budget_for("revise"), trim=("section",), caps={"feedback": 500, "outline": 300})
+    llm = get_llm("revise")
+    # the revised section is about as long as the original: give it room past the role cap
+    cap = SPECS["revise"].get("max_tokens") or 0
+    max_tokens = max(cap, count_tokens(section) * 3 // 2 + 64)
+    if max_tokens > cap and hasattr(llm, "bind"):
+        llm = llm.bind(max_tokens=max_tokens)
+    resp = llm.invoke(prompt)
+    if (getattr(resp, "response_metadata", None) or {}).get("finish_reason") == "length":
+        log.warning("revise: section %d hit max_tokens=%d; kept it unrevised", position, max_tokens)
+        return section
+    text = resp.content.strip()
+    if text.startswith("<<<") and text.endswith(">>>"):
+        text = text[3:-3].strip()
+    if not text:  # keep the original rather than drop a section
+        return section
+    # the model strips surrounding blank lines; put them back so sections join cleanly
+    body = section.strip()
+    lead = section[:section.index(body)] if body else ""
+    return lead + text + section[len(lead) + len(body):]
+
+def revise_long(draft: str, feedback: str, workers: int = config.REVISE_WORKERS,
+                max_words: int = config.REVISE_SECTION_WORDS) -> dict:
+    """Revise a long Markdown draft section by section, `workers` sections at a time.
+
+    Each call sees the feedback, the document outline and its own section, so the
+    wall time is about that of the longest section rather than of the whole draft.
+    Sections the feedback does not touch (see `_targets`) are kept verbatim.
+    Returns {"text", "patch" (diff_utils.line_level_diff ops), "sections", "revised"}.
+    """
+    sections = split_sections(draft, max_words)
+    targets = _targets(sections, feedback)
+    todo = [i for i, sec in enumerate(sections)
+            if (targets is None or i in targets) and _WORDCHAR.search(sec)]
+    outline = _outline(sections)
+    out = list(sections)
+    for i, text in imap_bounded(lambda i: (i, _revise_section(sections[i], feedback, outline, i + 1)),
+                                todo, workers=workers, ordered=False):
+        out[i] = text
+    text = "".join(out)
+    return {"text": text, "patch": line_level_diff(draft, text),
+            "sections": len(sections), "revised": len(todo)}
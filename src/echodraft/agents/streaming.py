@@ -0,0 +1,68 @@
+import time
+from typing import Callable, Iterable
+
+class TokenTimer:
+    """Time-to-first-token and total latency for one streamed generation."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token: float | None = None
+        self.finished: float | None = None
+
+    def token(self) -> None:
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+
+    def done(self) -> None:
+        self.finished = time.perf_counter()
+
+    def stats(self) -> dict:
+        end = self.finished or time.perf_counter()
+        ttft = self.first_token - self.started if self.first_token else None
+        return {"ttft_s": round(ttft, 3) if ttft is not None else None,
+                "total_s": round(end - self.started, 3)}
+
+def _variant_of(meta: dict) -> int | None:
+    for tag in meta.get("tags") or []:
+        if tag.startswith("variant:"):
+            return int(tag.split(":", 1)[1])
+    return None
+
+def stream_graph(app, inputs: dict, on_token: Callable[[str, int | None], None],
+                 nodes: Iterable[str] = ("draft",), config: dict | None = None,
+                 on_update: Callable[[str, dict], None] | None = None) -> tuple[dict, dict]:
+    """Run a compiled graph, forwarding LLM tokens from `nodes` as they arrive.
+
+    `on_token(text, variant)` gets each chunk (variant is set for multi-draft
+    branches); `on_update(node, writes)` fires when a node finishes.
+    Returns (final state, timing stats).
+    """
+    nodes = set(nodes)
+    timer = TokenTimer()
+    state = dict(inputs)
+    for mode, payload in app.stream(inputs, config=config, stream_mode=["messages", "updates", "values"]):
+        if mode == "messages":
+            chunk, meta = payload
+            if meta.get("langgraph_node") in nodes and isinstance(chunk.content, str) and chunk.content:
+                timer.token()
+                on_token(chunk.content, _variant_of(meta))
+        elif mode == "updates":
+            if on_update:
+                for node, writes in (payload or {}).items():
+                    on_update(node, writes or {})
+        else:
+            state = payload
+    timer.done()
+    return state, timer.stats()
+
+def stream_llm(llm, prompt: str, on_token: Callable[[str], None]) -> tuple[str, dict]:
+    """Stream a single chat-model call; returns (full text, timing stats)."""
+    timer = TokenTimer()
+    parts = []
+    for chunk in llm.stream(prompt):
+        if chunk.content:
+            timer.token()
+            parts.append(chunk.content)
+            on_token(chunk.content)
+    timer.done()
+    return "".join(parts), timer.stats()
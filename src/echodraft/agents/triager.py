@@ -0,0 +1,118 @@
+import json
+import time
+from typing import Iterable, Iterator, TextIO
+from ..concurrency import chunked, imap_bounded
+from ..graph.builder import get_graph, get_triage_graph
+from ..graph.nodes import pre_triage_node, triage_many
+
+def run_triage(surface: str = "notion", title: str = "", content: str = "", stale_days: int = 30) -> dict:
+    """The `triage` command: full graph run (review queue included); returns label/reason/confidence."""
+    out = get_graph().invoke({
+        "surface": surface,
+        "title": title,
+        "content": content,
+        "metadata": {},
+        "stale_days": stale_days,
+        # dummy draft fields to keep state happy
+        "topic": title or "Untitled",
+        "style": "professional",
+        "words": 200,
+        "explain": False,
+    })
+    return {
+        "label": (out.get("triage_label") or "").upper(),
+        "reason": out.get("triage_reason", ""),
+        "confidence": float(out.get("triage_confidence") or 0.0),
+    }
+
+def _triage_state(item: dict) -> dict:
+    return {
+        "surface": item.get("surface", "notion"),
+        "title": item.get("title", ""),
+        "content": item.get("content", ""),
+        "metadata": item.get("metadata") or {},
+        "stale_days": item.get("stale_days", 30),
+    }
+
+def _triage_result(out: dict) -> dict:
+    return {
+        "label": (out.get("triage_label") or "REVIEW").upper(),
+        "reason": out.get("triage_reason", ""),
+        "confidence": float(out.get("triage_confidence") or 0.0),
+        "source": out.get("triage_source", "llm"),
+    }
+
+def triage_item(item: dict, fast_path: bool = True) -> dict:
+    """Triage one item ({surface, title, content, ...}); returns label/reason/confidence."""
+    return _triage_result(get_triage_graph(fast_path=fast_path).invoke(_triage_state(item)))
+
+def triage_items(items: list[dict], fast_path: bool = True) -> list[dict]:
+    """Triage several items at once: whatever the pre-triage rules and dedup index leave
+    open goes to the LLM in one packed prompt (`triage_many`). Same records as `triage_item`."""
+    states = [_triage_state(it) for it in items]
+    outs = [pre_triage_node(s) if fast_path else {} for s in states]
+    todo = [i for i, out in enumerate(outs) if not out]
+    for i, out in zip(todo, triage_many([states[i] for i in todo])):
+        outs[i] = out
+    return [_triage_result(out) for out in outs]
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[tuple[int, dict | None, str | None]]:
+    for n, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield n, None, f"invalid JSON: {e}"
+            continue
+        yield n, item, None if isinstance(item, dict) else "expected a JSON object"
+
+def triage_stream(lines: Iterable[str], workers: int = 8, ordered: bool = False,
+                  fast_path: bool = True, pack: int = 1) -> Iterator[dict]:
+    """Triage JSONL lines concurrently; yields one result record per non-blank line.
+
+    Lines are read lazily and at most ~2×`workers` items are pending, so memory stays
+    flat however long the input is. Records carry `line` (0-based input line) and the
+    item's `id` when present; failures are reported as `{"error": ...}` records.
+    With `pack` > 1, up to `pack` consecutive items share one LLM call (`triage_items`).
+    """
+    def run(entries):
+        recs, ok = [], []
+        for n, item, error in entries:
+            rec = {"line": n}
+            if item is not None and "id" in item:
+                rec["id"] = item["id"]
+            if error is None:
+                ok.append((rec, item))
+            else:
+                rec["error"] = error
+            recs.append(rec)
+        if ok:
+            try:  # one bad item (or chunk) must not sink the batch
+                results = (triage_items([item for _, item in ok], fast_path=fast_path) if pack > 1
+                           else [triage_item(ok[0][1], fast_path=fast_path)])
+                for (rec, _), res in zip(ok, results):
+                    rec.update(res)
+            except Exception as e:
+                for rec, _ in ok:
+                    rec["error"] = f"{type(e).__name__}: {e}"
+        return recs
+
+    for recs in imap_bounded(run, chunked(_parse_lines(lines), pack), workers=workers, ordered=ordered):
+        yield from recs
+
+def triage_batch(src: TextIO, dst: TextIO, workers: int = 8, ordered: bool = False,
+                 fast_path: bool = True, pack: int = 1) -> dict:
+    """Read item JSONL from `src`, write result JSONL to `dst` (flushed per line); returns stats."""
+    t0 = time.perf_counter()
+    stats = {"items": 0, "errors": 0, "rules": 0, "reused": 0}
+    for rec in triage_stream(src, workers=workers, ordered=ordered, fast_path=fast_path, pack=pack):
+        dst.write(json.dumps(rec) + "\n")
+        dst.flush()
+        stats["items"] += 1
+        stats["errors"] += "error" in rec
+        stats["rules"] += rec.get("source") == "rules"
+        stats["reused"] += rec.get("source") == "dedup"
+    stats["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    stats["items_per_s"] = round(stats["items"] / stats["elapsed_s"], 2) if stats["elapsed_s"] else 0.0
+    return stats
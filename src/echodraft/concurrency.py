@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """Thread-safe requests-per-minute budget. `rpm <= 0` disables limiting."""
+
+    def __init__(self, rpm: float = 0):
+        self.interval = 60.0 / rpm if rpm and rpm > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, n: int = 1) -> None:
+        """Block until `n` requests fit in the budget (slots are handed out in call order)."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + n * self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def imap_bounded(fn: Callable[[T], R], items: Iterable[T], workers: int = 4,
+                 ordered: bool = True, in_flight: int | None = None) -> Iterator[R]:
+    """Map `fn` over `items` on a thread pool, keeping at most `in_flight` items pending.
+
+    Input is consumed lazily, so memory stays flat for arbitrarily long iterables.
+    With `ordered=True` results come back in input order; otherwise as they finish.
+    Exceptions raised by `fn` propagate to the consumer.
+    """
+    workers = max(1, workers)
+    if workers == 1:
+        yield from map(fn, items)
+        return
+    limit = max(workers, in_flight or 2 * workers)
+    it = iter(items)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending: deque = deque()
+    try:
+        for item in it:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= limit:
+                break
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [f for f in pending if f in finished]
+                for f in done:
+                    pending.remove(f)
+            for f in done:
+                yield f.result()
+                nxt = next(it, _SENTINEL)
+                if nxt is not _SENTINEL:
+                    pending.append(pool.submit(fn, nxt))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+_SENTINEL = object()
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Consecutive lists of up to `size` items, consuming `items` lazily."""
+    it = iter(items)
+    while chunk := list(islice(it, max(1, size))):
+        yield chunk
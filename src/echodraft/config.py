@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()  # Safe: only reads local .env if present
@@ -12,3 +13,66 @@ class Settings:
     linkedin_token: str | None = os.getenv("LINKEDIN_ACCESS_TOKEN")
 
 settings = Settings()
+
+# Local state (review queue, style rules, caches) lives here.
+DATA_DIR = Path(os.getenv("ECHODRAFT_HOME") or Path.home()/".echodraft")
+
+# On-disk cache for deterministic (temperature 0) LLM calls.
+LLM_CACHE_ENABLED = os.getenv("ECHODRAFT_LLM_CACHE", "1") not in ("0", "false", "off")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("ECHODRAFT_LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("ECHODRAFT_LLM_CACHE_TTL_DAYS", "30")) * 86400
+
+# Deterministic pre-triage rules (graph/policies.py) that skip the LLM for obvious items.
+PRE_TRIAGE_ENABLED = os.getenv("ECHODRAFT_PRE_TRIAGE", "1") not in ("0", "false", "off")
+PRE_TRIAGE_MIN_CONFIDENCE = float(os.getenv("ECHODRAFT_PRE_TRIAGE_MIN_CONFIDENCE", "0.85"))
+
+# Reuse an earlier LLM triage for near-identical items (memory/triage_index.py); part of
+# the pre-triage fast path. Similarity is the estimated Jaccard overlap of word 3-grams.
+TRIAGE_DEDUP_ENABLED = os.getenv("ECHODRAFT_TRIAGE_DEDUP", "1") not in ("0", "false", "off")
+TRIAGE_DEDUP_SIMILARITY = float(os.getenv("ECHODRAFT_TRIAGE_DEDUP_SIMILARITY", "0.85"))
+TRIAGE_DEDUP_TTL_SECONDS = float(os.getenv("ECHODRAFT_TRIAGE_DEDUP_TTL_DAYS", "14")) * 86400
+
+# Writing samples retrieved from the style index and shown to the drafter.
+STYLE_HINTS_K = int(os.getenv("ECHODRAFT_STYLE_HINTS_K", "3"))
+
+# Learned replacements shown in the draft prompt (ranked by hits); all of them are still
+# applied to the output by memory/rule_matcher.py. Bans are always shown in full.
+STYLE_RULES_PROMPT_K = int(os.getenv("ECHODRAFT_STYLE_RULES_PROMPT_K", "20"))
+
+# CLI commands forward to a running `echodraft serve` daemon unless this is off.
+DAEMON_FORWARD = os.getenv("ECHODRAFT_DAEMON", "1") not in ("0", "false", "off")
+# Seconds to wait for the daemon to accept a connection before running the command
+# in-process instead; once a request is sent, its result is awaited, never re-run locally.
+DAEMON_CONNECT_TIMEOUT = float(os.getenv("ECHODRAFT_DAEMON_CONNECT_TIMEOUT", "2"))
+
+# Speculative drafting (graph/speculation.py): start the draft alongside LLM triage when
+# policies.draft_likelihood is at least this high. Off by default; `draft --speculate` opts in.
+SPECULATE = os.getenv("ECHODRAFT_SPECULATE", "0") not in ("0", "false", "off")
+SPECULATE_MIN_LIKELIHOOD = float(os.getenv("ECHODRAFT_SPECULATE_MIN_LIKELIHOOD", "0.7"))
+
+# Long-document revise (agents/reviser.revise_long): sections of up to this many words are
+# revised concurrently, each well inside the revise output cap. `revise` switches to it on its own above REVISE_LONG_WORDS.
+REVISE_SECTION_WORDS = int(os.getenv("ECHODRAFT_REVISE_SECTION_WORDS", "300"))
+REVISE_LONG_WORDS = int(os.getenv("ECHODRAFT_REVISE_LONG_WORDS", "1500"))
+REVISE_WORKERS = int(os.getenv("ECHODRAFT_REVISE_WORKERS", "8"))
+
+# Input-token budget per prompt (io/prompt_budget.py); ECHODRAFT_PROMPT_BUDGET_<ROLE> overrides.
+PROMPT_BUDGETS = {role: int(os.getenv(f"ECHODRAFT_PROMPT_BUDGET_{role.upper()}", default))
+                  for role, default in {"triage": 3000, "draft": 3000, "revise": 16000,
+                                        "eval": 4000, "refine": 4000}.items()}
+
+# Node/LLM latency and token telemetry (memory/telemetry.py), rotated by size.
+METRICS_ENABLED = os.getenv("ECHODRAFT_METRICS", "1") not in ("0", "false", "off")
+METRICS_MAX_BYTES = int(os.getenv("ECHODRAFT_METRICS_MAX_MB", "5")) * 1024 * 1024
+METRICS_KEEP_FILES = int(os.getenv("ECHODRAFT_METRICS_KEEP_FILES", "3"))
+
+# trace_run export (evaluation/trace_export.py): background queue, flushed at exit.
+TRACE_FILE = os.getenv("ECHODRAFT_TRACE_FILE")  # JSONL sink, e.g. for offline tests
+TRACE_QUEUE_SIZE = int(os.getenv("ECHODRAFT_TRACE_QUEUE_SIZE", "1000"))
+TRACE_FLUSH_TIMEOUT = float(os.getenv("ECHODRAFT_TRACE_FLUSH_TIMEOUT", "2.0"))
+
+# Python log level for echodraft.* loggers (e.g. DEBUG shows per-call prompt token counts).
+LOG_LEVEL = os.getenv("ECHODRAFT_LOG_LEVEL")
+
+# Eval runs (evaluation/eval_runs.py) stream results to <REPORTS_DIR>/<kind>/run_<ts>/.
+REPORTS_DIR = Path(os.getenv("ECHODRAFT_REPORTS_DIR", "reports"))
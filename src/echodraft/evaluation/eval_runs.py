@@ -0,0 +1,135 @@
+# Eval runs on disk: every finished example is appended to results.jsonl as it
+# completes, so an interrupted run can be resumed without re-spending its LLM calls.
+#
+#   reports/<kind>/run_<ts>/results.jsonl   {"idx": <dataset line>, ...row}
+#   reports/<kind>/run_<ts>/checkpoint.json {dataset, sha256, params, done, finished}
+#   reports/<kind>/run_<ts>/summary.json    written when the run completes
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator
+from .. import config
+
+REPORTS_DIR = config.REPORTS_DIR
+
+class ResumeError(ValueError):
+    """`--resume` points at no run, or at one with another dataset or parameters."""
+
+def _sha256(path: str | Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _write_json(path: Path, obj: dict) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+def _read_results(path: Path) -> set[int]:
+    # A crash can leave a half-written last line; cut it off so appends start clean.
+    if not path.exists():
+        return set()
+    data = path.read_bytes()
+    end = data.rfind(b"\n") + 1
+    if end < len(data):
+        with open(path, "r+b") as f:
+            f.truncate(end)
+    done = set()
+    for line in data[:end].splitlines():
+        try:
+            done.add(json.loads(line)["idx"])
+        except (ValueError, KeyError, TypeError):
+            continue
+    return done
+
+def iter_results(run_dir: str | Path) -> Iterator[dict]:
+    """Stream the rows of a run without loading the file."""
+    with open(Path(run_dir)/"results.jsonl", "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def latest_run(kind: str) -> Path | None:
+    runs = sorted(p for p in (REPORTS_DIR/kind).glob("run_*") if (p/"checkpoint.json").exists())
+    return runs[-1] if runs else None
+
+
+class EvalRun:
+    """An open run directory. `add` appends one row and advances the checkpoint;
+    leaving the `with` block closes results.jsonl, after which it can be summarized."""
+
+    def __init__(self, path: Path, checkpoint: dict, done: set[int], fresh: bool = False):
+        self.path = path
+        self.checkpoint = checkpoint
+        self.done = done
+        self.fresh = fresh
+        self._out = open(path/"results.jsonl", "a", encoding="utf-8")
+
+    def add(self, idx: int, row: dict) -> None:
+        self._out.write(json.dumps({"idx": idx, **row}) + "\n")
+        self._out.flush()
+        self.done.add(idx)
+        self.checkpoint.update(done=len(self.done), updated=time.time())
+        _write_json(self.path/"checkpoint.json", self.checkpoint)
+
+    def rows(self) -> Iterator[dict]:
+        return iter_results(self.path)
+
+    def finish(self, summary: dict) -> None:
+        _write_json(self.path/"summary.json", summary)
+        self.checkpoint.update(finished=True, updated=time.time())
+        _write_json(self.path/"checkpoint.json", self.checkpoint)
+
+    def __enter__(self) -> "EvalRun":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        self._out.close()
+        if exc_type is not None and self.fresh and not self.done:
+            shutil.rmtree(self.path, ignore_errors=True)  # failed before any result: leave nothing behind
+
+
+def _new_dir(kind: str) -> Path:
+    base = REPORTS_DIR/kind/time.strftime("run_%Y-%m-%d_%H-%M-%S")
+    base.parent.mkdir(parents=True, exist_ok=True)
+    for n in range(1, 1000):
+        path = base if n == 1 else base.with_name(f"{base.name}_{n}")
+        try:
+            path.mkdir()
+            return path
+        except FileExistsError:
+            continue
+    raise RuntimeError(f"could not create a run directory under {base.parent}")
+
+def open_run(kind: str, dataset: str, params: dict, resume: str | None = None) -> EvalRun:
+    """Start a fresh run, or continue `resume` (a run directory or "latest").
+
+    A resumed run must use the same dataset file (by content) and the same `params`;
+    anything else would mix incomparable rows, so it raises ResumeError instead.
+    """
+    sha = _sha256(dataset)
+    if resume:
+        path = latest_run(kind) if resume == "latest" else Path(resume)
+        if path is None or not (path/"checkpoint.json").exists():
+            raise ResumeError(f"no {kind} run to resume at {resume!r}")
+        checkpoint = json.loads((path/"checkpoint.json").read_text(encoding="utf-8"))
+        if checkpoint.get("sha256") != sha:
+            raise ResumeError(f"{path} was run on a different dataset ({checkpoint.get('dataset')})")
+        if checkpoint.get("params") != params:
+            raise ResumeError(f"{path} was run with {checkpoint.get('params')}, not {params}")
+        checkpoint["finished"] = False
+        return EvalRun(path, checkpoint, _read_results(path/"results.jsonl"))
+    path = _new_dir(kind)
+    checkpoint = {"kind": kind, "dataset": str(dataset), "sha256": sha, "params": params,
+                  "done": 0, "finished": False, "started": time.time(), "updated": time.time()}
+    _write_json(path/"checkpoint.json", checkpoint)
+    return EvalRun(path, checkpoint, set(), fresh=True)
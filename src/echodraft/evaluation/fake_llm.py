@@ -0,0 +1,114 @@
+# Offline stand-in for ChatOpenAI: scripted replies with configurable latency/jitter.
+# Swap it in with `use_fake_llms()` (or `llm.set_llm_factory(fake_factory(...))`).
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Iterator
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+from .. import llm
+
+LABELS = ["IGNORE", "NOTIFY", "DRAFT_EMAIL", "DRAFT_NOTION", "DRAFT_LINKEDIN", "REVIEW"]
+_WORDS = ("we the team will ship launch plan customers next week update metrics clear "
+          "simple roadmap goals scope owners timeline review feedback results").split()
+
+def _rng(prompt: str, seed: int) -> random.Random:
+    return random.Random(int.from_bytes(hashlib.blake2b(f"{seed}:{prompt}".encode(), digest_size=8).digest(), "big"))
+
+def scripted_reply(role: str, prompt: str, seed: int = 0, words: int = 150) -> str:
+    """A plausible, deterministic reply for `role` (JSON for triage/eval, prose otherwise)."""
+    rng = _rng(prompt, seed)
+    if role == "triage":
+        items = re.split(r"^### Item (\d+)$", prompt, flags=re.MULTILINE)
+        if len(items) > 1:  # packed prompt: one object per item, each seeded by its own text
+            return json.dumps([{"id": int(i), **json.loads(scripted_reply(role, body, seed))}
+                               for i, body in zip(items[1::2], items[2::2])])
+        return json.dumps({"label": rng.choice(LABELS), "reason": "scripted",
+                           "confidence": round(rng.uniform(0.4, 0.98), 2)})
+    if role == "eval":
+        return json.dumps({"clarity": rng.randint(2, 5), "style_fit": rng.randint(2, 5),
+                           "completeness": rng.randint(2, 5), "comments": "Scripted evaluation."})
+    paras = [" ".join(rng.choice(_WORDS) for _ in range(words // 3)).capitalize() + "." for _ in range(3)]
+    return "\n\n".join(paras)
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that sleeps `latency ± jitter` seconds, then returns a scripted reply.
+
+    Replies come from `responses` (cycled) when given, else `scripted_reply(role, prompt)`.
+    Streaming yields word chunks, `token_delay` seconds apart. `temperature`, `max_tokens`
+    and `model_name` mirror the role's spec so `cached_invoke` treats it like the real client.
+    """
+
+    role: str = "draft"
+    model_name: str = "echodraft-fake"
+    temperature: float = 0.0
+    max_tokens: int | None = None
+    responses: list[str] | None = None
+    reply_fn: Callable[[str], str] | None = None
+    latency: float = 0.0
+    jitter: float = 0.0
+    token_delay: float = 0.0
+    seed: int = 0
+    _calls: int = PrivateAttr(default=0)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _jitter_rng: Any = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "echodraft-fake"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    def _reply(self, messages: list[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        with self._lock:
+            n = self._calls
+            self._calls += 1
+            if self._jitter_rng is None:
+                self._jitter_rng = random.Random(self.seed)
+            delay = max(0.0, self.latency + self._jitter_rng.uniform(-self.jitter, self.jitter))
+        time.sleep(delay)
+        if self.responses:
+            return self.responses[n % len(self.responses)]
+        if self.reply_fn:
+            return self.reply_fn(prompt)
+        return scripted_reply(self.role, prompt, self.seed)
+
+    def _generate(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    def _stream(self, messages: list[BaseMessage], stop: list[str] | None = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        for i, token in enumerate(re.split(r"(\s+)", self._reply(messages))):
+            if not token:
+                continue
+            if i and self.token_delay:
+                time.sleep(self.token_delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def fake_factory(latency: float = 0.0, jitter: float = 0.0, token_delay: float = 0.0, seed: int = 0,
+                 per_role: dict[str, dict] | None = None) -> Callable[[str, dict], FakeChatModel]:
+    """Client factory for `llm.set_llm_factory`; `per_role={"triage": {...}}` overrides fields."""
+    def make(role: str, spec: dict) -> FakeChatModel:
+        opts = {"latency": latency, "jitter": jitter, "token_delay": token_delay, "seed": seed,
+                "model_name": f"fake:{spec.get('model', '')}:seed{seed}",  # cache key: replies depend on the seed
+                "temperature": spec.get("temperature", 0.0), "max_tokens": spec.get("max_tokens")}
+        return FakeChatModel(role=role, **{**opts, **(per_role or {}).get(role, {})})
+    return make
+
+def use_fake_llms(latency: float = 0.0, jitter: float = 0.0, **kwargs) -> None:
+    """Route every `get_llm(role)` to a fake model (undo with `llm.set_llm_factory(None)`)."""
+    llm.set_llm_factory(fake_factory(latency, jitter, **kwargs))
@@ -1,6 +1,10 @@
+import json
 from typing import Dict
-from langchain_openai import ChatOpenAI
+from functools import partial
 from langchain_core.prompts import PromptTemplate
+from ..io.prompt_budget import fit_prompt, budget_for
+from ..memory.llm_cache import cached_invoke
+from ..llm import get_llm
 
 EVAL_PROMPT = """You are a strict writing evaluator.
 Given a DRAFT and EXPECTATIONS, score the draft from 1–5 (integers) on:
@@ -24,21 +28,22 @@ DRAFT:
 \"\"\"{{ draft }}\"\"\"
 """
 
-_llm_eval = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
 def evaluate_draft_llm(draft: str, style: str, expectations: str) -> Dict:
-    prompt = PromptTemplate.from_template(EVAL_PROMPT, template_format="jinja2").format(
-        style=style, expectations=expectations, draft=draft[:8000]
-    )
-    txt = _llm_eval.invoke(prompt).content.strip()
-    # JSON parse as you already do...
-    import json
+    template = PromptTemplate.from_template(EVAL_PROMPT, template_format="jinja2")
+    prompt = fit_prompt("eval", partial(template.format, style=style),
+                        {"expectations": expectations, "draft": draft},
+                        budget=budget_for("eval"), trim=("draft", "expectations"))
+    txt = cached_invoke(get_llm("eval"), prompt, validate=lambda t: _parse_scores(t) is not None)
+    return _parse_scores(txt) or {"clarity":0,"style_fit":0,"completeness":0,"comments":"parse_error"}
+
+def _parse_scores(txt: str) -> Dict | None:
+    txt = txt.strip()
     s, e = txt.find("{"), txt.rfind("}")
-    payload = {"clarity":0,"style_fit":0,"completeness":0,"comments":"parse_error"}
     if s!=-1 and e!=-1 and e>s:
         try:
             payload = json.loads(txt[s:e+1])
         except Exception:
-            pass
-    return payload
+            return None
+        return payload if isinstance(payload, dict) else None
+    return None
 
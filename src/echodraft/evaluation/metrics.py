@@ -1,3 +1,23 @@
-def summarize_metrics() -> str:
-    # Placeholder until LangSmith is wired.
-    return "EchoDraft metrics: (stub) Track clarity, tone-match, personalization over time."
+from ..memory.telemetry import summarize
+
+def summarize_metrics(window_minutes: float | None = 60) -> str:
+    """Per-node / per-LLM-role latency, throughput and token totals from local telemetry."""
+    stats = summarize(window_minutes * 60 if window_minutes else None)
+    span = f"last {window_minutes:g} min" if window_minutes else "all time"
+    if not stats["rows"]:
+        return f"EchoDraft metrics ({span}): no events recorded yet."
+    lines = [f"EchoDraft metrics ({span})",
+             f"{'kind':<6} {'name':<16} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'calls/min':>10} "
+             f"{'in tok':>9} {'out tok':>9} {'cached':>7} {'errors':>6}  labels"]
+    for r in stats["rows"]:
+        labels = " ".join(f"{k}={v}" for k, v in sorted(r["labels"].items(), key=lambda kv: -kv[1]))
+        lines.append(f"{r['kind']:<6} {r['name']:<16} {r['calls']:>6} {r['p50_ms']:>9} {r['p95_ms']:>9} "
+                     f"{r['calls_per_min']:>10} {r['in_tokens']:>9} {r['out_tokens']:>9} "
+                     f"{r['cache_hits']:>7} {r['errors']:>6}  {labels}")
+    spec = {r["name"]: r for r in stats["rows"] if r["kind"] == "spec"}
+    if spec:  # "used" ms is latency saved, "wasted" ms is draft time thrown away
+        used, wasted = (spec.get(k, {}).get("calls", 0) for k in ("used", "wasted"))
+        lines.append(f"speculation: {used + wasted} drafts started, {used} used, {wasted} wasted "
+                     f"(waste rate {wasted / (used + wasted):.0%}); "
+                     f"p50 saved {spec.get('used', {}).get('p50_ms', 0)} ms per used draft")
+    return "\n".join(lines)
@@ -1,92 +1,123 @@
 import json
-import time
-from typing import Dict, Iterable
+from typing import Callable, Dict, Iterable
 
 from ..agents.drafter import draft_text
-from .triage_eval import load_jsonl
+from ..concurrency import RateLimiter, imap_bounded
+from .triage_eval import load_jsonl, evaluate_triage, evaluate_triage_sampled
+from .eval_runs import open_run
 from .llm_eval import evaluate_draft_llm
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
 from ..io.prompts import REFINE_PROMPT
+from ..io.prompt_budget import fit_prompt, budget_for
+from ..memory.llm_cache import cached_invoke
+from ..llm import get_llm
 
 
-# Deterministic, short responses for refinement
-_refiner = ChatOpenAI(model="gpt-4o-mini", temperature=0, max_tokens=600)
+def eval_triage_cli(dataset_path: str, fast_path: bool = True, resume: str | None = None,
+                    pack: int = 1, workers: int = 1, sample: bool = False, target_width: float = 0.1,
+                    seed: int = 0, on_progress: Callable[[Dict], None] | None = None) -> str:
+    if sample:
+        out = evaluate_triage_sampled(dataset_path, fast_path=fast_path, resume=resume, pack=pack,
+                                      workers=workers, target_width=target_width, seed=seed,
+                                      on_progress=on_progress)
+    else:
+        out = evaluate_triage(dataset_path, fast_path=fast_path, resume=resume, pack=pack, workers=workers)
+    return json.dumps(out, indent=2)
 
-def eval_drafts_cli(
-    dataset_path: str,
-    words: int = 220,
-    refine: bool = True,
-    min_score: int = 4,
-) -> str:
-    data = list(load_jsonl(dataset_path))
-    rows = []
+def _eval_one(ex: Dict, words: int, refine: bool, min_score: int, limiter: RateLimiter) -> Dict:
+    # 1) Generate the draft (pass expectations through so completeness improves)
+    limiter.acquire(2)  # triage + draft
+    d = draft_text(
+        topic=ex["topic"],
+        style=ex.get("style", "professional"),
+        target_words=words,
+        explain=False,
+        expectations=ex.get("expectations", "")
+    )
 
-    for ex in data:
-        # 1) Generate the draft (pass expectations through so completeness improves)
-        d = draft_text(
-            topic=ex["topic"],
-            style=ex.get("style", "professional"),
-            target_words=words,
-            explain=False,
-            expectations=ex.get("expectations", "")
-        )
+    # 2) Score it with the LLM evaluator
+    limiter.acquire()
+    res = evaluate_draft_llm(
+        draft=d,
+        style=ex.get("reference_style", ex.get("style", "professional")),
+        expectations=ex.get("expectations", "")
+    )
+
+    record: Dict = {
+        "topic": ex["topic"],
+        "style": ex.get("style", "professional"),
+        "clarity": res.get("clarity", 0),
+        "style_fit": res.get("style_fit", 0),
+        "completeness": res.get("completeness", 0),
+        "comments": (res.get("comments") or "")[:280],
+    }
 
-        # 2) Score it with the LLM evaluator
-        res = evaluate_draft_llm(
-            draft=d,
+    # 3) Optional refinement pass if any score < threshold
+    if refine and any(record[k] < min_score for k in ("clarity", "style_fit", "completeness")):
+        rp = fit_prompt("refine", PromptTemplate.from_template(REFINE_PROMPT).format,
+                        {"expectations": ex.get("expectations", ""), "comments": res.get("comments", ""),
+                         "draft": d},
+                        budget=budget_for("refine"), trim=("draft", "comments"))
+        limiter.acquire()
+        improved_text = cached_invoke(get_llm("refine"), rp, validate=lambda t: bool(t.strip()))
+        limiter.acquire()
+        res2 = evaluate_draft_llm(
+            draft=improved_text,
             style=ex.get("reference_style", ex.get("style", "professional")),
             expectations=ex.get("expectations", "")
         )
+        record.update({
+            "improved": True,
+            "clarity2": res2.get("clarity", 0),
+            "style_fit2": res2.get("style_fit", 0),
+            "completeness2": res2.get("completeness", 0),
+            "comments2": (res2.get("comments") or "")[:280],
+        })
+    else:
+        record["improved"] = False
+    return record
 
-        improved = False
-        record: Dict = {
-            "topic": ex["topic"],
-            "style": ex.get("style", "professional"),
-            "clarity": res.get("clarity", 0),
-            "style_fit": res.get("style_fit", 0),
-            "completeness": res.get("completeness", 0),
-            "comments": (res.get("comments") or "")[:280],
-        }
-
-        # 3) Optional refinement pass if any score < threshold
-        if refine and any(record[k] < min_score for k in ("clarity", "style_fit", "completeness")):
-            rp = PromptTemplate.from_template(REFINE_PROMPT).format(
-                expectations=ex.get("expectations", ""),
-                comments=res.get("comments", ""),
-                draft=d[:8000],
-            )
-            improved_text = _refiner.invoke(rp).content
-            res2 = evaluate_draft_llm(
-                draft=improved_text,
-                style=ex.get("reference_style", ex.get("style", "professional")),
-                expectations=ex.get("expectations", "")
-            )
-            record.update({
-                "improved": True,
-                "clarity2": res2.get("clarity", 0),
-                "style_fit2": res2.get("style_fit", 0),
-                "completeness2": res2.get("completeness", 0),
-                "comments2": (res2.get("comments") or "")[:280],
-            })
-        else:
-            record["improved"] = False
 
-        rows.append(record)
-        time.sleep(0.1)  # gentle pacing
+def _summarize(rows: Iterable[Dict]) -> Dict:
+    keys = ("clarity", "style_fit", "completeness", "clarity2", "style_fit2", "completeness2")
+    sums = dict.fromkeys(keys, 0)
+    counts = dict.fromkeys(keys, 0)
+    for r in rows:  # one pass, so a run file of any size summarizes in constant memory
+        for key in keys:
+            if key in r:
+                sums[key] += r[key]
+                counts[key] += 1
+    return {f"avg_{key}": round(sums[key] / counts[key], 2) if counts[key] else None for key in keys}
 
-    # 4) Summaries
-    def avg(key: str):
-        vals = [r[key] for r in rows if key in r]
-        return round(sum(vals) / len(vals), 2) if vals else None
 
-    summary = {
-        "avg_clarity": avg("clarity"),
-        "avg_style_fit": avg("style_fit"),
-        "avg_completeness": avg("completeness"),
-        "avg_clarity2": avg("clarity2"),
-        "avg_style_fit2": avg("style_fit2"),
-        "avg_completeness2": avg("completeness2"),
-    }
+def eval_drafts_cli(
+    dataset_path: str,
+    words: int = 220,
+    refine: bool = True,
+    min_score: int = 4,
+    workers: int = 4,
+    rpm: float = 500,
+    resume: str | None = None,
+) -> str:
+    """Draft → score → optional refine → re-score for every example.
 
-    return json.dumps({"summary": summary, "results": rows}, indent=2)
+    Examples run concurrently on `workers` threads; `rpm` caps LLM requests per
+    minute across all workers (0 = unlimited). Each row is appended to the run
+    directory as soon as it finishes; `resume` (a run directory or "latest") skips
+    the examples that run already has. Results are reported in dataset order.
+    """
+    limiter = RateLimiter(rpm)
+    params = {"words": words, "refine": refine, "min_score": min_score}
+    with open_run("drafts", dataset_path, params, resume) as run:
+        todo = ((i, ex) for i, ex in enumerate(load_jsonl(dataset_path)) if i not in run.done)
+        for idx, row in imap_bounded(
+            lambda item: (item[0], _eval_one(item[1], words, refine, min_score, limiter)),
+            todo,
+            workers=workers,
+            ordered=False,
+        ):
+            run.add(idx, row)
+    summary = _summarize(run.rows())
+    run.finish(summary)
+    results = sorted(run.rows(), key=lambda r: r["idx"])
+    return json.dumps({"run": str(run.path), "summary": summary, "results": results}, indent=2)
@@ -0,0 +1,177 @@
+# Background exporter for trace_run: callers enqueue run start/end events and return
+# immediately; a worker thread batches them out to LangSmith and/or a JSONL file.
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from .. import config
+
+
+class JsonlSink:
+    """Append each event as one JSON line ({"op": "create"|"update", ...run fields})."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def export(self, creates: list[dict], updates: list[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for op, runs in (("create", creates), ("update", updates)):
+                for run in runs:
+                    f.write(json.dumps({"op": op, **run}, default=_jsonable) + "\n")
+
+
+class LangSmithSink:
+    """One `batch_ingest_runs` request per batch instead of a create/update call per run."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def export(self, creates: list[dict], updates: list[dict]) -> None:
+        self.client.batch_ingest_runs(create=creates, update=updates)
+
+
+def _jsonable(v):
+    return v.isoformat() if isinstance(v, datetime) else str(v)
+
+
+def _coalesce(events: list[tuple[str, dict]]) -> tuple[list[dict], list[dict]]:
+    # A run that starts and ends within one batch is sent as a single finished create.
+    creates: dict[str, dict] = {}
+    updates: list[dict] = []
+    for op, run in events:
+        if op == "create":
+            creates[run["id"]] = dict(run)
+        elif run["id"] in creates:
+            creates[run["id"]].update(run)
+        else:
+            updates.append(run)
+    return list(creates.values()), updates
+
+
+class TraceExporter:
+    """Bounded queue + worker thread. `submit` never blocks: when the queue is full the
+    event is dropped and counted. Batches go out every `batch_size` events or
+    `flush_interval` seconds, whichever comes first.
+    """
+
+    def __init__(self, sinks: list, max_queue: int = 1000, batch_size: int = 100,
+                 flush_interval: float = 1.0):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {"submitted": 0, "exported": 0, "dropped": 0, "failed": 0}
+        self._stats_lock = threading.Lock()  # submit runs on every tracing thread
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="echodraft-trace-export", daemon=True)
+        self._thread.start()
+
+    def submit(self, op: str, run: dict) -> bool:
+        try:
+            self._queue.put_nowait((op, run))
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        return True
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _export(self, batch: list) -> None:
+        creates, updates = _coalesce(batch)
+        ok = True
+        for sink in self.sinks:
+            try:
+                sink.export(creates, updates)
+            except Exception:  # tracing must never break the CLI
+                ok = False
+        # a batch any sink rejected counts as failed, not exported
+        self._count("exported" if ok else "failed", len(batch))
+
+    def _run(self) -> None:
+        batch: list = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            wait = 0.0 if self._stop.is_set() else deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=wait) if wait > 0 else self._queue.get_nowait()
+                self._queue.task_done()
+                if item is not None:  # None only wakes the worker up (see close)
+                    batch.append(item)
+            except queue.Empty:
+                if self._stop.is_set():  # drained: send the rest and exit
+                    if batch:
+                        self._export(batch)
+                    return
+            now = time.monotonic()
+            if batch and (len(batch) >= self.batch_size or now >= deadline):
+                self._export(batch)
+                batch = []
+            if now >= deadline:
+                deadline = now + self.flush_interval
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait up to `timeout` seconds for queued events to be exported (or to fail)."""
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            with self._stats_lock:
+                done = self.stats["exported"] + self.stats["failed"] >= self.stats["submitted"]
+            if self._queue.unfinished_tasks == 0 and done:
+                return True
+            time.sleep(0.005)
+        return False
+
+    def close(self, timeout: float = 2.0) -> bool:
+        """Export what is queued (bounded by `timeout`) and stop the worker."""
+        self._stop.set()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # worker is busy draining anyway
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+
+_exporter: TraceExporter | None = None
+_resolved = False  # sinks looked up once per process
+_lock = threading.Lock()
+
+def _sinks() -> list:
+    sinks = []
+    if config.TRACE_FILE:
+        sinks.append(JsonlSink(config.TRACE_FILE))
+    if os.getenv("LANGSMITH_API_KEY"):
+        try:
+            from langsmith import Client
+            sinks.append(LangSmithSink(Client(api_key=os.getenv("LANGSMITH_API_KEY"))))
+        except Exception:
+            pass
+    return sinks
+
+def get_exporter() -> TraceExporter | None:
+    """Process-wide exporter, or None when no sink is configured (tracing off)."""
+    global _exporter, _resolved
+    if not _resolved:
+        with _lock:
+            if not _resolved:
+                sinks = _sinks()
+                if sinks:
+                    _exporter = TraceExporter(sinks, max_queue=config.TRACE_QUEUE_SIZE)
+                    atexit.register(_exporter.close, config.TRACE_FLUSH_TIMEOUT)
+                _resolved = True
+    return _exporter
+
+def reset_exporter() -> None:
+    """Flush and drop the process-wide exporter so the next trace re-reads the sink settings."""
+    global _exporter, _resolved
+    with _lock:
+        if _exporter is not None:
+            _exporter.close(config.TRACE_FLUSH_TIMEOUT)
+        _exporter, _resolved = None, False
@@ -1,12 +1,21 @@
 import json
+import random
+from functools import partial
 from pathlib import Path
 from collections import Counter, defaultdict
-from typing import Iterable, Dict, Tuple
-from ..graph.builder import build_graph
+from typing import Callable, Iterable, Dict, Tuple
+import numpy as np
+from ..concurrency import chunked, imap_bounded
+from ..graph.builder import get_graph
+from ..memory import triage_index
+from .eval_runs import open_run
 
 LABELS = ["IGNORE","NOTIFY","DRAFT_EMAIL","DRAFT_NOTION","DRAFT_LINKEDIN","REVIEW"]
+BOOTSTRAP_ITERS = 300
+MIN_SAMPLE = 50      # never stop a sampled run on fewer results than this
+MIN_PER_LABEL = 5    # examples of each gold label placed at the front of the sample order
 
-def _triage(app, item: dict) -> str:
+def _triage(app, item: dict) -> tuple[str, str]:
     out = app.invoke({
         "surface": item["surface"],
         "title": item["title"],
@@ -19,7 +28,7 @@ def _triage(app, item: dict) -> str:
         "words": 150,
         "explain": False,
     })
-    return (out.get("triage_label") or "REVIEW").upper()
+    return (out.get("triage_label") or "REVIEW").upper(), out.get("triage_source", "llm")
 
 def load_jsonl(path: str) -> Iterable[dict]:
     for line in Path(path).read_text(encoding="utf-8").splitlines():
@@ -32,22 +41,173 @@ def _prf(tp, fp, fn):
     f1   = 2*prec*rec/(prec+rec) if (prec+rec) else 0.0
     return prec, rec, f1
 
-def evaluate_triage(dataset_path: str) -> Dict:
-    data = list(load_jsonl(dataset_path))
-    app = build_graph()
-    y_true, y_pred = [], []
-    for ex in data:
-        y_true.append(ex["label"].upper())
-        y_pred.append(_triage(app, ex))
+def _predict(app, chunk: list[tuple[int, dict]], fast_path: bool, pack: int) -> list[tuple[int, dict]]:
+    if pack > 1:
+        from ..agents.triager import triage_items
+        preds = [(r["label"], r["source"]) for r in triage_items([ex for _, ex in chunk], fast_path)]
+    else:
+        preds = [_triage(app, chunk[0][1])]
+    return [(idx, {"title": ex.get("title", ""), "label": ex["label"].upper(), "pred": label, "source": source})
+            for (idx, ex), (label, source) in zip(chunk, preds)]
 
-    # accuracy
-    acc = sum(1 for t,p in zip(y_true,y_pred) if t==p)/len(y_true)
+def evaluate_triage(dataset_path: str, fast_path: bool = True, resume: str | None = None,
+                    pack: int = 1, workers: int = 1, dedup: bool = False) -> Dict:
+    """Triage every example, appending each prediction to a run directory as it lands.
 
-    # per-class
-    per = {}
+    `resume` (a run directory or "latest") skips the examples that run already finished.
+    With `pack` > 1, examples are triaged `pack` at a time in one LLM call (triage only,
+    no drafting) via `triage_items`. `workers` calls run concurrently. The near-duplicate
+    index stays off unless `dedup` is set, so each run measures the current model and prompts.
+    """
+    params = {"fast_path": fast_path, **({"pack": pack} if pack > 1 else {}), **({"dedup": True} if dedup else {})}
+    with open_run("triage", dataset_path, params, resume) as run, triage_index.override(dedup):
+        app = get_graph(fast_path=fast_path)
+        todo = ((idx, ex) for idx, ex in enumerate(load_jsonl(dataset_path)) if idx not in run.done)
+        predict = partial(_predict, app, fast_path=fast_path, pack=pack)
+        for rows in imap_bounded(predict, chunked(todo, pack), workers=workers, ordered=False):
+            for idx, row in rows:
+                run.add(idx, row)
+    summary = summarize_triage(run.rows())
+    run.finish(summary)
+    return {"run": str(run.path), **summary}
+
+def sample_order(examples: list[dict], seed: int = 0) -> list[int]:
+    """Dataset indices in stratified random order.
+
+    A few examples of every gold label come first; after that, each label's examples
+    are spread evenly, so any prefix has about the label mix of the whole dataset.
+    """
+    rng = random.Random(seed)
+    strata = defaultdict(list)
+    for idx, ex in enumerate(examples):
+        strata[ex["label"].upper()].append(idx)
+    keyed = []
+    for _, idxs in sorted(strata.items()):
+        rng.shuffle(idxs)
+        offset = rng.random()
+        for j, idx in enumerate(idxs):
+            keyed.append((0, j, rng.random(), idx) if j < MIN_PER_LABEL
+                         else (1, (j + offset) / len(idxs), rng.random(), idx))
+    return [k[-1] for k in sorted(keyed)]
+
+def estimate_triage(rows: list[Dict], population: Dict[str, int], confidence: float = 0.95,
+                    iters: int = BOOTSTRAP_ITERS, seed: int = 0) -> Dict:
+    """Population accuracy and per-label/macro F1 from a stratified sample, with intervals.
+
+    Each gold label is a stratum weighted by its share of `population` ({label: count}).
+    Intervals come from a stratified bootstrap, narrowed by the finite-population
+    correction so that a complete run has zero width.
+    """
+    k = len(LABELS) + 1  # last slot: labels outside LABELS
+    code = {lbl: i for i, lbl in enumerate(LABELS)}
+    strata = defaultdict(list)
+    for r in rows:
+        strata[r["label"]].append(code.get(r["label"], k - 1) * k + code.get(r["pred"], k - 1))
+    covered = sum(population.get(s, 0) for s in strata)
+    rng = np.random.default_rng(seed)
+    point = np.zeros(k * k)
+    boot = np.zeros((iters, k * k))
+    for s, codes in strata.items():
+        codes = np.asarray(codes)
+        w = population.get(s, 0) / covered / len(codes)
+        point += w * np.bincount(codes, minlength=k * k)
+        draws = codes[rng.integers(0, len(codes), (iters, len(codes)))] + np.arange(iters)[:, None] * k * k
+        boot += w * np.bincount(draws.ravel(), minlength=iters * k * k).reshape(iters, k * k)
+
+    def metrics(cm):  # cm: (..., k, k) weights summing to 1 → accuracy, per-label F1
+        diag = np.diagonal(cm, axis1=-2, axis2=-1)
+        denom = cm.sum(-1) + cm.sum(-2)
+        f1 = np.divide(2 * diag, denom, out=np.zeros_like(denom), where=denom > 0)
+        return diag.sum(-1), f1[..., :len(LABELS)]
+
+    acc, f1 = metrics(point.reshape(k, k))
+    acc_b, f1_b = metrics(boot.reshape(iters, k, k))
+    present = [i for i, lbl in enumerate(LABELS) if population.get(lbl)]
+    n, total = len(rows), sum(population.values())
+    fpc = np.sqrt(max(0.0, (total - n) / (total - 1))) if total > 1 else 0.0
+    tail = (1 - confidence) / 2 * 100
+
+    def interval(value, samples):
+        lo, hi = np.percentile(samples, [tail, 100 - tail])
+        lo, hi = value - (value - lo) * fpc, value + (hi - value) * fpc
+        return {"value": round(float(value), 3), "lo": round(float(min(lo, value)), 3),
+                "hi": round(float(max(hi, value)), 3)}
+
+    return {
+        "sampled": n,
+        "accuracy": interval(acc, acc_b),
+        "macro_f1": interval(f1[present].mean() if present else 0.0,
+                             f1_b[:, present].mean(-1) if present else np.zeros(iters)),
+        "per_label": {LABELS[i]: interval(f1[i], f1_b[:, i]) for i in present},
+    }
+
+def _width(iv: Dict) -> float:
+    return iv["hi"] - iv["lo"]
+
+def evaluate_triage_sampled(dataset_path: str, fast_path: bool = True, resume: str | None = None,
+                            pack: int = 1, workers: int = 8, target_width: float = 0.1, seed: int = 0,
+                            check_every: int | None = None,
+                            on_progress: Callable[[Dict], None] | None = None, dedup: bool = False) -> Dict:
+    """Triage a stratified random sample until the estimates are tight enough.
+
+    Examples are taken in `sample_order` and triaged concurrently. The estimate is
+    refreshed every `check_every` results, or every 5% more results once that is
+    larger, and each refresh is passed to `on_progress`. The run
+    stops once accuracy and macro-F1 intervals are both narrower than `target_width`,
+    or when the dataset is exhausted. `dedup` is as for `evaluate_triage`.
+    """
+    examples = list(load_jsonl(dataset_path))
+    population = Counter(ex["label"].upper() for ex in examples)
+    params = {"fast_path": fast_path, "sample": {"seed": seed, "target_width": target_width},
+              **({"pack": pack} if pack > 1 else {}), **({"dedup": True} if dedup else {})}
+    check_every = check_every or max(20, 2 * workers * pack)
+    stopped = False
+    with open_run("triage", dataset_path, params, resume) as run, triage_index.override(dedup):
+        rows = list(run.rows())
+        app = get_graph(fast_path=fast_path)
+        todo = ((idx, examples[idx]) for idx in sample_order(examples, seed) if idx not in run.done)
+        results = imap_bounded(partial(_predict, app, fast_path=fast_path, pack=pack),
+                               chunked(todo, pack), workers=workers, ordered=False)
+        checked = 0
+        try:
+            for chunk in results:
+                for idx, row in chunk:
+                    run.add(idx, row)
+                    rows.append({"idx": idx, **row})
+                if len(rows) - checked < max(check_every, checked // 20):  # re-bootstrap every ~5%
+                    continue
+                checked = len(rows)
+                est = estimate_triage(rows, population, seed=seed)
+                if on_progress:
+                    on_progress(est)
+                if len(rows) >= MIN_SAMPLE and max(_width(est["accuracy"]), _width(est["macro_f1"])) <= target_width:
+                    stopped = len(rows) < len(examples)
+                    break
+        finally:
+            results.close()  # drops whatever is still in flight
+    est = estimate_triage(rows, population, seed=seed)
+    summary = {**summarize_triage(rows), "population": len(examples), "stopped_early": stopped,
+               "target_width": target_width, "estimate": est}
+    run.finish(summary)
+    return {"run": str(run.path), **summary}
+
+def summarize_triage(rows: Iterable[Dict]) -> Dict:
+    """Accuracy, per-label P/R/F1, confusion and fast-path stats in one pass over `rows`."""
+    n = correct = ruled = ruled_correct = reused = 0
     cm = defaultdict(Counter)
-    for t,p in zip(y_true,y_pred):
+    pred_counts = Counter()
+    for r in rows:
+        t, p = r["label"], r["pred"]
+        n += 1
+        correct += t == p
         cm[t][p] += 1
+        pred_counts[p] += 1
+        if r.get("source") in ("rules", "dedup"):  # decided before the LLM call
+            ruled += 1
+            ruled_correct += t == p
+            reused += r["source"] == "dedup"
+
+    per = {}
     for lbl in LABELS:
         tp = cm[lbl][lbl]
         fp = sum(cm[x][lbl] for x in LABELS if x!=lbl)
@@ -56,9 +216,15 @@ def evaluate_triage(dataset_path: str) -> Dict:
         per[lbl] = {"precision": round(prec,3), "recall": round(rec,3), "f1": round(f1,3)}
 
     return {
-        "size": len(y_true),
-        "accuracy": round(acc,3),
+        "size": n,
+        "accuracy": round(correct/n, 3) if n else 0.0,
         "per_label": per,
         "confusion": {k: dict(v) for k,v in cm.items()},
-        "pred_counts": dict(Counter(y_pred)),
+        "pred_counts": dict(pred_counts),
+        "fast_path": {
+            "short_circuited": ruled,
+            "fraction": round(ruled/n, 3) if n else 0.0,
+            "accuracy": round(ruled_correct/ruled, 3) if ruled else None,
+            "reused": reused,
+        },
     }
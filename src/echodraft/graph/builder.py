@@ -1,43 +1,194 @@
+import operator
+import threading
+from functools import partial
+from typing import Annotated
 from langgraph.graph import StateGraph, START, END
-from .nodes import DraftState, draft_node, explain_node
-from .nodes import TriageState, triage_node, review_node
+from langgraph.types import Send
+from .nodes import DraftState, draft_node, explain_node, generate_draft
+from .nodes import TriageState, triage_node, review_node, pre_triage_node
+from .nodes import REVIEW_CONF_THRESHOLD
+from .speculation import speculative_triage_node
+from .. import config
+from ..instrumentation import NodeTelemetry
 
 # unified state = triage + draft
 class EchoState(DraftState, TriageState, total=False):
     pass
 
-def _route_after_triage(state: EchoState) -> str:
+def _route_after_triage(state: EchoState, review_threshold: float = REVIEW_CONF_THRESHOLD,
+                        with_review: bool = True) -> str:
     label = (state.get("triage_label") or "").upper()
     conf = float(state.get("triage_confidence") or 0.0)
+    review = "review" if with_review else END
     # low-confidence or explicit REVIEW -> review lane
-    if label in ("REVIEW",) or conf < 0.5:
-        return "review"
+    if label in ("REVIEW",) or conf < review_threshold:
+        return review
     if label in ("DRAFT_EMAIL", "DRAFT_NOTION", "DRAFT_LINKEDIN"):
         return "draft"
     if label in ("IGNORE", "NOTIFY"):
         return END
-    return "review"  # default safety
+    return review  # default safety
+
+def _decided_locally(state: TriageState) -> bool:
+    # pre-triage settled it: a rule matched or a near-duplicate decision was reused
+    return state.get("triage_source") in ("rules", "dedup")
+
+def _route_after_pre_triage(state: EchoState, route) -> str:
+    # decided locally → route like a normal triage result; otherwise ask the LLM
+    if _decided_locally(state):
+        return route(state)
+    return "triage"
 
 def _route_after_draft(state: EchoState) -> str:
     return "explain" if state.get("explain") else END
 
-def build_graph():
+def _route_after_speculation(state: EchoState, route, with_explain: bool) -> str:
+    # the speculative draft came back with the triage update: skip the draft node
+    nxt = route(state)
+    if nxt == "draft" and state.get("draft"):
+        return _route_after_draft(state) if with_explain else END
+    return nxt
+
+def build_graph(review_threshold: float = REVIEW_CONF_THRESHOLD,
+                with_review: bool = True, with_explain: bool = True,
+                fast_path: bool = config.PRE_TRIAGE_ENABLED, speculate: bool = False):
+    """Build and compile a fresh graph. Prefer `get_graph()` outside of tests/benchmarks.
+
+    With `fast_path`, the rule engine in `policies.py` runs first and only defers
+    to the LLM triage node when the rules are not conclusive. With `speculate`, likely
+    drafting items are drafted while the LLM triages them (see `speculation.py`).
+    """
     g = StateGraph(EchoState)
-    g.add_node("triage", triage_node)
-    g.add_node("review", review_node)     # NEW
+    route = partial(_route_after_triage, review_threshold=review_threshold, with_review=with_review)
+    g.add_node("triage", partial(speculative_triage_node, route=route) if speculate else triage_node)
     g.add_node("draft", draft_node)
-    g.add_node("explain", explain_node)
-
-    g.add_edge(START, "triage")
-    g.add_conditional_edges("triage", _route_after_triage, {
-        "review": "review",
-        "draft": "draft",
-        END: END
-    })
-    g.add_conditional_edges("draft", _route_after_draft, {
-        "explain": "explain",
-        END: END
-    })
-    g.add_edge("explain", END)
-    g.add_edge("review", END)             
+    if with_review:
+        g.add_node("review", review_node)
+        g.add_edge("review", END)
+    if with_explain:
+        g.add_node("explain", explain_node)
+        g.add_edge("explain", END)
+
+    targets = {**({"review": "review"} if with_review else {}), "draft": "draft", END: END}
+    if fast_path:
+        g.add_node("pre_triage", pre_triage_node)
+        g.add_edge(START, "pre_triage")
+        g.add_conditional_edges("pre_triage", partial(_route_after_pre_triage, route=route),
+                                {"triage": "triage", **targets})
+    else:
+        g.add_edge(START, "triage")
+    if speculate:
+        g.add_conditional_edges("triage", partial(_route_after_speculation, route=route, with_explain=with_explain),
+                                {**targets, **({"explain": "explain"} if with_explain else {})})
+    else:
+        g.add_conditional_edges("triage", route, targets)
+    if with_explain:
+        g.add_conditional_edges("draft", _route_after_draft, {"explain": "explain", END: END})
+    else:
+        g.add_edge("draft", END)
+    return g.compile()
+
+
+def build_triage_graph(fast_path: bool = config.PRE_TRIAGE_ENABLED):
+    """Triage only (pre-triage rules → LLM triage), no drafting or review side effects."""
+    g = StateGraph(TriageState)
+    g.add_node("triage", triage_node)
+    if fast_path:
+        g.add_node("pre_triage", pre_triage_node)
+        g.add_edge(START, "pre_triage")
+        g.add_conditional_edges("pre_triage", lambda s: END if _decided_locally(s) else "triage",
+                                {"triage": "triage", END: END})
+    else:
+        g.add_edge(START, "triage")
+    g.add_edge("triage", END)
     return g.compile()
+
+
+# --- multi-variant drafting: triage once, then fan out one draft per style ---
+class MultiDraftState(EchoState, total=False):
+    styles: list[str]
+    variant_index: int
+    variants: Annotated[list[dict], operator.add]  # each branch appends its own variant
+
+def _triage_for_variants(state: MultiDraftState) -> MultiDraftState:
+    # Same node, but typed with the full state: LangGraph hands the fan-out
+    # router the triage node's input schema, and each Send needs the draft fields.
+    return triage_node(state)
+
+def _pre_triage_for_variants(state: MultiDraftState) -> MultiDraftState:
+    return pre_triage_node(state)
+
+def draft_variant_node(state: MultiDraftState) -> MultiDraftState:
+    idx = state.get("variant_index", 0)
+    draft = generate_draft(state, tags=[f"variant:{idx}"])  # tag lets streaming tell variants apart
+    return {"variants": [{"index": idx, "style": state.get("style", "professional"), "draft": draft}]}
+
+def _fan_out_after_triage(state: MultiDraftState, review_threshold: float = REVIEW_CONF_THRESHOLD):
+    nxt = _route_after_triage(state, review_threshold=review_threshold)
+    if nxt != "draft":
+        return nxt
+    styles = state.get("styles") or [state.get("style", "professional")]
+    base = {k: v for k, v in state.items() if k not in ("styles", "variants")}
+    return [Send("draft_variant", {**base, "style": s, "variant_index": i}) for i, s in enumerate(styles)]
+
+def build_multi_draft_graph(review_threshold: float = REVIEW_CONF_THRESHOLD,
+                            fast_path: bool = config.PRE_TRIAGE_ENABLED):
+    """Triage once, then run `draft_node` for every entry of `styles` in parallel.
+
+    Bound the parallelism per call with `config={"max_concurrency": n}`.
+    """
+    g = StateGraph(MultiDraftState)
+    g.add_node("triage", _triage_for_variants)
+    g.add_node("review", review_node)
+    g.add_node("draft_variant", draft_variant_node)
+
+    route = partial(_fan_out_after_triage, review_threshold=review_threshold)
+    if fast_path:
+        g.add_node("pre_triage", _pre_triage_for_variants)
+        g.add_edge(START, "pre_triage")
+        g.add_conditional_edges("pre_triage", partial(_route_after_pre_triage, route=route),
+                                ["triage", "review", "draft_variant", END])
+    else:
+        g.add_edge(START, "triage")
+    g.add_conditional_edges("triage", route, ["review", "draft_variant", END])
+    g.add_edge("draft_variant", END)
+    g.add_edge("review", END)
+    return g.compile()
+
+
+# --- process-wide registry of compiled graphs ---
+_GRAPHS: dict[tuple, object] = {}
+_GRAPHS_LOCK = threading.Lock()
+
+def _compiled(builder, **options):
+    key = (builder.__name__, tuple(sorted(options.items())))
+    app = _GRAPHS.get(key)
+    if app is None:
+        with _GRAPHS_LOCK:
+            app = _GRAPHS.get(key)
+            if app is None:  # compile lazily, once per configuration
+                app = _GRAPHS[key] = builder(**options).with_config(callbacks=[NodeTelemetry()])
+    return app
+
+def get_graph(review_threshold: float = REVIEW_CONF_THRESHOLD,
+              with_review: bool = True, with_explain: bool = True,
+              fast_path: bool = config.PRE_TRIAGE_ENABLED, speculate: bool = False):
+    """Return the shared compiled graph for this configuration (compiled on first use)."""
+    return _compiled(build_graph, review_threshold=float(review_threshold),
+                     with_review=with_review, with_explain=with_explain, fast_path=fast_path,
+                     speculate=speculate)
+
+def get_multi_draft_graph(review_threshold: float = REVIEW_CONF_THRESHOLD,
+                          fast_path: bool = config.PRE_TRIAGE_ENABLED):
+    """Shared compiled multi-variant graph (see `build_multi_draft_graph`)."""
+    return _compiled(build_multi_draft_graph, review_threshold=float(review_threshold),
+                     fast_path=fast_path)
+
+def get_triage_graph(fast_path: bool = config.PRE_TRIAGE_ENABLED):
+    """Shared compiled triage-only graph (see `build_triage_graph`)."""
+    return _compiled(build_triage_graph, fast_path=fast_path)
+
+def clear_graphs() -> None:
+    """Drop every cached compiled graph (e.g. after swapping nodes in tests)."""
+    with _GRAPHS_LOCK:
+        _GRAPHS.clear()
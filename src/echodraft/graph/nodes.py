@@ -1,11 +1,25 @@
+from collections import Counter
 from typing import TypedDict, Optional
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
-from ..io.prompts import DRAFT_PROMPT, EXPLAIN_PROMPT, TRIAGE_PROMPT
+from ..io.prompts import DRAFT_PROMPT, EXPLAIN_PROMPT, TRIAGE_PROMPT, TRIAGE_GUIDE, TRIAGE_MANY_PROMPT, TRIAGE_ITEM
 import json
+import logging
+import time
+from functools import partial
 from .. import config
+from ..io.prompt_budget import count_tokens, fit_prompt, budget_for
+from ..llm import get_llm
 from ..memory.review_store import enqueue_review
-from ..memory.style_rules import load_rules, apply_rules_to_prompt 
+from ..memory import telemetry
+from ..memory.llm_cache import cached_invoke
+from .policies import NOTIFY_CUES, pre_triage
+from ..memory.personalization import get_personalization
+from ..memory.rule_matcher import record_hits
+from ..memory.style_index import get_style_index
+from ..memory import triage_index
+from ..memory.triage_index import get_index as get_triage_index, minhash
+
+log = logging.getLogger(__name__)
 
 class DraftState(TypedDict, total=False):
     topic: str
@@ -17,35 +31,53 @@ class DraftState(TypedDict, total=False):
     explanation: str
     expectations: str  # <-- if not already present, add this to carry expectations
 
-_llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.7,
-    max_tokens=500
-)
+def _style_hints(state: DraftState) -> str:
+    index = get_style_index()
+    if not len(index) or config.STYLE_HINTS_K <= 0:
+        return "None"
+    query = f"{state.get('topic','')}\n{state.get('style','')}\n{state.get('expectations','')}"
+    hints = index.retrieve_hints(query, k=config.STYLE_HINTS_K)
+    return "\n".join(f"- {h}" for h in hints) or "None"
 
-def draft_node(state: DraftState) -> DraftState:
-    rules = load_rules()
-    personalization = apply_rules_to_prompt(rules)
-    prompt = PromptTemplate.from_template(DRAFT_PROMPT).format(
-        topic=state["topic"],
-        style=state.get("style","professional"),
-        words=state.get("words",220),
-        taboos=", ".join(state.get("taboos", [])) or "None",
-        expectations=state.get("expectations","") or "None",
-        personalization=personalization,  
+def generate_draft(state: DraftState, tags: list[str] | None = None) -> str:
+    """Render the draft prompt and call the model. `tags` label the call's streamed tokens."""
+    text, hits = draft_with_hits(state, tags)
+    if hits:
+        record_hits(hits)
+    return text
+
+def draft_with_hits(state: DraftState, tags: list[str] | None = None) -> tuple[str, Counter]:
+    """`generate_draft` without persisting rule hits (a speculative draft may be discarded)."""
+    personalization = get_personalization()
+    template = PromptTemplate.from_template(DRAFT_PROMPT)
+    prompt = fit_prompt(
+        "draft",
+        partial(template.format, topic=state["topic"], style=state.get("style","professional"),
+                words=state.get("words",220), taboos=", ".join(state.get("taboos", [])) or "None",
+                personalization=personalization.prompt),
+        {"expectations": state.get("expectations","") or "None", "style_hints": _style_hints(state)},
+        budget=budget_for("draft"), trim=("style_hints", "expectations"),
     )
-    resp = _llm.invoke(prompt)
-    return {"draft": resp.content.strip()}
+    llm = get_llm("draft")
+    resp = llm.invoke(prompt, config={"tags": tags}) if tags else llm.invoke(prompt)
+    # apply every replacement locally (the prompt only lists the top ones); bans are all
+    # in the prompt, so one showing up here means the model ignored it
+    text, hits = personalization.matcher.apply(resp.content.strip())
+    bans = sorted(k[4:] for k in hits if k.startswith("ban:"))
+    if bans:
+        log.warning("draft contains banned phrases: %s", "; ".join(bans))
+    return text, hits
+
+def draft_node(state: DraftState) -> DraftState:
+    return {"draft": generate_draft(state)}
 
 
 def explain_node(state: DraftState) -> DraftState:
     if not state.get("explain"):
         return {"explanation": ""}
-    resp = _llm.invoke(EXPLAIN_PROMPT)
+    resp = get_llm("draft").invoke(EXPLAIN_PROMPT)
     return {"explanation": resp.content.strip()}
 
-_triage_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
 class TriageState(TypedDict, total=False):
     surface: str          # "email" | "notion" | "linkedin" | "blog"
     title: str
@@ -55,40 +87,45 @@ class TriageState(TypedDict, total=False):
     triage_label: str
     triage_reason: str
     triage_confidence: float
+    triage_source: str    # "rules" | "dedup" | "llm"
     # fields set by review node:
     review_required: bool
     review_id: str
     review_payload: str
 
 def triage_node(state: TriageState) -> TriageState:
-    prompt = PromptTemplate.from_template(TRIAGE_PROMPT).format(
-        surface=state.get("surface","email"),
-        title=state.get("title",""),
-        metadata=json.dumps(state.get("metadata", {}))[:800],
-        content=state.get("content","")[:8000],
-        stale_days=state.get("stale_days", 30),
+    template = PromptTemplate.from_template(TRIAGE_PROMPT)
+    prompt = fit_prompt(
+        "triage",
+        partial(template.format, surface=state.get("surface","email"), title=state.get("title",""),
+                stale_days=state.get("stale_days", 30)),
+        {"metadata": json.dumps(state.get("metadata", {})), "content": state.get("content","")},
+        budget=budget_for("triage"), trim=("content",), caps={"metadata": 200},
     )
-    resp = _triage_llm.invoke(prompt).content.strip()
+    resp = cached_invoke(get_llm("triage"), prompt, validate=lambda r: _parse_triage(r) is not None)
+    parsed = _parse_triage(resp) or {"label": "REVIEW", "reason": "parse_error", "confidence": 0.0}
+    return _finish_triage(state, parsed)
+
+def _parse_triage(resp: str) -> dict | None:
+    resp = resp.strip()
     start = resp.find("{"); end = resp.rfind("}")
-    parsed = {"label": "REVIEW", "reason": "parse_error", "confidence": 0.0}
     if start != -1 and end != -1 and end > start:
         try:
             parsed = json.loads(resp[start:end+1])
         except Exception:
-            pass
+            return None
+        return parsed if isinstance(parsed, dict) else None
+    return None
 
+def _finish_triage(state: TriageState, parsed: dict) -> TriageState:
+    # model answer → state update, shared by the single and packed triage calls
     label = (parsed.get("label") or "REVIEW").upper()
     reason = parsed.get("reason", "")
     conf = float(parsed.get("confidence", 0))
 
     # --- heuristic fallback to improve NOTIFY recall ---
     text = f"{state.get('title','')} {state.get('content','')}".lower()
-    notify_cues = [
-        "fyi", "for your info", "no action required", "just sharing",
-        "reminder", "outage resolved", "maintenance complete",
-        "all hands", "policy update", "office will be closed", "oo o", "ooo", "out of office"
-    ]
-    if label == "IGNORE" and any(cue in text for cue in notify_cues):
+    if label == "IGNORE" and any(cue in text for cue in NOTIFY_CUES):
         label = "NOTIFY"
         reason = "Heuristic: FYI/awareness cue detected; choose NOTIFY over IGNORE."
         conf = max(conf, 0.7)
@@ -98,7 +135,98 @@ def triage_node(state: TriageState) -> TriageState:
     if label not in allowed:
         label, reason, conf = "REVIEW", "Unknown label from model", 0.0
 
-    return {"triage_label": label, "triage_reason": reason, "triage_confidence": conf}
+    sig = _signature(state)
+    if sig is not None and conf > 0:  # remember it so near-duplicates can skip the LLM
+        get_triage_index().add(state.get("surface", "email"), sig, label, reason, conf,
+                               fingerprint=_triage_fingerprint())
+    return {"triage_label": label, "triage_reason": reason, "triage_confidence": conf, "triage_source": "llm"}
+
+def _parse_packed(resp: str, n: int) -> list[dict | None]:
+    # entry i → parsed object for item id i+1, or None if the model dropped/garbled it
+    start, end = resp.find("["), resp.rfind("]")
+    try:
+        rows = json.loads(resp[start:end+1]) if start != -1 and end > start else []
+    except ValueError:
+        rows = []
+    out: list[dict | None] = [None] * n
+    rows = [r for r in rows if isinstance(r, dict)] if isinstance(rows, list) else []
+    by_id = all(isinstance(r.get("id"), int) for r in rows)
+    for pos, r in enumerate(rows):
+        i = r["id"] - 1 if by_id else pos
+        if 0 <= i < n and isinstance(r.get("label"), str):
+            try:
+                float(r.get("confidence", 0))
+            except (TypeError, ValueError):
+                continue
+            out[i] = r
+    return out
+
+def triage_many(states: list[TriageState]) -> list[TriageState]:
+    """LLM-triage several items with one packed prompt (definitions and few-shots sent once).
+
+    Items are grouped by `stale_days`, which the shared rules mention. Any entry the model
+    leaves out or returns malformed falls back to a single `triage_node` call.
+    """
+    t0 = time.perf_counter()
+    outs: list[TriageState | None] = [None] * len(states)
+    groups: dict[int, list[int]] = {}
+    for i, s in enumerate(states):
+        groups.setdefault(s.get("stale_days", 30), []).append(i)
+    item_budget = budget_for("triage") - count_tokens(TRIAGE_GUIDE)  # what one item gets alone
+    for stale_days, idxs in groups.items():
+        if len(idxs) < 2:
+            continue
+        blocks = [fit_prompt(
+            "triage_item",
+            partial(TRIAGE_ITEM.format, id=n, surface=states[i].get("surface", "email"),
+                    title=states[i].get("title", "")),
+            {"metadata": json.dumps(states[i].get("metadata", {})), "content": states[i].get("content", "")},
+            budget=item_budget, trim=("content",), caps={"metadata": 200},
+        ) for n, i in enumerate(idxs, 1)]
+        prompt = TRIAGE_MANY_PROMPT.format(n=len(idxs), stale_days=stale_days, items="\n".join(blocks))
+        # a partly garbled answer is used, but not cached: the next run asks again
+        resp = cached_invoke(get_llm("triage"), prompt,
+                             validate=lambda r, n=len(idxs): None not in _parse_packed(r, n))
+        for i, parsed in zip(idxs, _parse_packed(resp, len(idxs))):
+            if parsed is not None:
+                outs[i] = _finish_triage(states[i], parsed)
+    missing = [i for i, o in enumerate(outs) if o is None]
+    if missing:
+        log.info("packed triage: %d of %d items answered one at a time", len(missing), len(states))
+    for i in missing:
+        outs[i] = triage_node(states[i])
+    telemetry.record("node", "triage_many", (time.perf_counter() - t0) * 1000, items=len(states),
+                     single=len(missing) or None)
+    return outs
+
+def _signature(state: TriageState) -> bytes | None:
+    if not triage_index.is_enabled():
+        return None
+    return minhash(state.get("title", ""), state.get("content", ""))
+
+def _triage_fingerprint() -> str:
+    # decisions are only reused under the model and prompts that produced them
+    llm = get_llm("triage")
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+    return triage_index.fingerprint(model, getattr(llm, "temperature", None),
+                                    TRIAGE_PROMPT, TRIAGE_GUIDE, TRIAGE_MANY_PROMPT, TRIAGE_ITEM)
+
+def pre_triage_node(state: TriageState) -> TriageState:
+    """Label obvious items with the local rule engine, or reuse the LLM decision for a
+    near-identical item seen recently; leave the rest for `triage_node`."""
+    decision = pre_triage(state)
+    if decision is not None:
+        return {"triage_label": decision["label"], "triage_reason": decision["reason"],
+                "triage_confidence": decision["confidence"], "triage_source": "rules"}
+    sig = _signature(state)
+    match = (get_triage_index().lookup(state.get("surface", "email"), sig, _triage_fingerprint())
+             if sig is not None else None)
+    if match is None:
+        return {}
+    log.info("triage reused for %r: %s (similarity %.2f, %.1fh old)", state.get("title", ""),
+             match["label"], match["similarity"], match["age_s"] / 3600)
+    return {"triage_label": match["label"], "triage_reason": match["reason"],
+            "triage_confidence": match["confidence"], "triage_source": "dedup"}
 
 REVIEW_CONF_THRESHOLD = getattr(config, "REVIEW_CONF_THRESHOLD", 0.5)
 
@@ -1 +1,98 @@
-# Routing and guardrails will live here.
+# Routing policies and guardrails that run without the LLM.
+import re
+from .. import config
+
+# FYI/awareness cues; also used after the LLM to prefer NOTIFY over IGNORE.
+NOTIFY_CUES = [
+    "fyi", "for your info", "no action required", "just sharing",
+    "reminder", "outage resolved", "maintenance complete",
+    "all hands", "policy update", "office will be closed", "oo o", "ooo", "out of office"
+]
+
+# Cue families mirrored from the TRIAGE_PROMPT rules of thumb. Only "ignore" and
+# "echodraft" can decide a label; the others mark an item as ambiguous.
+CUES = {
+    "ignore": [r"unsubscribe", r"promo", r"promo code", r"sale"],
+    "echodraft": [r"#echodraft"],
+    "notify": [re.escape(c) for c in NOTIFY_CUES],
+    "sensitive": [r"hr", r"legal", r"confidential", r"compensation", r"security", r"lawsuit"],
+    "reply": [r"can you", r"could you", r"please confirm", r"let me know"],
+}
+
+SURFACE_DRAFT_LABELS = {
+    "email": "DRAFT_EMAIL",
+    "notion": "DRAFT_NOTION",
+    "linkedin": "DRAFT_LINKEDIN",
+    "blog": "DRAFT_LINKEDIN",
+}
+
+def _compile(cues: dict[str, list[str]]) -> re.Pattern:
+    # One alternation with a named group per family → a single scan per item.
+    groups = []
+    for family, terms in cues.items():
+        alts = "|".join(sorted(terms, key=len, reverse=True))
+        groups.append(f"(?P<{family}>(?<![\\w#])(?:{alts})(?!\\w))")
+    return re.compile("|".join(groups), re.IGNORECASE)
+
+_PATTERN = _compile(CUES)
+
+def match_cues(text: str) -> dict[str, set[str]]:
+    """Return {family: {matched cue, ...}} for every cue family found in `text`."""
+    hits: dict[str, set[str]] = {}
+    for m in _PATTERN.finditer(text):
+        family = m.lastgroup
+        hits.setdefault(family, set()).add(m.group(family).lower())
+    return hits
+
+def pre_triage(state: dict, min_confidence: float = config.PRE_TRIAGE_MIN_CONFIDENCE) -> dict | None:
+    """Deterministic triage for unambiguous items.
+
+    Returns {"label", "reason", "confidence"} when the rules alone decide the item,
+    or None to defer to the LLM (mixed or sensitive cues, or no cue at all).
+    """
+    text = f"{state.get('title','')}\n{state.get('content','')}"
+    hits = match_cues(text)
+    if not hits or "sensitive" in hits:
+        return None
+
+    decision = None
+    if set(hits) == {"echodraft"}:
+        surface = (state.get("surface") or "").lower()
+        label = SURFACE_DRAFT_LABELS.get(surface)
+        if label:
+            decision = {"label": label, "reason": f"Rule: #echodraft tag on {surface}.", "confidence": 0.9}
+    elif set(hits) == {"ignore"}:
+        cues = sorted(hits["ignore"])
+        conf = min(0.95, 0.85 + 0.05 * (len(cues) - 1))
+        decision = {"label": "IGNORE", "reason": f"Rule: promotional cue ({', '.join(cues)}).", "confidence": conf}
+
+    if decision and decision["confidence"] >= min_confidence:
+        return decision
+    return None
+
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_SKELETON = re.compile(r"\b(?:todo|tbd|goals?|scope|timeline|outline|key points|expand)\b", re.IGNORECASE)
+
+def draft_likelihood(state: dict) -> float:
+    """Cheap 0-1 guess that triage will pick a DRAFT_* label (see graph/speculation.py).
+
+    Bullet-only skeletons on writing surfaces and emails asking for a reply score high;
+    anything with ignore/sensitive cues scores near zero.
+    """
+    title, content = state.get("title", ""), state.get("content", "")
+    hits = match_cues(f"{title}\n{content}")
+    if "ignore" in hits or "sensitive" in hits:
+        return 0.05
+    if "echodraft" in hits:
+        return 0.95
+    surface = (state.get("surface") or "").lower()
+    lines = [l for l in content.splitlines() if l.strip()]
+    bullets = sum(1 for l in lines if _BULLET.match(l)) / len(lines) if lines else 0.0
+    score = 0.3
+    if surface in ("notion", "linkedin", "blog") and bullets >= 0.6:
+        score = 0.75 + (0.15 if _SKELETON.search(content) else 0.0)
+    elif surface == "email" and "reply" in hits:
+        score = 0.6
+    if "notify" in hits:
+        score -= 0.3
+    return round(min(1.0, max(0.0, score)), 2)
@@ -0,0 +1,67 @@
+# Speculative drafting: when policies.draft_likelihood says an item will almost surely be
+# drafted, start the draft call alongside the LLM triage call instead of after it. If
+# triage routes elsewhere the draft is cancelled (not started yet) or its result dropped.
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+from .. import config
+from ..memory import telemetry
+from ..memory.rule_matcher import record_hits
+from .nodes import draft_with_hits, triage_node
+from .policies import draft_likelihood
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="echodraft-speculate")
+
+def _timed_draft(state: dict) -> tuple[str, object, float]:
+    t0 = time.perf_counter()
+    text, hits = draft_with_hits(state)
+    return text, hits, time.perf_counter() - t0
+
+def _record_waste(future: Future, likelihood: float, label: str) -> None:
+    # runs when the discarded draft finishes (or right away if it was cancelled)
+    spent = 0.0 if future.cancelled() or future.exception() else future.result()[2]
+    telemetry.record("spec", "wasted", spent * 1000, likelihood=likelihood, label=label,
+                     cancelled=future.cancelled() or None)
+
+def speculative_triage_node(state: dict, route: Callable[[dict], str]) -> dict:
+    """`triage_node`, plus a draft started in parallel for likely drafting items.
+
+    When `route` sends the triaged item to "draft", the speculative draft is returned in
+    the same update (the graph then skips `draft_node`). Otherwise it is discarded.
+    """
+    likelihood = draft_likelihood(state)
+    if likelihood < config.SPECULATE_MIN_LIKELIHOOD:
+        return triage_node(state)
+    t0 = time.perf_counter()
+    future = _pool.submit(_timed_draft, dict(state))
+    out = triage_node(state)
+    triage_s = time.perf_counter() - t0
+    if route({**state, **out}) != "draft":
+        future.cancel()
+        future.add_done_callback(lambda f: _record_waste(f, likelihood, out.get("triage_label")))
+        return out
+    text, hits, draft_s = future.result()
+    if hits:
+        record_hits(hits)
+    # sequential would have been triage_s + draft_s; in parallel the shorter one is hidden
+    telemetry.record("spec", "used", min(triage_s, draft_s) * 1000, likelihood=likelihood,
+                     label=out.get("triage_label"))
+    return {**out, "draft": text}
+
+def speculation_stats(window_s: float | None = None) -> dict:
+    """How often speculation paid off, the latency it saved and the draft time it wasted."""
+    since = time.time() - window_s if window_s else None
+    used, wasted = [], []
+    for ev in telemetry.iter_events(since):
+        if ev["kind"] == "spec":
+            (used if ev["name"] == "used" else wasted).append(ev["ms"])
+    n = len(used) + len(wasted)
+    return {
+        "speculated": n,
+        "used": len(used),
+        "wasted": len(wasted),
+        "waste_rate": round(len(wasted) / n, 3) if n else None,
+        "saved_ms_total": round(sum(used), 1),
+        "saved_ms_p50": telemetry.percentile(sorted(used), 50) if used else None,
+        "wasted_draft_ms_total": round(sum(wasted), 1),
+    }
@@ -0,0 +1,67 @@
+# Callback handlers that feed memory/telemetry.py: graph node timings and per-call LLM usage.
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+from .io.prompt_budget import count_tokens
+from .memory.telemetry import record
+
+class NodeTelemetry(BaseCallbackHandler):
+    """Records wall time and outcome label for each LangGraph node run (and whole runs)."""
+
+    def __init__(self):
+        self._starts: dict = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            self._starts[run_id] = ("graph", kwargs.get("name") or "graph", time.perf_counter())
+        elif node and kwargs.get("name") == node:  # the node itself, not runnables nested in it
+            self._starts[run_id] = ("node", node, time.perf_counter())
+
+    def _finish(self, run_id, outputs=None, ok=True):
+        start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        kind, name, t0 = start
+        label = outputs.get("triage_label") if isinstance(outputs, dict) else None
+        source = outputs.get("triage_source") if isinstance(outputs, dict) else None
+        record(kind, name, (time.perf_counter() - t0) * 1000, label=label, source=source,
+               ok=None if ok else False)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._finish(run_id, outputs)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id, ok=False)
+
+
+class LLMTelemetry(BaseCallbackHandler):
+    """Attached to each `get_llm(role)` client: wall time and token usage per call."""
+
+    def __init__(self, role: str):
+        self.role = role
+        self._starts: dict = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._starts[run_id] = (time.perf_counter(), messages)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._starts[run_id] = (time.perf_counter(), prompts)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        t0, prompt = start
+        gen = response.generations[0][0] if response.generations and response.generations[0] else None
+        usage = getattr(getattr(gen, "message", None), "usage_metadata", None) or {}
+        in_tok, out_tok = usage.get("input_tokens"), usage.get("output_tokens")
+        if in_tok is None:  # no usage reported (fakes, some streams): estimate
+            text = "\n".join(str(getattr(m, "content", m)) for batch in prompt for m in
+                             (batch if isinstance(batch, list) else [batch]))
+            in_tok, out_tok = count_tokens(text), count_tokens(gen.text if gen else "")
+        record("llm", self.role, (time.perf_counter() - t0) * 1000, in_tok=in_tok, out_tok=out_tok)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        start = self._starts.pop(run_id, None)
+        if start is not None:
+            record("llm", self.role, (time.perf_counter() - start[0]) * 1000, ok=False)
@@ -1,6 +1,33 @@
+import email
+import re
+from email import policy
 from pathlib import Path
 
 def save_text(path: str, content: str) -> None:
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
     p.write_text(content, encoding="utf-8")
+
+_HEADING = re.compile(r"^\s*#+\s+(.+)$", re.MULTILINE)
+_MAIL_HEADER = re.compile(rb"^(?:From|Subject|Date|To|Message-ID|Received|Return-Path):", re.IGNORECASE)
+
+def _is_mail(path: Path, raw: bytes) -> bool:
+    # .eml files, or maildir messages (cur/ new/ tmp/) that start with RFC 822 headers
+    return path.suffix.lower() == ".eml" or (path.parent.name in ("cur", "new", "tmp")
+                                             and bool(_MAIL_HEADER.match(raw)))
+
+def parse_doc(path: str | Path, raw: bytes, surface: str | None = None) -> dict:
+    """Turn a file's bytes into a triage item: {surface, title, content}.
+
+    Mail (.eml / maildir) → subject + plain-text body on the "email" surface; anything
+    else is text (a Notion/Markdown export) titled by its first heading or file name.
+    """
+    path = Path(path)
+    if _is_mail(path, raw):
+        msg = email.message_from_bytes(raw, policy=policy.default)
+        body = msg.get_body(preferencelist=("plain", "html"))
+        content = body.get_content() if body is not None else ""
+        return {"surface": surface or "email", "title": str(msg.get("subject", "") or ""), "content": content}
+    text = raw.decode("utf-8", errors="replace")
+    m = _HEADING.search(text[:2000])
+    return {"surface": surface or "notion", "title": m.group(1).strip() if m else path.stem, "content": text}
@@ -0,0 +1,203 @@
+# Folder ingest: a local directory stands in for a Notion export or maildir. A manifest
+# of (path, mtime, size, sha256) per file means a rescan only stats the tree; just new
+# or changed documents are read, hashed and triaged, and their decisions recorded.
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from .. import config
+from ..concurrency import chunked, imap_bounded
+from .docs import parse_doc
+
+MANIFEST_PATH = config.DATA_DIR/"ingest.sqlite"
+log = logging.getLogger(__name__)
+
+
+def walk(root: Path, failed: set[str] | None = None) -> Iterator[tuple[str, int, int]]:
+    """(relative path, mtime_ns, size) of every regular, non-hidden file under `root`.
+
+    Subdirectories that cannot be listed are skipped and their relative paths added to
+    `failed`; an unreadable `root` raises.
+    """
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            if path == root:
+                raise
+            if failed is not None:  # keep scanning, but remember what we could not see
+                failed.add(os.path.relpath(path, root))
+            continue
+        with it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    yield os.path.relpath(entry.path, root), st.st_mtime_ns, st.st_size
+
+
+class Manifest:
+    """Per-root file state and the last triage decision for each file."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path or MANIFEST_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS files (
+            root TEXT, path TEXT, mtime_ns INTEGER, size INTEGER, sha256 TEXT,
+            label TEXT, reason TEXT, confidence REAL, source TEXT, triaged_at REAL,
+            PRIMARY KEY (root, path))""")
+
+    def load(self, root: str) -> dict[str, tuple[int, int, str]]:
+        """{path: (mtime_ns, size, sha256)} for everything recorded under `root`."""
+        rows = self._db.execute("SELECT path, mtime_ns, size, sha256 FROM files WHERE root=?", (root,))
+        return {p: (m, s, h) for p, m, s, h in rows}
+
+    def decisions(self, root: str) -> list[dict]:
+        rows = self._db.execute("""SELECT path, label, reason, confidence, source, triaged_at
+                                   FROM files WHERE root=? ORDER BY path""", (root,))
+        return [dict(zip(("path", "label", "reason", "confidence", "source", "triaged_at"), r)) for r in rows]
+
+    def record(self, root: str, results: list[dict]) -> None:
+        """Store one batch in a single transaction (triaged files and touched-only files)."""
+        with self._db:
+            for r in results:
+                if r.get("label") is None:  # content unchanged: only the stat moved
+                    self._db.execute("UPDATE files SET mtime_ns=?, size=? WHERE root=? AND path=?",
+                                     (r["mtime_ns"], r["size"], root, r["path"]))
+                else:
+                    self._db.execute("INSERT OR REPLACE INTO files VALUES (?,?,?,?,?,?,?,?,?,?)",
+                                     (root, r["path"], r["mtime_ns"], r["size"], r["sha256"], r["label"],
+                                      r["reason"], r["confidence"], r["source"], time.time()))
+
+    def remove(self, root: str, paths: Iterable[str]) -> None:
+        with self._db:
+            self._db.executemany("DELETE FROM files WHERE root=? AND path=?", ((root, p) for p in paths))
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def ingest(root: str | Path, surface: str | None = None, batch_size: int = 64, workers: int = 8,
+           fast_path: bool = True, pack: int = 1, manifest: Manifest | None = None,
+           on_result: Callable[[dict], None] | None = None) -> dict:
+    """Scan `root` once and triage only new or changed files; returns stats.
+
+    Files whose mtime and size match the manifest are not opened. Changed stats lead
+    to a re-hash, and only a different hash is triaged. Decisions are written per
+    batch, so an interrupted scan keeps the work it finished. Files that fail to
+    triage are left unrecorded and retried on the next scan. With `pack` > 1, changed
+    documents share packed triage calls (`triage_items`).
+
+    Raises ValueError if `root` is not a directory: a missing or unmounted root must not
+    read as "every file deleted". Records under subdirectories that could not be listed
+    are kept as they are.
+    """
+    from ..agents.triager import triage_item, triage_items
+
+    t0 = time.perf_counter()
+    root_path = Path(root).resolve()
+    if not root_path.is_dir():
+        raise ValueError(f"{root} is not a directory")
+    key = str(root_path)
+    own = manifest is None
+    manifest = manifest or Manifest()
+    known = manifest.load(key)
+    stats = {"files": 0, "unchanged": 0, "touched": 0, "triaged": 0, "removed": 0, "errors": 0}
+    seen: set[str] = set()
+    failed: set[str] = set()
+
+    def candidates() -> Iterator[tuple[str, int, int]]:
+        for rel, mtime_ns, size in walk(root_path, failed):
+            stats["files"] += 1
+            seen.add(rel)
+            old = known.get(rel)
+            if old and old[0] == mtime_ns and old[1] == size:
+                stats["unchanged"] += 1
+            else:
+                yield rel, mtime_ns, size
+
+    def prepare(cand: tuple[str, int, int]) -> tuple[dict, dict | None]:
+        rel, mtime_ns, size = cand
+        rec = {"path": rel, "mtime_ns": mtime_ns, "size": size}
+        try:
+            raw = (root_path/rel).read_bytes()
+            rec["sha256"] = hashlib.sha256(raw).hexdigest()
+            old = known.get(rel)
+            if old and old[2] == rec["sha256"]:
+                return rec, None  # touched or copied, same content: keep the decision
+            item = parse_doc(rel, raw, surface)
+        except Exception as e:  # one bad file must not stop the scan
+            rec["error"] = f"{type(e).__name__}: {e}"
+            return rec, None
+        mtime = datetime.fromtimestamp(mtime_ns / 1e9, timezone.utc).isoformat(timespec="seconds")
+        item["metadata"] = {"path": rel, "modified": mtime}
+        return rec, item
+
+    def triage(chunk: list[tuple[dict, dict]]) -> None:
+        try:
+            results = (triage_items([item for _, item in chunk], fast_path=fast_path) if pack > 1
+                       else [triage_item(chunk[0][1], fast_path=fast_path)])
+            for (rec, _), res in zip(chunk, results):
+                rec.update(res)
+        except Exception as e:
+            for rec, _ in chunk:
+                rec["error"] = f"{type(e).__name__}: {e}"
+
+    try:
+        for batch in chunked(candidates(), batch_size):
+            prepared = list(imap_bounded(prepare, batch, workers=workers))
+            todo = [(rec, item) for rec, item in prepared if item is not None]
+            for _ in imap_bounded(triage, chunked(todo, pack), workers=workers, ordered=False):
+                pass
+            results = [rec for rec, _ in prepared]
+            ok = [r for r in results if "error" not in r]
+            manifest.record(key, ok)
+            for r in results:
+                if "error" in r:
+                    stats["errors"] += 1
+                elif "label" in r:
+                    stats["triaged"] += 1
+                else:
+                    stats["touched"] += 1
+                if on_result and ("label" in r or "error" in r):
+                    on_result(r)
+        hidden = tuple(d + os.sep for d in failed)
+        gone = [p for p in known if p not in seen and not p.startswith(hidden)]
+        manifest.remove(key, gone)
+        stats["removed"] = len(gone)
+        if failed:
+            stats["unreadable_dirs"] = len(failed)
+    finally:
+        if own:
+            manifest.close()
+    stats["elapsed_s"] = round(time.perf_counter() - t0, 3)
+    return stats
+
+def watch(root: str | Path, interval: float = 30.0, on_scan: Callable[[dict], None] | None = None,
+          **kwargs) -> None:
+    """Run `ingest` every `interval` seconds until interrupted; a scan that finds the
+    root missing (e.g. unmounted) is skipped and the manifest left alone."""
+    manifest = Manifest()
+    try:
+        while True:
+            try:
+                stats = ingest(root, manifest=manifest, **kwargs)
+            except (ValueError, OSError) as e:
+                log.warning("ingest scan skipped: %s", e)
+            else:
+                if on_scan:
+                    on_scan(stats)
+            time.sleep(interval)
+    finally:
+        manifest.close()
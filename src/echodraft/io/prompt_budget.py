@@ -0,0 +1,142 @@
+# Token budgets for prompts: count tokens per section with tiktoken and trim long
+# sections by structure (headings, start and end survive) instead of slicing chars.
+import logging
+import re
+import threading
+from typing import Callable, Sequence
+from .. import config
+
+log = logging.getLogger(__name__)
+
+MODEL = "gpt-4o-mini"
+_HEADING = re.compile(r"^(\s{0,3}#{1,6}\s|(subject|from|to|cc|date):|\S.{0,60}:\s*$)", re.IGNORECASE)
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+def _get_encoder():
+    global _encoder
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                try:
+                    import tiktoken
+                    _encoder = tiktoken.encoding_for_model(MODEL)
+                except Exception as e:  # offline and no cached BPE file: estimate instead
+                    log.warning("tiktoken unavailable (%s); estimating 4 chars/token", e)
+                    _encoder = False
+    return _encoder or None
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    enc = _get_encoder()
+    return len(enc.encode(text, disallowed_special=())) if enc else (len(text) + 3) // 4
+
+def _cut(text: str, max_tokens: int, from_end: bool = False) -> str:
+    """First (or last) `max_tokens` tokens of `text`."""
+    if max_tokens <= 0:
+        return ""
+    enc = _get_encoder()
+    if enc is None:
+        n = max_tokens * 4
+        return text[-n:] if from_end else text[:n]
+    toks = enc.encode(text, disallowed_special=())
+    return enc.decode(toks[-max_tokens:] if from_end else toks[:max_tokens])
+
+def _marker(n: int) -> str:
+    return f"[… {n} line{'s' if n != 1 else ''} omitted …]"
+
+def trim_text(text: str, max_tokens: int, head_share: float = 0.6) -> str:
+    """Shrink `text` to about `max_tokens` tokens, keeping headings, the start and the end.
+
+    Whole lines are kept (plus a partial line where the head runs out); every gap is
+    replaced by an "[… N lines omitted …]" marker.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    lines = text.splitlines()
+    if len(lines) < 3:  # one long paragraph: keep its start and end
+        head = int(max_tokens * head_share)
+        return f"{_cut(text, head)} […] {_cut(text, max_tokens - head - 3, from_end=True)}"
+
+    costs = [count_tokens(l) + 1 for l in lines]
+    budget = max_tokens - 2 * count_tokens(_marker(len(lines)))
+    keep: dict[int, str] = {}
+    used = 0
+    for i, line in enumerate(lines):  # headings first, up to a quarter of the budget
+        if _HEADING.match(line) and used + costs[i] <= budget // 4:
+            keep[i] = line
+            used += costs[i]
+
+    head_budget = int((budget - used) * head_share)
+    tail_budget = budget - used - head_budget
+    i = 0
+    while i < len(lines) and head_budget > 0:
+        if i not in keep:
+            if costs[i] > head_budget:
+                if head_budget > 16:  # room for a useful partial line
+                    keep[i] = _cut(lines[i], head_budget - 2) + " …"
+                break
+            keep[i] = lines[i]
+            head_budget -= costs[i]
+        i += 1
+    j = len(lines) - 1
+    while j > i and costs[j] <= tail_budget:
+        if j not in keep:
+            keep[j] = lines[j]
+            tail_budget -= costs[j]
+        j -= 1
+
+    out, gap = [], 0
+    for n in range(len(lines)):
+        if n in keep:
+            if gap:
+                out.append(_marker(gap))
+                gap = 0
+            out.append(keep[n])
+        else:
+            gap += 1
+    if gap:
+        out.append(_marker(gap))
+    return "\n".join(out)
+
+def _shares(sizes: dict[str, int], available: int) -> dict[str, int]:
+    # water-filling: small sections keep everything, large ones split what is left
+    shares, left = {}, max(0, available)
+    for k in sorted(sizes, key=sizes.get):
+        shares[k] = min(sizes[k], left // (len(sizes) - len(shares)))
+        left -= shares[k]
+    return shares
+
+def fit_prompt(name: str, render: Callable[..., str], sections: dict[str, str], budget: int,
+               trim: Sequence[str] = (), caps: dict[str, int] | None = None) -> str:
+    """Render `render(**sections)` within `budget` tokens.
+
+    `caps` bounds individual sections first; if the prompt is still over budget the
+    `trim` sections share what the fixed parts leave. Token counts are logged per call.
+    """
+    sections = dict(sections)
+    for k, cap in (caps or {}).items():
+        sections[k] = trim_text(sections[k], cap)
+    prompt = render(**sections)
+    total = count_tokens(prompt)
+    trimmed = total > budget and bool(trim)
+    if trimmed:
+        sizes = {k: count_tokens(sections[k]) for k in trim}
+        fixed = count_tokens(render(**{**sections, **{k: "" for k in trim}}))
+        for attempt in range(3):  # markers/joins can overshoot slightly: tighten and retry
+            shares = _shares(sizes, budget - fixed - 16 * (attempt + 1) * len(trim))
+            prompt = render(**{**sections, **{k: trim_text(sections[k], shares[k]) for k in trim}})
+            new_total = count_tokens(prompt)
+            if new_total <= budget:
+                break
+        log.info("prompt %s: trimmed %d → %d tokens (budget %d)", name, total, new_total, budget)
+        total = new_total
+    if log.isEnabledFor(logging.DEBUG):
+        parts = " ".join(f"{k}={count_tokens(v)}" for k, v in sections.items() if isinstance(v, str))
+        log.debug("prompt %s: %d tokens (%s)%s", name, total, parts, " [trimmed]" if trimmed else "")
+    return prompt
+
+def budget_for(role: str) -> int:
+    return config.PROMPT_BUDGETS[role]
@@ -8,6 +8,9 @@ Avoid taboo phrases if any are provided: {taboos}
 
 Personalization rules: {personalization}
 
+Samples of the user's own writing (mirror their voice and phrasing, not their content):
+{style_hints}
+
 Must include (if provided):
 - Expectations checklist: {expectations}
 
@@ -21,16 +24,8 @@ Deliver a self-contained draft that explicitly satisfies the expectations."""
 EXPLAIN_PROMPT = """Explain (2-3 sentences) the main stylistic choices you made for this draft so the user understands why it fits the requested style."""
 
 
-TRIAGE_PROMPT = """You are EchoDraft’s triage agent.
-
-Return ONLY one JSON object with fields:
-{{
-  "label": "IGNORE|NOTIFY|DRAFT_EMAIL|DRAFT_NOTION|DRAFT_LINKEDIN|REVIEW",
-  "reason": "<short reason>",
-  "confidence": 0-1
-}}
-
-Definitions (decide using these, in this order):
+# Definitions, rules of thumb and few-shots shared by the single and packed triage prompts.
+TRIAGE_GUIDE = """Definitions (decide using these, in this order):
 1) DRAFT_EMAIL  → An email clearly needs a reply or follow-up (confirmations, scheduling, questions).
 2) DRAFT_NOTION → A Notion page is an incomplete proposal/brief/PRD (headings like Goals/Scope/Timeline; bullet-only skeleton).
 3) DRAFT_LINKEDIN → A LinkedIn/blog draft is bullet-only but contains a clear topic/CTA and should be expanded.
@@ -55,7 +50,18 @@ surface=linkedin; title="AI in education — draft post"; content="- Hook ...\\n
 surface=email; title="HR Matter — Formal Notice"; content="Please do not respond without HR guidance." → REVIEW
 ---
 
-Context:
+"""
+
+TRIAGE_PROMPT = """You are EchoDraft’s triage agent.
+
+Return ONLY one JSON object with fields:
+{{
+  "label": "IGNORE|NOTIFY|DRAFT_EMAIL|DRAFT_NOTION|DRAFT_LINKEDIN|REVIEW",
+  "reason": "<short reason>",
+  "confidence": 0-1
+}}
+
+""" + TRIAGE_GUIDE + """Context:
 surface="{surface}"  # one of: email|notion|linkedin|blog
 title="{title}"
 metadata="{metadata}"
@@ -63,6 +69,29 @@ content:
 \"\"\"{content}\"\"\"
 """
 
+# Packed triage: the guide is sent once for a whole batch of items (see graph/nodes.py).
+TRIAGE_MANY_PROMPT = """You are EchoDraft’s triage agent.
+
+Triage each of the {n} items below independently. Return ONLY a JSON array with
+exactly one object per item, in item order:
+[
+  {{"id": <item id>, "label": "IGNORE|NOTIFY|DRAFT_EMAIL|DRAFT_NOTION|DRAFT_LINKEDIN|REVIEW",
+    "reason": "<short reason>", "confidence": 0-1}},
+  ...
+]
+
+""" + TRIAGE_GUIDE + """Items:
+{items}
+"""
+
+TRIAGE_ITEM = """### Item {id}
+surface="{surface}"
+title="{title}"
+metadata="{metadata}"
+content:
+\"\"\"{content}\"\"\"
+"""
+
 REFINE_PROMPT = """Revise the DRAFT to address the EVAL feedback and meet EXPECTATIONS.
 Only produce the improved draft.
 
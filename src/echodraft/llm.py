@@ -0,0 +1,41 @@
+"""Chat-model clients, created on first use so importing EchoDraft stays cheap."""
+import threading
+from typing import Callable
+
+# One entry per role; each role gets its own client instance.
+SPECS: dict[str, dict] = {
+    "draft":  {"model": "gpt-4o-mini", "temperature": 0.7, "max_tokens": 500},
+    "triage": {"model": "gpt-4o-mini", "temperature": 0},
+    "revise": {"model": "gpt-4o-mini", "temperature": 0.4, "max_tokens": 700},
+    "eval":   {"model": "gpt-4o-mini", "temperature": 0},
+    "refine": {"model": "gpt-4o-mini", "temperature": 0, "max_tokens": 600},  # deterministic, short
+}
+
+def _openai_factory(role: str, spec: dict):
+    from langchain_openai import ChatOpenAI  # heavy import, deferred until a model is needed
+    return ChatOpenAI(stream_usage=True, **spec)  # usage on streamed calls too (telemetry)
+
+_factory: Callable[[str, dict], object] = _openai_factory
+_clients: dict[str, object] = {}
+_lock = threading.Lock()
+
+def get_llm(role: str):
+    """Return the shared client for `role` ("draft", "triage", "revise", "eval", "refine")."""
+    client = _clients.get(role)
+    if client is None:
+        with _lock:
+            client = _clients.get(role)
+            if client is None:
+                client = _factory(role, SPECS[role])
+                if hasattr(client, "callbacks"):  # chat models: time and count tokens per call
+                    from .instrumentation import LLMTelemetry
+                    client.callbacks = [*(client.callbacks or []), LLMTelemetry(role)]
+                _clients[role] = client
+    return client
+
+def set_llm_factory(factory: Callable[[str, dict], object] | None) -> None:
+    """Swap how clients are built (e.g. a fake model for tests/benchmarks); `None` restores OpenAI."""
+    global _factory
+    with _lock:
+        _factory = factory or _openai_factory
+        _clients.clear()
@@ -1,4 +1,5 @@
 import difflib
+import re
 
 def line_level_diff(original: str, edited: str) -> list[str]:
     """
@@ -28,3 +29,54 @@ def line_level_diff(original: str, edited: str) -> list[str]:
             for l in edit_lines[j1 + (i2-i1):j2]:
                 diffs.append(f"+ {l}")
     return diffs
+
+_WORD = re.compile(r"\S+")
+
+def _phrase_ops(old: str, new: str) -> list[str]:
+    # word-level ops inside one changed line, same "- "/"+ "/"~ A ==> B" format
+    a, b = _WORD.findall(old), _WORD.findall(new)
+    ops = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(a=a, b=b, autojunk=False).get_opcodes():
+        if tag == "delete":
+            ops.append("- " + " ".join(a[i1:i2]))
+        elif tag == "insert":
+            ops.append("+ " + " ".join(b[j1:j2]))
+        elif tag == "replace":
+            ops.append(f"~ {' '.join(a[i1:i2])} ==> {' '.join(b[j1:j2])}")
+    return ops
+
+def word_level_diff(original: str, edited: str, min_similarity: float = 0.5) -> list[str]:
+    """Like `line_level_diff`, but changed lines are diffed word by word.
+
+    Identical prefixes/suffixes are skipped before matching. Inside replace blocks a
+    line pair that is at least `min_similarity` alike yields phrase-level ops;
+    rewritten lines are reported as a whole-line delete + insert.
+    """
+    if original == edited:
+        return []
+    a, b = original.splitlines(), edited.splitlines()
+    lo = 0
+    while lo < min(len(a), len(b)) and a[lo] == b[lo]:
+        lo += 1
+    hi = 0
+    while hi < min(len(a), len(b)) - lo and a[-1 - hi] == b[-1 - hi]:
+        hi += 1
+    a, b = a[lo:len(a) - hi], b[lo:len(b) - hi]
+
+    diffs = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(a=a, b=b, autojunk=False).get_opcodes():
+        if tag == "delete":
+            diffs.extend(f"- {l}" for l in a[i1:i2])
+        elif tag == "insert":
+            diffs.extend(f"+ {l}" for l in b[j1:j2])
+        elif tag == "replace":
+            for l_old, l_new in zip(a[i1:i2], b[j1:j2]):
+                sm = difflib.SequenceMatcher(a=l_old, b=l_new, autojunk=False)
+                if sm.real_quick_ratio() >= min_similarity and sm.quick_ratio() >= min_similarity \
+                        and sm.ratio() >= min_similarity:
+                    diffs.extend(_phrase_ops(l_old, l_new))
+                else:
+                    diffs += [f"- {l_old}", f"+ {l_new}"]
+            diffs.extend(f"- {l}" for l in a[i1 + (j2 - j1):i2])
+            diffs.extend(f"+ {l}" for l in b[j1 + (i2 - i1):j2])
+    return diffs
@@ -0,0 +1,67 @@
+# Bulk `learn-edits`: mine bans/replacements from many original/edited pairs in a
+# process pool, then merge the counts into the rules file with a single write.
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator
+from .diff_utils import word_level_diff
+from .style_rules import mine_rules, merge_mined_counts
+
+def pairs_from_dir(root: str | Path) -> Iterator[tuple[str, str]]:
+    """`root/original/<name>` ↔ `root/edited/<name>` (any nesting, matched by relative path)."""
+    root = Path(root)
+    for orig in sorted((root/"original").rglob("*")):
+        if orig.is_file():
+            edited = root/"edited"/orig.relative_to(root/"original")
+            if edited.is_file():
+                yield str(orig), str(edited)
+
+def pairs_from_manifest(path: str | Path) -> Iterator[tuple[str, str]]:
+    """JSONL lines of {"original": ..., "edited": ...}; relative paths resolve against the manifest."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                yield str(path.parent/row["original"]), str(path.parent/row["edited"])
+
+def mine_pair(pair: tuple[str, str]) -> tuple[Counter, Counter]:
+    """(ban counts, replacement counts) for one file pair; unreadable pairs mine nothing."""
+    try:
+        with open(pair[0], "r", encoding="utf-8") as f:
+            original = f.read()
+        with open(pair[1], "r", encoding="utf-8") as f:
+            edited = f.read()
+    except (OSError, UnicodeDecodeError):
+        return Counter(), Counter()
+    bans, repl = mine_rules(word_level_diff(original, edited))
+    return Counter(bans), Counter(repl)
+
+def learn_from_pairs(pairs: Iterable[tuple[str, str]], workers: int | None = None,
+                     min_count: int = 1, chunksize: int = 32, top_only: bool = False) -> dict:
+    """Mine every pair (in `workers` processes) and merge the results once; returns stats.
+
+    `min_count` and `top_only` are passed to `merge_mined_counts`.
+    """
+    workers = workers or os.cpu_count() or 1
+    bans, repl = Counter(), Counter()
+    n = 0
+    if workers == 1:
+        results = map(mine_pair, pairs)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(mine_pair, pairs, chunksize=chunksize)
+    try:
+        for b, r in results:
+            bans.update(b)
+            repl.update(r)
+            n += 1
+    finally:
+        if pool:
+            pool.shutdown()
+    rules = merge_mined_counts(bans, repl, min_count=min_count, top_only=top_only)
+    return {"pairs": n, "mined_bans": len(bans), "mined_replacements": len(repl),
+            "bans": len(rules["bans"]), "replacements": len(rules["replacements"])}
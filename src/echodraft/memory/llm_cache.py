@@ -0,0 +1,128 @@
+import hashlib, json, sqlite3, threading, time
+from pathlib import Path
+from typing import Callable
+from .. import config
+from . import telemetry
+
+class LLMCache:
+    """SQLite-backed response cache keyed on (model, temperature, max_tokens, prompt hash).
+
+    Entries expire after `ttl_seconds`; once the table holds more than `max_entries`
+    rows the least recently used ones are evicted. Safe to share across threads.
+    """
+
+    def __init__(self, path: Path | None = None, max_entries: int = config.LLM_CACHE_MAX_ENTRIES,
+                 ttl_seconds: float = config.LLM_CACHE_TTL_SECONDS):
+        self.path = Path(path or config.DATA_DIR/"llm_cache.sqlite")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._db: sqlite3.Connection | None = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY, model TEXT, response TEXT,
+                created REAL, last_used REAL)""")
+            db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+            self._size = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            self._db = db
+        return self._db
+
+    @staticmethod
+    def key(model: str, temperature, max_tokens, prompt: str) -> str:
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        raw = json.dumps([model, temperature, max_tokens, prompt_hash])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            row = db.execute("SELECT response, created FROM responses WHERE key=?", (key,)).fetchone()
+            if row and self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                db.execute("DELETE FROM responses WHERE key=?", (key,))
+                db.commit()
+                self._size -= 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET last_used=? WHERE key=?", (now, key))
+            db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            # rowcount is 1 for a replace too, so look the key up to keep _size exact
+            exists = db.execute("SELECT 1 FROM responses WHERE key=?", (key,)).fetchone()
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?,?,?,?,?)",
+                       (key, model, response, now, now))
+            self._size += 0 if exists else 1
+            if self.max_entries and self._size > self.max_entries:
+                # evict LRU entries, leaving ~10% headroom so we don't evict on every put
+                target = int(self.max_entries * 0.9)
+                db.execute("""DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)""", (self._size - target,))
+                self._size = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM responses")
+            db.commit()
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._conn()
+            return {"hits": self.hits, "misses": self.misses, "entries": self._size}
+
+
+_cache: LLMCache | None = None
+_enabled = config.LLM_CACHE_ENABLED
+
+def get_cache() -> LLMCache:
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = enabled
+
+def is_enabled() -> bool:
+    return _enabled
+
+def cached_invoke(llm, prompt: str, validate: Callable[[str], bool] | None = None) -> str:
+    """Return `llm.invoke(prompt).content`, served from the cache for temperature-0 clients.
+
+    With `validate`, only responses it accepts are stored or served from the cache, so
+    an unparseable answer is retried next time instead of being replayed for the TTL.
+    """
+    temperature = getattr(llm, "temperature", None)
+    if not _enabled or temperature != 0:
+        return llm.invoke(prompt).content
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+    cache = get_cache()
+    t0 = time.perf_counter()
+    key = cache.key(model, temperature, getattr(llm, "max_tokens", None), prompt)
+    hit = cache.get(key)
+    if hit is not None and (validate is None or validate(hit)):
+        telemetry.record("llm", telemetry.role_of(llm), (time.perf_counter() - t0) * 1000, cached=True)
+        return hit
+    content = llm.invoke(prompt).content
+    if validate is None or validate(content):
+        cache.put(key, model, content)
+    return content
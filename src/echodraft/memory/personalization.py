@@ -0,0 +1,92 @@
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from .. import config
+from . import style_rules
+from .feedback_store import FeedbackStore
+from .rule_matcher import RuleMatcher, hits_stamp, load_hits
+from .user_profile import UserProfile
+
+@dataclass(frozen=True)
+class Personalization:
+    """Compiled view of everything that personalizes a draft."""
+    bans: tuple[str, ...]
+    replacements: tuple[tuple[str, str], ...]
+    prompt: str          # fragment for DRAFT_PROMPT's {personalization}
+    version: int         # style_rules.json version it was built from
+    matcher: RuleMatcher  # every ban/replacement, enforced on draft output
+
+_cache: tuple[tuple, Personalization] | None = None
+_matcher_cache: tuple[tuple, RuleMatcher] | None = None
+_lock = threading.Lock()
+
+def _rules_stamp() -> tuple:
+    try:
+        st = style_rules.RULES_PATH.stat()
+        return (str(style_rules.RULES_PATH), st.st_mtime_ns, st.st_size, style_rules._local_version)
+    except FileNotFoundError:
+        return (str(style_rules.RULES_PATH), None, None, style_rules._local_version)
+
+def _top_rules(rules: dict, hits: Counter, k: int) -> dict:
+    # learned rules ranked by how often drafts hit them, then by how often edits taught them.
+    # Every ban is kept (nothing enforces a ban after drafting); only replacements, which
+    # the matcher applies to the output anyway, are capped at k.
+    ban_counts = rules.get("ban_counts", {})
+    bans = sorted(rules.get("bans", []), key=lambda b: (hits[f"ban:{b}"], ban_counts.get(b, 1)), reverse=True)
+    repl = sorted(rules.get("replacements", []), key=lambda r: (hits[f"repl:{r['from']}"], r.get("count", 1)),
+                  reverse=True)[:k]
+    return {"bans": bans, "replacements": repl}
+
+def _compile(rules: dict, profile: UserProfile, feedback: FeedbackStore,
+             matcher: RuleMatcher, hits: Counter) -> Personalization:
+    bans = list(dict.fromkeys([*rules.get("bans", []), *profile.taboo_phrases]))
+    repl = list(dict.fromkeys([*((r["from"], r["to"]) for r in rules.get("replacements", [])),
+                               *((r.pattern, r.replacement) for r in feedback.rules)]))
+    # explicit profile/feedback settings and all bans reach the prompt; learned replacements are capped
+    top = _top_rules(rules, hits, config.STYLE_RULES_PROMPT_K)
+    shown = {
+        "bans": list(dict.fromkeys([*top["bans"], *profile.taboo_phrases])),
+        "replacements": list({(r["from"], r["to"]): {"from": r["from"], "to": r["to"]} for r in
+                              [*top["replacements"], *({"from": r.pattern, "to": r.replacement}
+                                                       for r in feedback.rules)]}.values()),
+    }
+    prompt = style_rules.apply_rules_to_prompt(shown)
+    hidden = len(repl) - len(shown["replacements"])
+    if hidden > 0:
+        prompt += f"\n(+{hidden} more substitutions applied automatically after drafting)"
+    return Personalization(
+        bans=tuple(bans),
+        replacements=tuple(repl),
+        prompt=prompt,
+        version=int(rules.get("version", 0)),
+        matcher=matcher,
+    )
+
+def get_personalization(profile: UserProfile | None = None,
+                        feedback: FeedbackStore | None = None) -> Personalization:
+    """Return the compiled personalization, rebuilding only when its inputs change.
+
+    The rules file is re-read only when its mtime/size or the in-process save
+    counter moves, so the per-draft cost is one `stat()` however large it grows.
+    """
+    global _cache, _matcher_cache
+    profile = profile or UserProfile()
+    feedback = feedback or FeedbackStore()
+    inputs = (_rules_stamp(), tuple(profile.taboo_phrases),
+              tuple((r.pattern, r.replacement) for r in feedback.rules))
+    key = (inputs, hits_stamp())  # hit counts only re-rank the prompt
+    cached = _cache
+    if cached and cached[0] == key:
+        return cached[1]
+    with _lock:
+        if _cache and _cache[0] == key:
+            return _cache[1]
+        rules = style_rules.load_rules()
+        if _matcher_cache is None or _matcher_cache[0] != inputs:
+            bans = [*rules.get("bans", []), *profile.taboo_phrases]
+            repl = [*((r["from"], r["to"]) for r in rules.get("replacements", [])),
+                    *((r.pattern, r.replacement) for r in feedback.rules)]
+            _matcher_cache = (inputs, RuleMatcher(bans, repl))
+        compiled = _compile(rules, profile, feedback, _matcher_cache[1], load_hits())
+        _cache = (key, compiled)
+        return compiled
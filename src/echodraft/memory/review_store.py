@@ -1,31 +1,126 @@
-import json, os, time, uuid
+import json, os, sqlite3, threading, time, uuid
 from pathlib import Path
-ROOT = Path.home()/".echodraft"/"review_queue"
-ROOT.mkdir(parents=True, exist_ok=True)
+from .. import config
+
+DB_PATH = config.DATA_DIR/"review_queue.sqlite"
+ROOT = config.DATA_DIR/"review_queue"  # legacy layout: one JSON file per review
+
+SORT_COLUMNS = {"created": "created", "confidence": "confidence", "label": "triage_label", "id": "id"}
+
+_db: sqlite3.Connection | None = None
+_db_path: Path | None = None
+_lock = threading.RLock()
+
+def _conn() -> sqlite3.Connection:
+    global _db, _db_path
+    if _db is None or _db_path != DB_PATH:
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not DB_PATH.exists()
+        db = sqlite3.connect(DB_PATH, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""CREATE TABLE IF NOT EXISTS reviews (
+            id TEXT PRIMARY KEY, created REAL, triage_label TEXT, confidence REAL,
+            title TEXT, surface TEXT, payload TEXT)""")
+        db.execute("CREATE INDEX IF NOT EXISTS reviews_label ON reviews(triage_label, created)")
+        db.execute("CREATE INDEX IF NOT EXISTS reviews_confidence ON reviews(confidence)")
+        db.execute("CREATE INDEX IF NOT EXISTS reviews_created ON reviews(created)")
+        db.commit()
+        _db, _db_path = db, DB_PATH
+        if fresh and ROOT.is_dir():
+            migrate_json_dir(ROOT)  # first run after upgrading: pick up the old queue
+    return _db
+
+def _row(rid: str, payload: dict, created: float) -> tuple:
+    return (rid, created, (payload.get("triage_label") or "").upper(),
+            float(payload.get("triage_confidence") or 0.0), payload.get("title") or "",
+            payload.get("surface") or "", json.dumps(payload))
 
 def enqueue_review(payload: dict) -> str:
     rid = payload.get("id") or f"rvw_{int(time.time())}_{uuid.uuid4().hex[:6]}"
     payload["id"] = rid
-    path = ROOT/f"{rid}.json"
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    with _lock:
+        db = _conn()
+        db.execute("INSERT OR REPLACE INTO reviews VALUES (?,?,?,?,?,?,?)", _row(rid, payload, time.time()))
+        db.commit()
     return rid
 
+def _where(label: str | None, min_confidence: float | None, max_confidence: float | None) -> tuple[str, list]:
+    clauses, args = [], []
+    if label:
+        clauses.append("triage_label = ?"); args.append(label.upper())
+    if min_confidence is not None:
+        clauses.append("confidence >= ?"); args.append(min_confidence)
+    if max_confidence is not None:
+        clauses.append("confidence <= ?"); args.append(max_confidence)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+def list_review_summaries(label: str | None = None, min_confidence: float | None = None,
+                          max_confidence: float | None = None, sort: str = "created",
+                          descending: bool = False, limit: int | None = 50, offset: int = 0) -> list[dict]:
+    """One page of review summaries (id/created/label/confidence/title/surface); payloads are not read."""
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"sort must be one of {sorted(SORT_COLUMNS)}")
+    where, args = _where(label, min_confidence, max_confidence)
+    order = f"{SORT_COLUMNS[sort]} {'DESC' if descending else 'ASC'}, id"
+    sql = f"SELECT id, created, triage_label, confidence, title, surface FROM reviews{where} ORDER BY {order}"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"; args += [limit, offset]
+    with _lock:
+        rows = _conn().execute(sql, args).fetchall()
+    keys = ("id", "created", "triage_label", "confidence", "title", "surface")
+    return [dict(zip(keys, r)) for r in rows]
+
+def count_reviews(label: str | None = None, min_confidence: float | None = None,
+                  max_confidence: float | None = None) -> int:
+    where, args = _where(label, min_confidence, max_confidence)
+    with _lock:
+        return _conn().execute(f"SELECT COUNT(*) FROM reviews{where}", args).fetchone()[0]
+
 def list_reviews():
-    items = []
-    for p in sorted(ROOT.glob("*.json")):
-        try:
-            items.append((p.stem, json.loads(p.read_text(encoding="utf-8"))))
-        except Exception:
-            pass
-    return items
+    """All queued reviews as (id, payload) pairs, ordered by id."""
+    with _lock:
+        rows = _conn().execute("SELECT id, payload FROM reviews ORDER BY id").fetchall()
+    return [(rid, json.loads(payload)) for rid, payload in rows]
 
 def load_review(rid: str) -> dict|None:
-    p = ROOT/f"{rid}.json"
-    return json.loads(p.read_text(encoding="utf-8")) if p.exists() else None
+    with _lock:
+        row = _conn().execute("SELECT payload FROM reviews WHERE id=?", (rid,)).fetchone()
+    return json.loads(row[0]) if row else None
 
 def delete_review(rid: str) -> bool:
-    p = ROOT/f"{rid}.json"
-    if p.exists():
-        p.unlink()
-        return True
-    return False
+    with _lock:
+        db = _conn()
+        cur = db.execute("DELETE FROM reviews WHERE id=?", (rid,))
+        db.commit()
+    return cur.rowcount > 0
+
+def _created_from(rid: str, path: Path) -> float:
+    # legacy ids look like rvw_<unix ts>_<hex>
+    parts = rid.split("_")
+    if len(parts) >= 3 and parts[1].isdigit():
+        return float(parts[1])
+    return path.stat().st_mtime
+
+def migrate_json_dir(src: Path | str | None = None, remove: bool = False) -> int:
+    """Import legacy `<id>.json` review files into the database; returns how many were added.
+
+    Safe to re-run: reviews that already exist are left untouched.
+    """
+    src = Path(src or ROOT)
+    added = 0
+    with _lock:
+        db = _conn()
+        for p in sorted(src.glob("*.json")):
+            try:
+                payload = json.loads(p.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            rid = payload.get("id") or p.stem
+            payload["id"] = rid
+            cur = db.execute("INSERT OR IGNORE INTO reviews VALUES (?,?,?,?,?,?,?)",
+                             _row(rid, payload, _created_from(rid, p)))
+            added += cur.rowcount
+            if remove:
+                os.remove(p)
+        db.commit()
+    return added
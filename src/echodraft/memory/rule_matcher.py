@@ -0,0 +1,96 @@
+# Local enforcement of style rules: every ban and replacement compiled into one
+# trie-shaped regex, so a draft is scanned once however many rules there are.
+import json, os, re, tempfile, threading
+from collections import Counter
+from pathlib import Path
+from .. import config
+
+HITS_PATH = config.DATA_DIR/"rule_hits.json"  # {"ban:<phrase>" | "repl:<from>": count}
+
+def _trie_pattern(phrases: list[str]) -> str:
+    # Shared prefixes are factored out ("we should|we will" → "we (?:should|will)"), so
+    # the engine tests one branch per character instead of every phrase at every offset.
+    trie: dict = {}
+    for p in phrases:
+        node = trie
+        for ch in p:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+def _match_case(src: str, to: str) -> str:
+    return to[:1].upper() + to[1:] if src[:1].isupper() and to[:1].islower() else to
+
+
+class RuleMatcher:
+    """Compiled bans + replacements. `apply` rewrites replacements and reports bans."""
+
+    def __init__(self, bans: list[str] | tuple = (), replacements: list[tuple[str, str]] | tuple = ()):
+        self._rules: dict[str, tuple[str, str | None]] = {}  # lowercased phrase → (key, to)
+        for b in bans:
+            if b.strip():
+                self._rules.setdefault(b.strip().lower(), (f"ban:{b.strip()}", None))
+        for frm, to in replacements:
+            if frm.strip():
+                self._rules[frm.strip().lower()] = (f"repl:{frm.strip()}", to)  # replacement wins
+        self.pattern = (re.compile(rf"(?<!\w)(?:{_trie_pattern(list(self._rules))})(?!\w)", re.IGNORECASE)
+                        if self._rules else None)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def find(self, text: str) -> Counter:
+        """Rule keys ("ban:…"/"repl:…") found in `text`, with how often each occurs."""
+        if self.pattern is None:
+            return Counter()
+        return Counter(self._rules[m.group(0).lower()][0] for m in self.pattern.finditer(text))
+
+    def apply(self, text: str) -> tuple[str, Counter]:
+        """Apply every replacement in one pass; returns (text, hits incl. ban violations)."""
+        hits: Counter = Counter()
+        if self.pattern is None:
+            return text, hits
+
+        def sub(m: re.Match) -> str:
+            key, to = self._rules[m.group(0).lower()]
+            hits[key] += 1
+            return m.group(0) if to is None else _match_case(m.group(0), to)
+
+        return self.pattern.sub(sub, text), hits
+
+
+_hits_lock = threading.Lock()
+
+def load_hits() -> Counter:
+    try:
+        return Counter(json.loads(HITS_PATH.read_text(encoding="utf-8")))
+    except (OSError, ValueError):
+        return Counter()
+
+def record_hits(hits: Counter) -> None:
+    """Add `hits` to the persisted counts used to rank rules for the prompt."""
+    if not hits:
+        return
+    with _hits_lock:
+        total = load_hits()
+        total.update(hits)
+        HITS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=HITS_PATH.parent, prefix=".rule_hits.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(dict(total), f)
+        os.replace(tmp, HITS_PATH)
+
+def hits_stamp() -> tuple:
+    try:
+        st = HITS_PATH.stat()
+        return (str(HITS_PATH), st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return (str(HITS_PATH), None, None)
@@ -1,12 +1,189 @@
-# Placeholder for style-transfer via embeddings/RAG.
-# API will be: add_samples(texts: list[str]), retrieve_hints(prompt: str) -> list[str]
+# Style-transfer retrieval: hashed character n-gram TF-IDF vectors + cosine top-k.
+# Works offline (no embedding model); vectors live in a float32 matrix that is
+# memory-mapped from disk and grown by appending rows.
+import json, os, re, tempfile, threading
+from pathlib import Path
+from typing import Iterable
+import numpy as np
+from .. import config
+
+INDEX_DIR = config.DATA_DIR/"style_index"
+DIM = 512
+NGRAMS = (3, 4, 5)
+_BLOCK = 65536  # rows scored per matmul block
+
+def embed(texts: Iterable[str], dim: int = DIM) -> np.ndarray:
+    """Log-scaled term frequencies of hashed character n-grams (one row per text)."""
+    texts = list(texts)
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        norm = " " + re.sub(r"\s+", " ", text.lower()).strip() + " "
+        b = np.frombuffer(norm.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        buckets = []
+        for n in NGRAMS:
+            if len(b) < n:
+                continue
+            h = np.full(len(b) - n + 1, n, dtype=np.uint64)
+            for j in range(n):  # polynomial rolling hash, wraps mod 2**64
+                h = h * np.uint64(1000003) + b[j:len(b) - n + 1 + j]
+            h ^= h >> np.uint64(29)
+            buckets.append(h % np.uint64(dim))
+        if buckets:
+            out[row] = np.log1p(np.bincount(np.concatenate(buckets).astype(np.int64), minlength=dim))
+    return out
+
+
 class StyleIndex:
-    def __init__(self):
-        self.samples = []
+    """Top-k cosine retrieval over the user's writing samples.
+
+    With `path`, vectors, document frequencies and samples are persisted there and
+    the vector matrix is memory-mapped; without it the index lives in memory.
+    `add_samples` appends rows and updates IDF incrementally (no rebuild).
+    """
+
+    def __init__(self, path: Path | str | None = None, dim: int = DIM):
+        self.path = Path(path) if path else None
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._df = np.zeros(dim, dtype=np.float64)
+        self._texts: list[str] = []   # in-memory mode only
+        self._offsets = np.zeros(0, dtype=np.uint64)
+        self._norms: np.ndarray | None = None
+        if self.path and (self.path/"meta.json").exists():
+            self._load()
+
+    # --- persistence ---
+    def _load(self):
+        meta = json.loads((self.path/"meta.json").read_text(encoding="utf-8"))
+        self.dim, count = meta["dim"], meta["count"]
+        self._df = np.load(self.path/"df.npy")
+        self._offsets = np.fromfile(self.path/"offsets.u64", dtype=np.uint64, count=count)
+        self._vectors = (np.memmap(self.path/"vectors.f32", dtype=np.float32, mode="r", shape=(count, self.dim))
+                         if count else np.zeros((0, self.dim), dtype=np.float32))
+        self._norms = None
+
+    def _write_meta(self):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, self._df)
+        os.replace(tmp, self.path/"df.npy")
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "count": len(self)}, f)
+        os.replace(tmp, self.path/"meta.json")  # meta last: readers never see a partial append
+
+    def _trim(self, name: str, nbytes: int):
+        # drop rows a crashed append wrote past meta["count"], so new rows line up again
+        p = self.path/name
+        if p.exists() and p.stat().st_size > nbytes:
+            with open(p, "r+b") as f:
+                f.truncate(nbytes)
+
+    def __len__(self) -> int:
+        return int(self._vectors.shape[0])
+
+    def add_samples(self, texts: Iterable[str]) -> int:
+        """Embed and append samples; returns how many were added."""
+        texts = [t for t in texts if t and t.strip()]
+        if not texts:
+            return 0
+        vecs = embed(texts, self.dim)
+        with self._lock:
+            self._df += (vecs > 0).sum(axis=0)
+            if self.path is None:
+                self._vectors = np.vstack([self._vectors, vecs])
+                self._texts.extend(texts)
+            else:
+                self.path.mkdir(parents=True, exist_ok=True)
+                samples = self.path/"samples.jsonl"
+                self._trim("offsets.u64", len(self) * 8)
+                self._trim("vectors.f32", len(self) * self.dim * 4)
+                offsets = []
+                with open(samples, "ab") as f:  # append mode: tell() starts at the end of the file
+                    for t in texts:
+                        offsets.append(f.tell())
+                        f.write((json.dumps(t) + "\n").encode("utf-8"))
+                with open(self.path/"offsets.u64", "ab") as f:
+                    np.asarray(offsets, dtype=np.uint64).tofile(f)
+                with open(self.path/"vectors.f32", "ab") as f:
+                    vecs.tofile(f)
+                count = len(self) + len(texts)
+                self._vectors = np.memmap(self.path/"vectors.f32", dtype=np.float32, mode="r",
+                                          shape=(count, self.dim))
+                self._offsets = np.concatenate([self._offsets, np.asarray(offsets, dtype=np.uint64)])
+                self._write_meta()
+            self._norms = None  # IDF moved; row norms are recomputed lazily
+        return len(texts)
+
+    def sample(self, i: int) -> str:
+        if self.path is None:
+            return self._texts[i]
+        with open(self.path/"samples.jsonl", "rb") as f:
+            f.seek(int(self._offsets[i]))
+            return json.loads(f.readline())
+
+    # --- retrieval ---
+    def _idf(self) -> np.ndarray:
+        return (np.log((1 + len(self)) / (1 + self._df)) + 1).astype(np.float32)
+
+    def _row_norms(self, idf: np.ndarray) -> np.ndarray:
+        if self._norms is None or len(self._norms) != len(self):
+            w = idf * idf
+            norms = np.empty(len(self), dtype=np.float32)
+            for s in range(0, len(self), _BLOCK):
+                block = np.asarray(self._vectors[s:s + _BLOCK])
+                norms[s:s + _BLOCK] = np.sqrt((block * block) @ w)
+            self._norms = np.maximum(norms, 1e-12)
+        return self._norms
+
+    def query(self, prompts: list[str], k: int = 3) -> list[list[tuple[int, float]]]:
+        """Top-k (row, cosine) pairs for each prompt, scored as one batch."""
+        with self._lock:
+            n = len(self)
+            if not n or not prompts:
+                return [[] for _ in prompts]
+            idf = self._idf()
+            q = embed(prompts, self.dim) * idf
+            q /= np.maximum(np.linalg.norm(q, axis=1, keepdims=True), 1e-12)
+            w = (q * idf).T                      # fold the row-side IDF into the query
+            norms = self._row_norms(idf)
+            k = min(k, n)
+            best_s = np.full((len(prompts), 0), -np.inf, dtype=np.float32)
+            best_i = np.zeros((len(prompts), 0), dtype=np.int64)
+            for s in range(0, n, _BLOCK):
+                scores = (np.asarray(self._vectors[s:s + _BLOCK]) @ w).T / norms[s:s + _BLOCK]
+                kk = min(k, scores.shape[1])
+                top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+                best_s = np.hstack([best_s, np.take_along_axis(scores, top, axis=1)])
+                best_i = np.hstack([best_i, top + s])
+                if best_s.shape[1] > k:
+                    keep = np.argpartition(-best_s, k - 1, axis=1)[:, :k]
+                    best_s = np.take_along_axis(best_s, keep, axis=1)
+                    best_i = np.take_along_axis(best_i, keep, axis=1)
+            order = np.argsort(-best_s, axis=1)
+            best_s = np.take_along_axis(best_s, order, axis=1)
+            best_i = np.take_along_axis(best_i, order, axis=1)
+            return [[(int(i), float(sc)) for i, sc in zip(ri, rs)] for ri, rs in zip(best_i, best_s)]
+
+    def retrieve_hints(self, prompt: str, k: int = 3, max_chars: int = 240) -> list[str]:
+        """The k samples closest in style/wording to `prompt`, trimmed to `max_chars`."""
+        return [self.sample(i)[:max_chars] for i, score in self.query([prompt], k)[0] if score > 0]
+
 
-    def add_samples(self, texts):
-        self.samples.extend(texts)
+_index: StyleIndex | None = None
+_index_stamp = None
+_index_lock = threading.Lock()
 
-    def retrieve_hints(self, prompt: str):
-        # Return simple n-gram hints for now
-        return [s[:120] for s in self.samples[:3]]
+def get_style_index() -> StyleIndex:
+    """Process-wide persisted index; reopened when another process appends to it."""
+    global _index, _index_stamp
+    meta = INDEX_DIR/"meta.json"
+    try:
+        stamp = (str(INDEX_DIR), meta.stat().st_mtime_ns)
+    except FileNotFoundError:
+        stamp = (str(INDEX_DIR), None)
+    with _index_lock:
+        if _index is None or stamp != _index_stamp:
+            _index, _index_stamp = StyleIndex(INDEX_DIR), stamp
+        return _index
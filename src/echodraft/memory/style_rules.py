@@ -1,18 +1,28 @@
-import json, re
+import json, os, re, tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from collections import Counter
+from .. import config
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked updates
+    fcntl = None
 
-RULES_PATH = Path.home()/".echodraft"/"style_rules.json"
-RULES_PATH.parent.mkdir(parents=True, exist_ok=True)
+RULES_PATH = config.DATA_DIR/"style_rules.json"
 
 DEFAULT_RULES = {
     "bans": [  # phrases to remove
     ],
     "replacements": [  # list of {"from": "...", "to": "..."}
     ],
-    "tone": {}  # reserved for future knobs (e.g., sentence length, voice)
+    "tone": {},  # reserved for future knobs (e.g., sentence length, voice)
+    "version": 0,  # bumped on every save; lets readers cache compiled rules
 }
 
+# Bumped by save_rules() in this process, so caches notice writes that land
+# within the filesystem's mtime resolution.
+_local_version = 0
+
 def load_rules() -> dict:
     if RULES_PATH.exists():
         try:
@@ -22,7 +32,33 @@ def load_rules() -> dict:
     return DEFAULT_RULES.copy()
 
 def save_rules(rules: dict):
-    RULES_PATH.write_text(json.dumps(rules, indent=2), encoding="utf-8")
+    """Atomically replace the rules file (write a temp file, then rename over it)."""
+    global _local_version
+    rules["version"] = int(rules.get("version", 0)) + 1
+    RULES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=RULES_PATH.parent, prefix=".style_rules.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(rules, indent=2))
+        os.replace(tmp, RULES_PATH)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    _local_version += 1
+
+@contextmanager
+def rules_lock():
+    """Exclusive lock for read-modify-write updates of the rules file."""
+    if fcntl is None:
+        yield
+        return
+    RULES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(RULES_PATH.with_suffix(".lock"), "w") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
 
 def apply_rules_to_prompt(rules: dict) -> str:
     """Generate a compact instruction string usable in the draft prompt."""
@@ -41,27 +77,55 @@ def update_rules_from_diffs(diffs: list[str]):
     - Deleted line that starts with a cliché → ban
     - Replacement patterns “We should”→“Let’s”, “In conclusion,” removed, etc.
     """
-    rules = load_rules()
-    bans = set(rules.get("bans", []))
-    repl = {(r["from"], r["to"]) for r in rules.get("replacements", [])}
+    bans, repl = mine_rules(diffs)
+    merge_mined_counts(Counter(bans), Counter(repl))
 
-    # heuristic cues
-    DELETE_CANDIDATES = ["in conclusion", "in summary", "we should", "i think", "it seems that"]
+# heuristic cues
+DELETE_CANDIDATES = ["in conclusion", "in summary", "we should", "i think", "it seems that"]
+
+def mine_rules(diffs: list[str]) -> tuple[list[str], list[tuple[str, str]]]:
+    """Bans and (from, to) replacements suggested by one set of diff ops (no I/O)."""
+    bans, repl = [], []
     for d in diffs:
         # diff lines like: "- In conclusion, ..." or "~ We should -> Let's"
         if d.startswith("- "):
             txt = d[2:].strip().lower()
             for cue in DELETE_CANDIDATES:
                 if txt.startswith(cue):
-                    bans.add(d[2:].strip())
+                    bans.append(d[2:].strip())
         elif d.startswith("~ "):
             # format "~ FROM ==> TO"
             body = d[2:]
             if "==>" in body:
                 frm, to = [x.strip() for x in body.split("==>", 1)]
-                if frm and to and (frm, to) not in repl:
-                    repl.add((frm, to))
+                if frm and to:
+                    repl.append((frm, to))
+    return bans, repl
+
+def merge_mined_counts(ban_counts: Counter, repl_counts: Counter, min_count: int = 1,
+                       top_only: bool = False) -> dict:
+    """Fold corpus-mined counts into the rules file in a single locked write.
 
-    rules["bans"] = sorted(bans)
-    rules["replacements"] = [{"from": f, "to": t} for (f, t) in sorted(repl)]
-    save_rules(rules)
+    Counts accumulate in `ban_counts` / each replacement's `count`, so repeated runs and
+    later single-pair learning keep a frequency ranking. `min_count` only gates newly
+    mined rules; rules already in the file are always kept. With `top_only`, a new
+    rewrite of a `from` phrase is added only if it is that phrase's most frequent one.
+    """
+    with rules_lock():
+        rules = load_rules()
+        counts = Counter(rules.get("ban_counts", {}))
+        counts.update(ban_counts)
+        bans = set(rules.get("bans", [])) | {b for b, n in counts.items() if n >= min_count}
+        existing = {(r["from"], r["to"]) for r in rules.get("replacements", [])}
+        merged = Counter({(r["from"], r["to"]): r.get("count", 1) for r in rules.get("replacements", [])})
+        merged.update(repl_counts)
+        top: dict[str, int] = {}
+        for (frm, _), n in merged.items():
+            top[frm] = max(top.get(frm, 0), n)
+        keep = {pair: n for pair, n in merged.items()
+                if pair in existing or (n >= min_count and (not top_only or n == top[pair[0]]))}
+        rules["bans"] = sorted(bans)
+        rules["ban_counts"] = {b: counts[b] for b in sorted(bans) if counts.get(b)}
+        rules["replacements"] = [{"from": f, "to": t, "count": n} for (f, t), n in sorted(keep.items())]
+        save_rules(rules)
+    return rules
@@ -0,0 +1,107 @@
+# Local latency/token telemetry: one compact JSON line per graph node run or LLM call,
+# appended to DATA_DIR/metrics/events.jsonl and rotated by size. Stdlib only, so
+# `echodraft metrics` stays fast; the LangChain callbacks live in instrumentation.py.
+import json, os, threading, time
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterator
+from .. import config
+
+METRICS_DIR = config.DATA_DIR/"metrics"
+
+_enabled = config.METRICS_ENABLED
+_lock = threading.Lock()
+_file = None
+_file_path: Path | None = None
+
+def set_enabled(on: bool) -> None:
+    global _enabled
+    _enabled = on
+
+def _events_path() -> Path:
+    return METRICS_DIR/"events.jsonl"
+
+def _rotate() -> None:
+    # events.jsonl → events.1.jsonl → … → events.<keep>.jsonl (dropped)
+    keep = max(1, config.METRICS_KEEP_FILES)
+    for i in range(keep, 0, -1):
+        src = METRICS_DIR/(f"events.{i - 1}.jsonl" if i > 1 else "events.jsonl")
+        if src.exists():
+            os.replace(src, METRICS_DIR/f"events.{i}.jsonl")
+
+def record(kind: str, name: str, ms: float, **fields) -> None:
+    """Append one event; `None` fields are dropped to keep lines short."""
+    global _file, _file_path
+    if not _enabled:
+        return
+    event = {"ts": round(time.time(), 3), "kind": kind, "name": name, "ms": round(ms, 2)}
+    event.update((k, v) for k, v in fields.items() if v is not None)
+    line = json.dumps(event, separators=(",", ":")) + "\n"
+    with _lock:
+        try:
+            if _file is None or _file_path != _events_path():
+                METRICS_DIR.mkdir(parents=True, exist_ok=True)
+                _file, _file_path = open(_events_path(), "a", encoding="utf-8"), _events_path()
+            _file.write(line)
+            _file.flush()
+            if _file.tell() > config.METRICS_MAX_BYTES:
+                _file.close()
+                _file = None
+                _rotate()
+        except OSError:
+            _file = None  # telemetry must never break a run
+
+def iter_events(since: float | None = None) -> Iterator[dict]:
+    """Events from all rotated files, oldest first, optionally only those with ts >= `since`."""
+    files = sorted(METRICS_DIR.glob("events.*.jsonl"), key=lambda p: -int(p.name.split(".")[1]))
+    for path in [*files, _events_path()]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ev = json.loads(line)
+                    except ValueError:
+                        continue  # torn write from a crashed process
+                    if since is None or ev.get("ts", 0) >= since:
+                        yield ev
+        except FileNotFoundError:
+            continue
+
+def percentile(sorted_vals: list[float], p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    return sorted_vals[min(len(sorted_vals) - 1, int(round(p / 100 * (len(sorted_vals) - 1))))]
+
+def summarize(window_s: float | None = 3600) -> dict:
+    """Per (kind, name) stats over the last `window_s` seconds (all history if None)."""
+    now = time.time()
+    groups: dict[tuple, list[dict]] = defaultdict(list)
+    for ev in iter_events(now - window_s if window_s else None):
+        groups[(ev["kind"], ev["name"])].append(ev)
+    rows = []
+    for (kind, name), evs in sorted(groups.items()):
+        ms = sorted(e["ms"] for e in evs)
+        span_min = max((now - evs[0]["ts"]) / 60, 1 / 60)
+        labels: dict[str, int] = defaultdict(int)
+        for e in evs:
+            if e.get("label"):
+                labels[e["label"]] += 1
+        rows.append({
+            "kind": kind, "name": name, "calls": len(evs),
+            "p50_ms": round(percentile(ms, 50), 1), "p95_ms": round(percentile(ms, 95), 1),
+            "calls_per_min": round(len(evs) / span_min, 2),
+            "in_tokens": sum(e.get("in_tok", 0) for e in evs),
+            "out_tokens": sum(e.get("out_tok", 0) for e in evs),
+            "cache_hits": sum(1 for e in evs if e.get("cached")),
+            "errors": sum(1 for e in evs if e.get("ok") is False),
+            "labels": dict(labels),
+        })
+    return {"window_s": window_s, "rows": rows}
+
+
+def role_of(llm) -> str:
+    """The `get_llm` role a client was created for (read off its telemetry callback)."""
+    for h in getattr(llm, "callbacks", None) or []:
+        if getattr(h, "role", None):
+            return h.role
+    return "llm"
@@ -0,0 +1,163 @@
+# Near-duplicate index for triage: a MinHash signature of title + content per decided
+# item, so re-sent threads, recurring newsletters and lightly edited pages reuse the
+# earlier LLM decision instead of paying for another triage call.
+import hashlib, json, re, sqlite3, threading, time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from .. import config
+
+NUM_PERM = 64
+BANDS, ROWS = 16, 4  # LSH: items with Jaccard 0.8 share a band with p≈0.9998, at 0.5 p≈0.64
+MIN_TOKENS = 8  # shorter items carry too little text to call two of them "the same"
+_TOKEN = re.compile(r"\w+")
+_QUOTE = re.compile(r"^[ \t>]+", re.MULTILINE)  # "> > quoted reply" → "quoted reply"
+_rng = np.random.default_rng(20240817)  # fixed: signatures are persisted
+_SEEDS = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_MULTS = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+
+@lru_cache(maxsize=256)  # pre-triage looks an item up, triage then stores it
+def minhash(title: str, content: str) -> bytes | None:
+    """MinHash signature over word 3-shingles of title + content, or None for very short items."""
+    tokens = _TOKEN.findall(_QUOTE.sub("", f"{title}\n{content}").lower())
+    if len(tokens) < MIN_TOKENS:
+        return None
+    shingles = {" ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2)}
+    h = np.fromiter((int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+                     for s in shingles), dtype=np.uint64, count=len(shingles))
+    # one multiply-xorshift hash per permutation (uint64 wraps), min over shingles
+    mixed = ((h[:, None] ^ _SEEDS) * _MULTS) >> np.uint64(32)
+    return mixed.min(axis=0).astype(np.uint32).tobytes()
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of the two items' shingle sets."""
+    return float(np.mean(np.frombuffer(a, np.uint32) == np.frombuffer(b, np.uint32)))
+
+def _bands(sig: bytes) -> list[int]:
+    width = ROWS * 4
+    return [int.from_bytes(hashlib.blake2b(sig[i * width:(i + 1) * width], digest_size=8).digest(),
+                           "big", signed=True) for i in range(BANDS)]
+
+
+def fingerprint(model: str, temperature, *prompts: str) -> str:
+    """Identify the triage setup a decision came from; a new model or prompt starts afresh."""
+    raw = json.dumps([model, temperature, [hashlib.sha256(p.encode("utf-8")).hexdigest() for p in prompts]])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class TriageIndex:
+    """SQLite table of (surface, fingerprint, signature, decision), LSH-banded for candidate lookup.
+
+    `lookup` returns the decision for the same surface and `fingerprint` (model + triage
+    prompts) with the highest estimated similarity ≥ `min_similarity` among those younger
+    than `ttl_seconds`. Safe to share across threads.
+    """
+
+    def __init__(self, path: Path | None = None, min_similarity: float = config.TRIAGE_DEDUP_SIMILARITY,
+                 ttl_seconds: float = config.TRIAGE_DEDUP_TTL_SECONDS):
+        self.path = Path(path or config.DATA_DIR/"triage_index.sqlite")
+        self.min_similarity = min_similarity
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._db: sqlite3.Connection | None = None
+        self._puts = 0
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            bands = ", ".join(f"b{i} INTEGER" for i in range(BANDS))
+            db.execute(f"""CREATE TABLE IF NOT EXISTS items (
+                surface TEXT, sig BLOB, label TEXT, reason TEXT, confidence REAL,
+                created REAL, {bands})""")
+            if "fingerprint" not in {r[1] for r in db.execute("PRAGMA table_info(items)")}:
+                # rows written before the column existed never match again
+                db.execute("ALTER TABLE items ADD COLUMN fingerprint TEXT")
+            for i in range(BANDS):
+                db.execute(f"CREATE INDEX IF NOT EXISTS items_b{i} ON items(b{i})")
+            db.execute("CREATE INDEX IF NOT EXISTS items_created ON items(created)")
+            self._db = db
+        return self._db
+
+    def lookup(self, surface: str, sig: bytes, fingerprint: str = "") -> dict | None:
+        """{"label", "reason", "confidence", "similarity", "age_s"} of the closest recent match."""
+        now = time.time()
+        where = " OR ".join(f"b{i}=?" for i in range(BANDS))
+        with self._lock:
+            rows = self._conn().execute(
+                f"""SELECT sig, label, reason, confidence, created FROM items
+                    WHERE surface=? AND fingerprint=? AND created>=? AND ({where})""",
+                (surface, fingerprint, now - self.ttl_seconds if self.ttl_seconds else 0,
+                 *_bands(sig))).fetchall()
+            best = None
+            for other, label, reason, conf, created in rows:
+                sim = similarity(sig, other)
+                if sim >= self.min_similarity and (best is None or (sim, created) > (best[0], best[4])):
+                    best = (sim, label, reason, conf, created)
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        sim, label, reason, conf, created = best
+        return {"label": label, "reason": reason, "confidence": conf, "similarity": sim, "age_s": now - created}
+
+    def add(self, surface: str, sig: bytes, label: str, reason: str, confidence: float,
+            fingerprint: str = "") -> None:
+        now = time.time()
+        cols = ", ".join(["surface", "sig", "label", "reason", "confidence", "created",
+                          *(f"b{i}" for i in range(BANDS)), "fingerprint"])
+        with self._lock:
+            db = self._conn()
+            db.execute(f"INSERT INTO items ({cols}) VALUES ({','.join('?' * (BANDS + 7))})",
+                       (surface, sig, label, reason, confidence, now, *_bands(sig), fingerprint))
+            self._puts += 1
+            if self.ttl_seconds and self._puts % 256 == 1:  # purge expired rows now and then
+                db.execute("DELETE FROM items WHERE created<?", (now - self.ttl_seconds,))
+            db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._conn()
+            db.execute("DELETE FROM items")
+            db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn().execute("SELECT COUNT(*) FROM items").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+
+_index: TriageIndex | None = None
+_index_lock = threading.Lock()
+_enabled = True
+
+def get_index() -> TriageIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = TriageIndex()
+    return _index
+
+def set_enabled(enabled: bool) -> None:
+    """Switch lookups and adds on or off for this process (`--no-cache`, evals)."""
+    global _enabled
+    _enabled = enabled
+
+def is_enabled() -> bool:
+    return _enabled and config.TRIAGE_DEDUP_ENABLED
+
+@contextmanager
+def override(enabled: bool):
+    """Turn the index off (or leave it as it is) for the duration of the block."""
+    global _enabled
+    prev = _enabled
+    _enabled = prev and enabled
+    try:
+        yield
+    finally:
+        _enabled = prev
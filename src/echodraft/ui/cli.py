@@ -1,48 +1,173 @@
+import logging
+import os
 import typer
 from typing import Optional
-from ..agents.drafter import draft_text, multi_draft_texts
-from ..agents.reviser import revise_text
-from ..evaluation.metrics import summarize_metrics
+from .. import config
 from ..evaluation.langsmith_hooks import trace_run
+from . import daemon_client
 import sys
 
+# Commands import agents/graph/LangChain lazily so lightweight commands
+# (review-queue, metrics, ...) start without loading the LLM stack.
+
 
 app = typer.Typer(help="EchoDraft CLI — draft, revise, and track improvements")
 
+if config.LOG_LEVEL:
+    logging.basicConfig(level=config.LOG_LEVEL.upper(), stream=sys.stderr,
+                        format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+def _use_llm_cache(no_cache: bool, clear_cache: bool):
+    """Apply the --no-cache/--clear-cache flags for deterministic LLM calls and the
+    near-duplicate triage index."""
+    from ..memory import llm_cache, triage_index
+    if clear_cache:
+        llm_cache.get_cache().clear()
+        triage_index.get_index().clear()
+    llm_cache.set_enabled(not no_cache)
+    triage_index.set_enabled(not no_cache)
+    return llm_cache
+
+def _forward(op: str, payload: dict) -> tuple[bool, object]:
+    """daemon_client.forward, reporting a daemon that failed mid-request instead of re-running it."""
+    try:
+        return daemon_client.forward(op, payload)
+    except daemon_client.DaemonError as e:
+        typer.echo(f"Error: echodraft daemon failed to run {op}: {e}", err=True)
+        typer.echo("Retry, or set ECHODRAFT_DAEMON=0 to run without the daemon.", err=True)
+        raise typer.Exit(code=1)
+
+def _echo_token(text: str):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+def _echo_timing(timing: dict):
+    ttft = f"{timing['ttft_s']:.2f}s" if timing.get("ttft_s") is not None else "n/a"
+    typer.echo(f"[stream] ttft={ttft} total={timing['total_s']:.2f}s", err=True)
+
+def _echo_cache_stats(llm_cache):
+    if llm_cache.is_enabled():
+        st = llm_cache.get_cache().stats()
+        typer.echo(f"[llm-cache] hits={st['hits']} misses={st['misses']} entries={st['entries']}", err=True)
+
 @app.command()
 def draft(topic: str = typer.Option(..., help="What to write about"),
           style: str = typer.Option("professional", help="Style preset (professional/persuasive/story)"),
           words: int = typer.Option(200, help="Target word count"),
-          explain: bool = typer.Option(False, help="Show reasoning for certain choices")):
+          explain: bool = typer.Option(False, help="Show reasoning for certain choices"),
+          stream: bool = typer.Option(False, "--stream", help="Print tokens as they arrive"),
+          speculate: Optional[bool] = typer.Option(None, "--speculate/--no-speculate",
+                                                help="Start likely drafts while triage runs (default: ECHODRAFT_SPECULATE)")):
     """Generate a first draft."""
     with trace_run("draft", tags=["cli","phase3"], metadata={"topic": topic, "style": style, "words": words, "explain": explain}):
-        result = draft_text(topic=topic, style=style, target_words=words, explain=explain)
-        typer.echo(result)
+        if not stream:
+            args = {"topic": topic, "style": style, "target_words": words, "explain": explain}
+            if speculate is not None:
+                args["speculate"] = speculate
+            handled, result = _forward("draft", args)
+            if not handled:
+                from ..agents.drafter import draft_text
+                result = draft_text(**args)
+            typer.echo(result)
+            return
+        from ..agents.drafter import stream_draft_text
+        streamed = []
+        result, timing = stream_draft_text(topic, lambda t: (streamed.append(t), _echo_token(t)),
+                                           style=style, target_words=words, explain=explain)
+        if not streamed:  # triage did not draft (or the model didn't stream)
+            typer.echo(result)
+        elif "\n\n[why] " in result:
+            typer.echo("\n\n[why] " + result.split("\n\n[why] ", 1)[1])
+        else:
+            typer.echo()
+        _echo_timing(timing)
 
 @app.command("multi-draft")
 def multi_draft(topic: str = typer.Option(..., help="What to write about"),
-                count: int = typer.Option(3, help="Number of variants")):
-    """Generate multiple draft variants."""
+                count: int = typer.Option(3, help="Number of variants"),
+                max_concurrency: int = typer.Option(3, help="Max variants drafted at the same time"),
+                stream: bool = typer.Option(False, "--stream", help="Stream variants one after another")):
+    """Generate multiple draft variants (triage once, draft variants in parallel)."""
+    from ..agents.drafter import multi_draft_texts, stream_multi_draft_texts
     with trace_run("multi-draft", tags=["cli","phase3"], metadata={"topic": topic, "count": count}):
-        variants = multi_draft_texts(topic=topic, count=count)
+        if stream:
+            shown = []
+
+            def on_variant(i: int):
+                sep = "\n\n" if shown else "\n"
+                typer.echo(f"{sep}=== Variant {i + 1} ===")
+                shown.append(i)
+
+            variants, timing = stream_multi_draft_texts(topic, _echo_token, on_variant,
+                                                        count=count, max_concurrency=max_concurrency)
+            typer.echo("\n" if shown else variants[0])  # no variants → triage message
+            _echo_timing(timing)
+            return
+        variants = multi_draft_texts(topic=topic, count=count, max_concurrency=max_concurrency)
         for i, v in enumerate(variants, 1):
             typer.echo(f"\n=== Variant {i} ===\n{v}\n")
     
 @app.command()
 def revise(file: str = typer.Argument(..., help="Path to a text file to revise"),
-           feedback: str = typer.Option(..., help="Short feedback, e.g., 'too formal, add example'")):
+           feedback: str = typer.Option(..., help="Short feedback, e.g., 'too formal, add example'"),
+           stream: bool = typer.Option(False, "--stream", help="Print tokens as they arrive"),
+           long: Optional[bool] = typer.Option(None, "--long/--no-long",
+                                               help="Revise Markdown sections in parallel (default: above ECHODRAFT_REVISE_LONG_WORDS words)"),
+           patch: bool = typer.Option(False, "--patch", help="With --long, print the line-level patch instead of the full text")):
     """Revise an existing draft using feedback."""
     with trace_run("revise", tags=["cli","phase3"], metadata={"file": file, "feedback": feedback[:120]}):
         with open(file, "r", encoding="utf-8") as f:
             original = f.read()
-        revised = revise_text(original, feedback)
+        if long is None:
+            from .. import config
+            long = not stream and len(original.split()) > config.REVISE_LONG_WORDS
+        if long:
+            handled, result = _forward("revise-long", {"draft": original, "feedback": feedback})
+            if not handled:
+                from ..agents.reviser import revise_long
+                result = revise_long(original, feedback)
+            typer.echo("\n".join(result["patch"]) if patch else result["text"])
+            typer.echo(f"[revise] {result['revised']}/{result['sections']} sections revised", err=True)
+            return
+        if stream:
+            from ..agents.reviser import stream_revise_text
+            _, timing = stream_revise_text(original, feedback, _echo_token)
+            typer.echo()
+            _echo_timing(timing)
+            return
+        handled, revised = _forward("revise", {"draft": original, "feedback": feedback})
+        if not handled:
+            from ..agents.reviser import revise_text
+            revised = revise_text(original, feedback)
         typer.echo(revised)
 
 @app.command()
-def metrics():
-    """Show improvement metrics (stub until LangSmith wired)."""
-    with trace_run("metrics", tags=["cli","phase3"]):
-        typer.echo(summarize_metrics())
+def metrics(
+    window: float = typer.Option(60, help="Look back this many minutes (0 = all history)"),
+    as_json: bool = typer.Option(False, "--json", help="Print the raw summary as JSON"),
+    profile: Optional[str] = typer.Option(None, help="cProfile one run of another command, e.g. \"triage --title X\""),
+    profile_out: Optional[str] = typer.Option(None, help="Also dump the profile here (for snakeviz/pstats)"),
+):
+    """Per-node latency (p50/p95), calls/min and token totals from local telemetry."""
+    if profile:
+        import cProfile, pstats, shlex
+        prof = cProfile.Profile()
+        try:
+            prof.runcall(app, args=shlex.split(profile), standalone_mode=False)
+        finally:
+            pstats.Stats(prof, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+            if profile_out:
+                prof.dump_stats(profile_out)
+                typer.echo(f"[profile] written to {profile_out}", err=True)
+        return
+    if as_json:
+        import json
+        from ..memory.telemetry import summarize
+        typer.echo(json.dumps(summarize(window * 60 if window else None), indent=2))
+        return
+    from ..evaluation.metrics import summarize_metrics
+    with trace_run("metrics", tags=["cli","phase3"], metadata={"window": window}):
+        typer.echo(summarize_metrics(window or None))
 
 @app.command()
 def triage(
@@ -50,36 +175,121 @@ def triage(
     title: str = typer.Option("", help="Title/subject"),
     content: str = typer.Option("", help="Raw content/body to classify"),
     stale_days: int = typer.Option(30, help="Age threshold in days"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response cache"),
+    clear_cache: bool = typer.Option(False, "--clear-cache", help="Empty the LLM response cache first"),
 ):
     """Run triage only and print the label, reason, confidence."""
-    from ..graph.builder import build_graph
     with trace_run("triage", tags=["cli","phase3"], metadata={"surface": surface, "title": title, "stale_days": stale_days}):
-        appg = build_graph()
-        out = appg.invoke({
-            "surface": surface,
-            "title": title,
-            "content": content,
-            "metadata": {},
-            "stale_days": stale_days,
-            # dummy draft fields to keep state happy
-            "topic": title or "Untitled",
-            "style": "professional",
-            "words": 200,
-            "explain": False,
-        })
-        label = (out.get("triage_label") or "").upper()
-        reason = out.get("triage_reason", "")
-        conf = out.get("triage_confidence", 0)
-        typer.echo(f"label={label}  confidence={conf:.2f}")
-        if reason:
-            typer.echo(f"reason: {reason}")
+        args = {"surface": surface, "title": title, "content": content, "stale_days": stale_days}
+        # cache flags act on this process, so they force a local run
+        handled, out = (False, None) if no_cache or clear_cache else _forward("triage", args)
+        if not handled:
+            from ..agents.triager import run_triage
+            _use_llm_cache(no_cache, clear_cache)
+            out = run_triage(**args)
+        typer.echo(f"label={out['label']}  confidence={out['confidence']:.2f}")
+        if out["reason"]:
+            typer.echo(f"reason: {out['reason']}")
+
+@app.command("triage-batch")
+def triage_batch(
+    input: str = typer.Argument("-", help="Item JSONL file ({surface,title,content,...} per line); '-' for stdin"),
+    out: Optional[str] = typer.Option(None, help="Write result JSONL here instead of stdout"),
+    workers: int = typer.Option(8, help="Items triaged concurrently (in-flight limit)"),
+    ordered: bool = typer.Option(False, "--ordered", help="Emit results in input order instead of as they finish"),
+    fast_path: bool = typer.Option(True, help="Let the pre-triage rules skip the LLM for obvious items"),
+    pack: int = typer.Option(1, help="Items per triage LLM call (>1 packs them into one prompt)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response cache"),
+):
+    """Triage a stream of items: JSONL in, one JSONL result (label/reason/confidence) per item out."""
+    from ..agents.triager import triage_batch as run_batch
+    llm_cache = _use_llm_cache(no_cache, False)
+    src = sys.stdin if input == "-" else open(input, "r", encoding="utf-8")
+    dst = open(out, "w", encoding="utf-8") if out else sys.stdout
+    try:
+        meta = {"input": input, "workers": workers, "ordered": ordered, "pack": pack}
+        with trace_run("triage-batch", tags=["cli","phase3"], metadata=meta):
+            stats = run_batch(src, dst, workers=workers, ordered=ordered, fast_path=fast_path, pack=pack)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    typer.echo(f"[triage-batch] items={stats['items']} errors={stats['errors']} rules={stats['rules']} "
+               f"reused={stats['reused']} elapsed={stats['elapsed_s']:.2f}s throughput={stats['items_per_s']:.1f} items/s", err=True)
+    _echo_cache_stats(llm_cache)
+
+@app.command()
+def ingest(
+    root: str = typer.Argument(..., help="Directory to ingest (e.g. a Notion export or a maildir)"),
+    surface: Optional[str] = typer.Option(None, help="Force a surface; default: email for mail files, else notion"),
+    batch_size: int = typer.Option(64, help="Documents triaged (and recorded) per batch"),
+    workers: int = typer.Option(8, help="Documents triaged concurrently"),
+    fast_path: bool = typer.Option(True, help="Let the pre-triage rules skip the LLM for obvious items"),
+    pack: int = typer.Option(1, help="Items per triage LLM call (>1 packs them into one prompt)"),
+    watch: bool = typer.Option(False, "--watch", help="Keep rescanning every --interval seconds"),
+    interval: float = typer.Option(30.0, help="Seconds between scans with --watch"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response cache"),
+):
+    """Triage new or changed documents under ROOT; unchanged files are never re-triaged.
+
+    Prints one JSON line per decision; scan stats go to stderr.
+    """
+    import json
+    from ..io import ingest as ingest_mod
+    _use_llm_cache(no_cache, False)
+
+    def on_result(rec: dict):
+        typer.echo(json.dumps(rec))
+
+    def on_scan(stats: dict):
+        typer.echo("[ingest] " + " ".join(f"{k}={v}" for k, v in stats.items()), err=True)
+
+    opts = {"surface": surface, "batch_size": batch_size, "workers": workers, "fast_path": fast_path,
+            "pack": pack, "on_result": on_result}
+    if not os.path.isdir(root):
+        raise typer.BadParameter(f"{root} is not a directory", param_hint="ROOT")
+    with trace_run("ingest", tags=["cli","phase3"], metadata={"root": root, "watch": watch}):
+        if watch:
+            try:
+                ingest_mod.watch(root, interval=interval, on_scan=on_scan, **opts)
+            except KeyboardInterrupt:
+                pass
+        else:
+            on_scan(ingest_mod.ingest(root, **opts))
 
 @app.command("eval-triage")
-def eval_triage(dataset: str = typer.Option("datasets/triage.jsonl", help="Path to triage dataset JSONL")):
-    """Evaluate triage accuracy/metrics on a labeled dataset."""
+def eval_triage(
+    dataset: str = typer.Option("datasets/triage.jsonl", help="Path to triage dataset JSONL"),
+    fast_path: bool = typer.Option(True, help="Let the pre-triage rules skip the LLM for obvious items"),
+    pack: int = typer.Option(1, help="Examples per triage LLM call (>1 packs them into one prompt)"),
+    workers: int = typer.Option(4, help="Triage calls run concurrently"),
+    sample: bool = typer.Option(False, "--sample/--exhaustive",
+                                help="Triage a stratified random sample until the confidence intervals are narrow enough"),
+    target_width: float = typer.Option(0.1, help="With --sample: stop once accuracy and macro-F1 95% intervals are this narrow"),
+    seed: int = typer.Option(0, help="With --sample: seed for the sample order and the bootstrap"),
+    resume: Optional[str] = typer.Option(None, help="Continue a run directory (or 'latest'), skipping finished examples"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response cache"),
+    clear_cache: bool = typer.Option(False, "--clear-cache", help="Empty the LLM response cache first"),
+):
+    """Evaluate triage accuracy/metrics on a labeled dataset (results stream to reports/triage/)."""
+    from ..evaluation.eval_runs import ResumeError
     from ..evaluation.run_eval import eval_triage_cli
-    with trace_run("eval-triage", tags=["cli","phase3"], metadata={"dataset": dataset}):
-        typer.echo(eval_triage_cli(dataset))
+    llm_cache = _use_llm_cache(no_cache, clear_cache)
+
+    def progress(est: dict):
+        acc, f1 = est["accuracy"], est["macro_f1"]
+        typer.echo(f"[eval] n={est['sampled']} accuracy={acc['value']} [{acc['lo']}, {acc['hi']}] "
+                   f"macro_f1={f1['value']} [{f1['lo']}, {f1['hi']}]", err=True)
+
+    with trace_run("eval-triage", tags=["cli","phase3"], metadata={"dataset": dataset, "fast_path": fast_path, "resume": resume, "pack": pack,
+                                                                     "sample": sample, "target_width": target_width}):
+        try:
+            typer.echo(eval_triage_cli(dataset, fast_path=fast_path, resume=resume, pack=pack, workers=workers,
+                                       sample=sample, target_width=target_width, seed=seed, on_progress=progress))
+        except ResumeError as e:
+            raise typer.BadParameter(str(e), param_hint="--resume")
+    _echo_cache_stats(llm_cache)
 
 @app.command("eval-drafts")
 def eval_drafts(
@@ -87,27 +297,89 @@ def eval_drafts(
     words: int = typer.Option(220, help="Target word count for generated drafts"),
     refine: bool = typer.Option(True, help="Auto-refine drafts that score below threshold"),
     min_score: int = typer.Option(4, help="Refine if any score < min_score"),
+    workers: int = typer.Option(4, help="Examples evaluated concurrently"),
+    rpm: float = typer.Option(500, help="LLM requests-per-minute budget across workers (0 = unlimited)"),
+    resume: Optional[str] = typer.Option(None, help="Continue a run directory (or 'latest'), skipping finished examples"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Bypass the LLM response cache"),
+    clear_cache: bool = typer.Option(False, "--clear-cache", help="Empty the LLM response cache first"),
 ):
-    """LLM-based evaluation of generated drafts (clarity, style-fit, completeness) with optional auto-refine."""
+    """LLM-based evaluation of generated drafts (clarity, style-fit, completeness) with optional auto-refine.
+
+    Each result is appended to reports/drafts/run_<ts>/ as it completes.
+    """
+    from ..evaluation.eval_runs import ResumeError
     from ..evaluation.run_eval import eval_drafts_cli
+    llm_cache = _use_llm_cache(no_cache, clear_cache)
     with trace_run("eval-drafts", tags=["cli","phase3"], metadata={
-        "dataset": dataset, "words": words, "refine": refine, "min_score": min_score
+        "dataset": dataset, "words": words, "refine": refine, "min_score": min_score, "workers": workers,
+        "resume": resume,
     }):
-        typer.echo(eval_drafts_cli(dataset, words, refine, min_score))
+        try:
+            typer.echo(eval_drafts_cli(dataset, words, refine, min_score, workers=workers, rpm=rpm, resume=resume))
+        except ResumeError as e:
+            raise typer.BadParameter(str(e), param_hint="--resume")
+    _echo_cache_stats(llm_cache)
+
+@app.command()
+def serve(
+    port: int = typer.Option(0, help="Port on 127.0.0.1 (0 = pick a free one)"),
+    max_concurrency: int = typer.Option(16, help="Requests handled at the same time"),
+    verbose: bool = typer.Option(False, "--verbose", help="Log every request"),
+    stop: bool = typer.Option(False, "--stop", help="Stop the running daemon"),
+    status: bool = typer.Option(False, "--status", help="Show whether a daemon is running"),
+):
+    """Run a local daemon that keeps graphs and LLM clients warm; other commands forward to it."""
+    from .daemon_client import daemon_info, call
+    info = daemon_info()
+    if stop or status:
+        if info is None:
+            typer.echo("No daemon running.")
+            raise typer.Exit(code=1 if status else 0)
+        if stop:
+            call("shutdown", info=info, timeout=10)
+            typer.echo(f"Stopped daemon (pid {info['pid']}).")
+        else:
+            typer.echo(f"Daemon running: pid {info['pid']} on {info['host']}:{info['port']}")
+        return
+    if info is not None:
+        typer.echo(f"Daemon already running (pid {info['pid']}, port {info['port']}).", err=True)
+        raise typer.Exit(code=1)
+    from .server import serve as run_server
+    run_server(port=port, max_concurrency=max_concurrency, verbose=verbose,
+               on_ready=lambda st: typer.echo(f"[serve] listening on {st['host']}:{st['port']} (pid {st['pid']})", err=True))
 
 @app.command("review-queue")
-def review_queue():
+def review_queue(
+    label: Optional[str] = typer.Option(None, help="Only this triage label (e.g. REVIEW, DRAFT_EMAIL)"),
+    min_conf: Optional[float] = typer.Option(None, help="Only items with confidence >= this"),
+    max_conf: Optional[float] = typer.Option(None, help="Only items with confidence <= this"),
+    sort: str = typer.Option("created", help="created|confidence|label|id"),
+    desc: bool = typer.Option(False, "--desc", help="Sort descending"),
+    limit: int = typer.Option(50, help="Page size"),
+    offset: int = typer.Option(0, help="Skip this many items"),
+):
     """List queued human reviews."""
-    from ..memory.review_store import list_reviews
-    items = list_reviews()
+    from ..memory.review_store import list_review_summaries, count_reviews
+    items = list_review_summaries(label=label, min_confidence=min_conf, max_confidence=max_conf,
+                                  sort=sort, descending=desc, limit=limit, offset=offset)
     if not items:
         typer.echo("No review tasks.")
         return
-    for rid, payload in items:
-        label = payload.get("triage_label")
-        title = payload.get("title","")
-        conf = payload.get("triage_confidence",0)
-        typer.echo(f"{rid}  [{label} conf={conf:.2f}]  {title}")
+    for it in items:
+        typer.echo(f"{it['id']}  [{it['triage_label']} conf={it['confidence']:.2f}]  {it['title']}")
+    total = count_reviews(label=label, min_confidence=min_conf, max_confidence=max_conf)
+    if offset or total > offset + len(items):
+        typer.echo(f"-- {offset + 1}-{offset + len(items)} of {total} (use --offset for more)")
+
+@app.command("review-migrate")
+def review_migrate(
+    source: Optional[str] = typer.Option(None, help="Legacy review_queue directory (default ~/.echodraft/review_queue)"),
+    remove: bool = typer.Option(False, "--remove", help="Delete JSON files once imported"),
+):
+    """Import the legacy one-JSON-file-per-review queue into the indexed store."""
+    from ..memory.review_store import migrate_json_dir
+    added = migrate_json_dir(source, remove=remove)
+    typer.echo(f"Imported {added} review(s).")
 
 @app.command("review-approve")
 def review_approve(
@@ -139,19 +411,53 @@ def review_approve(
 
 @app.command("learn-edits")
 def learn_edits(
-    original: str = typer.Argument(..., help="Path to ORIGINAL draft file"),
-    edited: str = typer.Argument(..., help="Path to EDITED draft file"),
+    original: Optional[str] = typer.Argument(None, help="Path to ORIGINAL draft file"),
+    edited: Optional[str] = typer.Argument(None, help="Path to EDITED draft file"),
+    corpus: Optional[str] = typer.Option(None, help="Directory with original/ and edited/ subfolders (matching names)"),
+    manifest: Optional[str] = typer.Option(None, help='JSONL of {"original": ..., "edited": ...} pairs'),
+    workers: int = typer.Option(0, help="Processes for corpus mode (0 = one per CPU)"),
+    min_count: int = typer.Option(1, help="Corpus mode: add new rules seen at least this often (existing rules stay)"),
+    top_only: bool = typer.Option(False, "--top-only", help="Corpus mode: add only the most frequent rewrite per phrase"),
 ):
-    """Learn from line-level edits and update style rules (bans/replacements)."""
-    from ..memory.diff_utils import line_level_diff
-    from ..memory.style_rules import update_rules_from_diffs, load_rules, apply_rules_to_prompt
-    with open(original, "r", encoding="utf-8") as f:
-        o = f.read()
-    with open(edited, "r", encoding="utf-8") as f:
-        e = f.read()
-    diffs = line_level_diff(o, e)
-    update_rules_from_diffs(diffs)
+    """Learn from edits (word-level diffs) and update style rules (bans/replacements)."""
+    from ..memory.style_rules import load_rules, apply_rules_to_prompt
+    if corpus or manifest:
+        import time
+        from ..memory.edit_corpus import learn_from_pairs, pairs_from_dir, pairs_from_manifest
+        t0 = time.perf_counter()
+        pairs = pairs_from_manifest(manifest) if manifest else pairs_from_dir(corpus)
+        stats = learn_from_pairs(pairs, workers=workers or None, min_count=min_count, top_only=top_only)
+        typer.echo(f"[learn-edits] pairs={stats['pairs']} mined bans={stats['mined_bans']} "
+                   f"replacements={stats['mined_replacements']} in {time.perf_counter() - t0:.1f}s", err=True)
+    elif original and edited:
+        from ..memory.diff_utils import word_level_diff
+        from ..memory.style_rules import update_rules_from_diffs
+        with open(original, "r", encoding="utf-8") as f:
+            o = f.read()
+        with open(edited, "r", encoding="utf-8") as f:
+            e = f.read()
+        update_rules_from_diffs(word_level_diff(o, e))
+    else:
+        typer.echo("Pass ORIGINAL EDITED, or --corpus/--manifest.", err=True)
+        raise typer.Exit(code=2)
     rules = load_rules()
     typer.echo("Learned from edits. Current personalization rules:\n")
     result = (apply_rules_to_prompt(rules))
     sys.stdout.write(result + "\n")
+
+@app.command("style-add")
+def style_add(
+    files: list[str] = typer.Argument(..., help="Text/Markdown files with your own writing"),
+    split: bool = typer.Option(True, help="Index each paragraph separately"),
+):
+    """Add writing samples to the style index used for drafting hints."""
+    from ..memory.style_index import get_style_index
+    texts = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as f:
+            body = f.read()
+        parts = [p.strip() for p in body.split("\n\n")] if split else [body]
+        texts.extend(p for p in parts if len(p) >= 40)
+    index = get_style_index()
+    added = index.add_samples(texts)
+    typer.echo(f"Added {added} sample(s); index now holds {len(index)}.")
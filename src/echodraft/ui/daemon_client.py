@@ -0,0 +1,80 @@
+# Talks to a running `echodraft serve` daemon; stdlib only so the CLI stays fast to start.
+import http.client
+import json
+import logging
+import os
+from .. import config
+
+log = logging.getLogger(__name__)
+
+class DaemonError(RuntimeError):
+    """The daemon was reached but the request failed; `status` is None if no reply came back."""
+    def __init__(self, msg: str, status: int | None = None):
+        super().__init__(msg)
+        self.status = status
+
+# the daemon answered without running the op: busy, or too old to know it
+_NOT_RUN = (404, 503)
+
+def state_path():
+    """Where `echodraft serve` publishes {pid, host, port, token, started}."""
+    return config.DATA_DIR/"daemon.json"
+
+def daemon_info() -> dict | None:
+    """The running daemon's {pid, host, port, token}, or None if there is none."""
+    try:
+        info = json.loads(state_path().read_text(encoding="utf-8"))
+        os.kill(info["pid"], 0)
+    except (OSError, ValueError, KeyError):
+        return None
+    return info
+
+def call(op: str, payload: dict | None = None, info: dict | None = None, timeout: float = 600) -> object:
+    """POST `payload` to `/<op>` and return its result.
+
+    Raises ConnectionError if the request never reached the daemon (nothing listening, or
+    no connection within DAEMON_CONNECT_TIMEOUT) and DaemonError for anything after that.
+    """
+    info = info or daemon_info()
+    if info is None:
+        raise ConnectionError("echodraft daemon is not running")
+    conn = http.client.HTTPConnection(info["host"], info["port"], timeout=config.DAEMON_CONNECT_TIMEOUT)
+    try:
+        try:
+            conn.connect()
+        except OSError as e:  # refused, unreachable or connect timeout
+            raise ConnectionError(f"cannot reach echodraft daemon: {e}") from e
+        conn.sock.settimeout(timeout)
+        try:
+            conn.request("POST", f"/{op}", body=json.dumps(payload or {}),
+                         headers={"Content-Type": "application/json", "X-EchoDraft-Token": info["token"]})
+            resp = conn.getresponse()
+            body = json.loads(resp.read() or b"{}")
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise DaemonError(f"{type(e).__name__}: {e}") from e
+    finally:
+        conn.close()
+    if resp.status != 200 or "result" not in body:
+        raise DaemonError(body.get("error") or f"HTTP {resp.status}", resp.status)
+    return body["result"]
+
+def forward(op: str, payload: dict) -> tuple[bool, object]:
+    """(True, result) if a daemon handled the request; (False, None) to run it in-process.
+
+    Only falls back when the daemon did not run the op; any other DaemonError propagates,
+    since running a draft or triage again would double its LLM cost (and its side effects).
+    """
+    if not config.DAEMON_FORWARD:
+        return False, None
+    info = daemon_info()
+    if info is None:
+        return False, None
+    try:
+        return True, call(op, payload, info)
+    except ConnectionError:  # stale daemon.json or a wedged daemon: fall back to local
+        return False, None
+    except DaemonError as e:
+        if e.status not in _NOT_RUN:
+            raise
+        log.warning("daemon did not run %s (%s); running it in-process", op, e)
+        return False, None
@@ -0,0 +1,141 @@
+# `echodraft serve`: a localhost HTTP daemon that keeps compiled graphs, style rules
+# and LLM clients warm, so a request costs roughly one model round trip.
+import json, os, secrets, tempfile, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .daemon_client import state_path
+
+def _triage(p: dict):
+    from ..agents.triager import run_triage
+    return run_triage(**p)
+
+def _draft(p: dict):
+    from ..agents.drafter import draft_text
+    return draft_text(**p)
+
+def _revise(p: dict):
+    from ..agents.reviser import revise_text
+    return revise_text(**p)
+
+def _revise_long(p: dict):
+    from ..agents.reviser import revise_long
+    return revise_long(**p)
+
+def _triage_item(p: dict):
+    from ..agents.triager import triage_item
+    return triage_item(p)
+
+def _review_queue(p: dict):
+    from ..memory.review_store import list_review_summaries, count_reviews
+    filters = {k: p[k] for k in ("label", "min_confidence", "max_confidence") if k in p}
+    return {"items": list_review_summaries(**p), "total": count_reviews(**filters)}
+
+OPS = {
+    "triage": _triage,              # same as `echodraft triage`
+    "triage-item": _triage_item,    # triage only, no side effects (ambient ingestion)
+    "draft": _draft,
+    "revise": _revise,
+    "revise-long": _revise_long,    # section-parallel revise: {"text", "patch", ...}
+    "review-queue": _review_queue,
+}
+
+def warm_up() -> None:
+    """Import the LLM stack and build everything a request would otherwise build lazily."""
+    from ..graph.builder import get_graph, get_triage_graph
+    from ..memory.personalization import get_personalization
+    from ..llm import SPECS, get_llm
+    from ..agents import drafter, reviser, triager  # noqa: F401
+    get_graph()
+    get_triage_graph()
+    get_personalization()
+    for role in SPECS:
+        try:
+            get_llm(role)
+        except Exception:  # e.g. no API key yet; the request will report it
+            pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, code: int, body: dict):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        if secrets.compare_digest(self.headers.get("X-EchoDraft-Token", ""), self.server.token):
+            return True
+        self._send(401, {"error": "bad token"})
+        return False
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._send(404, {"error": f"unknown path {self.path}"})
+        self._send(200, {"ok": True, "pid": os.getpid(), "uptime_s": round(time.time() - self.server.started, 1)})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if not self._authorized():
+            return
+        op = self.path.strip("/")
+        if op == "shutdown":
+            self._send(200, {"result": "bye"})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        fn = OPS.get(op)
+        if fn is None:
+            return self._send(404, {"error": f"unknown op {op!r}"})
+        if not self.server.slots.acquire(blocking=False):  # the client runs it in-process instead
+            return self._send(503, {"error": "busy"})
+        try:
+            payload = json.loads(body or b"{}")
+            result = fn(payload)
+        except (TypeError, ValueError) as e:
+            return self._send(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        finally:
+            self.server.slots.release()
+        self._send(200, {"result": result})
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+
+def _write_state(state: dict) -> None:
+    path = state_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:  # mkstemp → 0600: the token stays private
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+def serve(host: str = "127.0.0.1", port: int = 0, max_concurrency: int = 16,
+          verbose: bool = False, on_ready=None) -> None:
+    """Run the daemon until shut down. `port=0` picks a free port; it is published in `state_path()`."""
+    warm_up()
+    httpd = ThreadingHTTPServer((host, port), _Handler)
+    httpd.daemon_threads = True
+    httpd.token = secrets.token_hex(16)
+    httpd.started = time.time()
+    httpd.verbose = verbose
+    httpd.slots = threading.BoundedSemaphore(max(1, max_concurrency))
+    state = {"pid": os.getpid(), "host": host, "port": httpd.server_address[1],
+             "token": httpd.token, "started": httpd.started}
+    _write_state(state)
+    if on_ready:
+        on_ready(state)
+    try:
+        httpd.serve_forever()
+    finally:
+        httpd.server_close()
+        path = state_path()
+        try:
+            if json.loads(path.read_text(encoding="utf-8")).get("pid") == os.getpid():
+                path.unlink()
+        except (OSError, ValueError):
+            pass
@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.fixture
+def fake_llms():
+    """Map role → fake client; every `get_llm(role)` call is served from this dict."""
+    from echodraft import llm
+    clients = {}
+    llm.set_llm_factory(lambda role, spec: clients[role])
+    yield clients
+    llm.set_llm_factory(None)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_local_state(monkeypatch, tmp_path):
+    """Keep telemetry, rule-hit counts, the LLM cache, the triage index and eval runs out of the real tree."""
+    from echodraft.evaluation import eval_runs
+    from echodraft.memory import llm_cache, rule_matcher, telemetry, triage_index
+    monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMCache(tmp_path / "llm_cache.sqlite"))
+    monkeypatch.setattr(triage_index, "_index", triage_index.TriageIndex(tmp_path / "triage_index.sqlite"))
+    monkeypatch.setattr(eval_runs, "REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(telemetry, "METRICS_DIR", tmp_path / "metrics")
+    monkeypatch.setattr(rule_matcher, "HITS_PATH", tmp_path / "rule_hits.json")
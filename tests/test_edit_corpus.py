@@ -0,0 +1,38 @@
+import json
+
+
+def test_word_level_diff_mines_phrases():
+    from echodraft.memory.diff_utils import word_level_diff
+
+    orig = "Title\nWe should utilize the new tool today.\nIn conclusion, ship it.\nThanks"
+    edit = "Title\nLet us use the new tool today.\nThanks"
+    assert word_level_diff(orig, edit) == ["~ We should utilize ==> Let us use", "- In conclusion, ship it."]
+    assert word_level_diff(orig, orig) == []
+
+
+def test_corpus_learning_merges_counts_in_one_write(tmp_path, monkeypatch):
+    from echodraft.memory import style_rules
+    from echodraft.memory.edit_corpus import learn_from_pairs, pairs_from_dir, pairs_from_manifest
+
+    monkeypatch.setattr(style_rules, "RULES_PATH", tmp_path / "style_rules.json")
+    for sub in ("original", "edited"):
+        (tmp_path / "corpus" / sub).mkdir(parents=True)
+    for i in range(30):
+        to = "use" if i % 3 else "apply"  # "use" wins 20 to 10
+        (tmp_path / "corpus/original" / f"{i}.md").write_text(f"# Doc {i}\nPlease utilize the doc {i}.\nIn summary, done.")
+        (tmp_path / "corpus/edited" / f"{i}.md").write_text(f"# Doc {i}\nPlease {to} the doc {i}.")
+
+    style_rules.save_rules({"bans": [], "replacements": [{"from": "We should", "to": "Let's"}], "version": 0})
+    stats = learn_from_pairs(pairs_from_dir(tmp_path / "corpus"), workers=2, chunksize=4, min_count=3, top_only=True)
+    rules = style_rules.load_rules()
+    assert stats["pairs"] == 30 and rules["version"] == 2
+    assert rules["replacements"] == [{"from": "We should", "to": "Let's", "count": 1},  # existing rule kept
+                                     {"from": "utilize", "to": "use", "count": 20}]
+    assert rules["bans"] == ["In summary, done."] and rules["ban_counts"] == {"In summary, done.": 30}
+
+    manifest = tmp_path / "pairs.jsonl"
+    manifest.write_text("\n".join(json.dumps({"original": f"corpus/original/{i}.md", "edited": f"corpus/edited/{i}.md"})
+                                  for i in range(3)))
+    learn_from_pairs(pairs_from_manifest(manifest), workers=1)
+    repl = {(r["from"], r["to"]): r["count"] for r in style_rules.load_rules()["replacements"]}
+    assert repl[("utilize", "use")] == 22 and repl[("utilize", "apply")] == 1  # no top_only: every pair
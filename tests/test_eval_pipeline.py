@@ -0,0 +1,125 @@
+import json
+import random
+import time
+from types import SimpleNamespace
+
+
+def _fake_eval(monkeypatch, fake_llms):
+    from echodraft.evaluation import run_eval
+
+    def draft_text(topic, style, target_words, explain, expectations):
+        time.sleep(random.uniform(0, 0.02))  # finish out of order
+        return f"{topic}|{style}"
+
+    def evaluate_draft_llm(draft, style, expectations):
+        score = 5 if draft.startswith("Improved") else len(draft) % 5 + 1
+        return {"clarity": score, "style_fit": 4, "completeness": score, "comments": f"c:{draft}"}
+
+    monkeypatch.setattr(run_eval, "draft_text", draft_text)
+    monkeypatch.setattr(run_eval, "evaluate_draft_llm", evaluate_draft_llm)
+    fake_llms["refine"] = SimpleNamespace(invoke=lambda prompt: SimpleNamespace(content="Improved draft"))
+    return run_eval
+
+
+def test_concurrent_eval_drafts_matches_serial(monkeypatch, fake_llms, tmp_path):
+    run_eval = _fake_eval(monkeypatch, fake_llms)
+    data = tmp_path / "drafts.jsonl"
+    data.write_text("\n".join(json.dumps({"topic": f"topic {i}", "style": "story"}) for i in range(25)))
+
+    serial = json.loads(run_eval.eval_drafts_cli(str(data), workers=1, rpm=0))
+    parallel = json.loads(run_eval.eval_drafts_cli(str(data), workers=8, rpm=0))
+    assert parallel.pop("run") != serial.pop("run")  # each run gets its own directory
+    assert parallel == serial
+    assert [r["topic"] for r in parallel["results"]] == [f"topic {i}" for i in range(25)]
+
+
+def test_eval_drafts_resume_skips_finished_examples(monkeypatch, fake_llms, tmp_path):
+    from echodraft.evaluation.eval_runs import iter_results
+    run_eval = _fake_eval(monkeypatch, fake_llms)
+    data = tmp_path / "drafts.jsonl"
+    data.write_text("\n".join(json.dumps({"topic": f"topic {i}", "style": "story"}) for i in range(10)))
+    full = json.loads(run_eval.eval_drafts_cli(str(data), workers=1, rpm=0))
+
+    real_draft, calls, fail = run_eval.draft_text, [], {"topic 6"}
+    def flaky_draft(topic, **kw):
+        calls.append(topic)
+        if topic in fail:
+            raise RuntimeError("rate limited")
+        return real_draft(topic, **kw)
+    monkeypatch.setattr(run_eval, "draft_text", flaky_draft)
+    try:
+        run_eval.eval_drafts_cli(str(data), workers=1, rpm=0)
+    except RuntimeError:
+        pass
+    run_dir = max((tmp_path / "reports" / "drafts").iterdir())
+    assert [r["idx"] for r in iter_results(run_dir)] == list(range(6))
+    with open(run_dir / "results.jsonl", "a") as f:
+        f.write('{"idx": 6, "topic": "tor')  # torn write from the crash
+
+    calls.clear()
+    fail.clear()
+    resumed = json.loads(run_eval.eval_drafts_cli(str(data), workers=4, rpm=0, resume="latest"))
+    assert sorted(calls) == [f"topic {i}" for i in range(6, 10)]
+    assert resumed["run"] == str(run_dir)
+    assert resumed["summary"] == full["summary"]
+    assert [r["topic"] for r in resumed["results"]] == [f"topic {i}" for i in range(10)]
+
+
+def test_imap_bounded_keeps_in_flight_bounded():
+    from echodraft.concurrency import imap_bounded
+
+    consumed = []
+
+    def items():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    gen = imap_bounded(lambda x: x * 2, items(), workers=4, in_flight=8)
+    assert next(gen) == 0
+    assert len(consumed) <= 9
+    assert sorted(gen) == [x * 2 for x in range(1, 100)]
+    assert sorted(imap_bounded(lambda x: x, range(50), workers=4, ordered=False)) == list(range(50))
+
+
+def test_sampled_eval_triage_stops_early_with_intervals(monkeypatch, tmp_path):
+    from echodraft.evaluation import triage_eval
+
+    labels = ["IGNORE"] * 6 + ["NOTIFY"] * 3 + ["DRAFT_EMAIL"]
+    data = tmp_path / "triage.jsonl"
+    data.write_text("\n".join(json.dumps({"surface": "email", "title": f"item {i}", "content": "x",
+                                          "label": labels[i % 10]}) for i in range(3000)))
+    calls = []
+    def fake_triage(app, item):
+        calls.append(item["title"])
+        wrong = int(item["title"].split()[1]) % 7 == 0
+        return ("REVIEW" if wrong else item["label"]), "llm"
+    monkeypatch.setattr(triage_eval, "_triage", fake_triage)
+
+    progress = []
+    out = triage_eval.evaluate_triage_sampled(str(data), workers=4, target_width=0.08, on_progress=progress.append)
+    assert out["stopped_early"] and len(calls) < 1000
+    est = out["estimate"]
+    assert est["sampled"] == out["size"] and est["accuracy"]["hi"] - est["accuracy"]["lo"] <= 0.08
+    assert est["accuracy"]["lo"] <= 6 / 7 + 0.01 and est["accuracy"]["hi"] >= 6 / 7 - 0.01
+    assert set(est["per_label"]) == {"IGNORE", "NOTIFY", "DRAFT_EMAIL"}
+    assert progress and progress[-1]["sampled"] <= out["size"]
+
+    full = triage_eval.estimate_triage([{"label": labels[i % 10], "pred": labels[i % 10]} for i in range(3000)],
+                                       {"IGNORE": 1800, "NOTIFY": 900, "DRAFT_EMAIL": 300})
+    assert full["accuracy"] == {"value": 1.0, "lo": 1.0, "hi": 1.0}
+
+
+def test_bad_dataset_is_not_reported_as_bad_resume(tmp_path):
+    from typer.testing import CliRunner
+    from echodraft.evaluation import eval_runs
+    from echodraft.ui.cli import app
+
+    bad = tmp_path / "bad.jsonl"
+    bad.write_text('{oops\n{"surface": "email", "title": "x", "content": "y", "label": "NOTIFY"}\n')
+    res = CliRunner().invoke(app, ["eval-triage", "--dataset", str(bad), "--no-cache"])
+    assert res.exit_code != 0 and "--resume" not in res.output
+    assert not list((eval_runs.REPORTS_DIR / "triage").glob("run_*"))  # no empty run left behind
+
+    res = CliRunner().invoke(app, ["eval-triage", "--dataset", str(bad), "--resume", str(tmp_path / "nope")])
+    assert res.exit_code == 2 and "--resume" in res.output
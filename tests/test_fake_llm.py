@@ -0,0 +1,44 @@
+import time
+
+
+def test_fake_model_scripts_replies_and_latency():
+    from echodraft.evaluation.fake_llm import FakeChatModel
+
+    m = FakeChatModel(responses=["first reply", "second"], latency=0.05, jitter=0.01)
+    t = time.perf_counter()
+    assert m.invoke("hi").content == "first reply"
+    assert time.perf_counter() - t >= 0.04
+    assert "".join(c.content for c in m.stream("hi")) == "second"
+    assert m.calls == 2
+
+
+def test_fake_factory_drives_the_graph():
+    from echodraft import llm
+    from echodraft.agents.triager import triage_item
+    from echodraft.evaluation.fake_llm import LABELS, use_fake_llms
+
+    use_fake_llms()
+    try:
+        a = triage_item({"surface": "email", "title": "Budget question", "content": "thoughts?"}, fast_path=False)
+        b = triage_item({"surface": "email", "title": "Budget question", "content": "thoughts?"}, fast_path=False)
+    finally:
+        llm.set_llm_factory(None)
+    assert a == b and a["label"] in LABELS and a["source"] == "llm"
+
+
+def test_fake_models_are_cached_like_real_ones():
+    from echodraft import llm
+    from echodraft.agents.triager import triage_item
+    from echodraft.evaluation.fake_llm import use_fake_llms
+    from echodraft.memory import llm_cache
+
+    use_fake_llms()
+    try:
+        item = {"surface": "email", "title": "Budget question", "content": "thoughts?"}
+        first = triage_item(item, fast_path=False)
+        again = triage_item(item, fast_path=False)
+        assert llm.get_llm("triage").calls == 1 and first == again
+        assert llm.get_llm("draft").temperature == llm.SPECS["draft"]["temperature"]
+    finally:
+        llm.set_llm_factory(None)
+    assert llm_cache.get_cache().stats()["hits"] == 1
@@ -0,0 +1,10 @@
+def test_get_graph_is_shared_per_config():
+    from echodraft.graph.builder import get_graph, clear_graphs
+    clear_graphs()
+    app = get_graph()
+    assert get_graph() is app
+    assert get_graph(review_threshold=0.5) is app
+    assert get_graph(review_threshold=0.8) is not app
+    assert get_graph(with_explain=False) is not app
+    clear_graphs()
+    assert get_graph() is not app
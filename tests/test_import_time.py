@@ -0,0 +1,29 @@
+import json
+import os
+import subprocess
+import sys
+
+HEAVY = ("langchain_openai", "langchain_core", "langgraph", "langsmith", "openai", "numpy")
+
+# Import the CLI and run lightweight commands in a clean interpreter, then report
+# wall time and which heavy modules got loaded.
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+from echodraft.ui.cli import app
+imported = time.perf_counter() - t
+from typer.testing import CliRunner
+for cmd in (["review-queue"], ["--help"]):
+    assert CliRunner().invoke(app, cmd).exit_code == 0, cmd
+print(json.dumps({"import_s": imported, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+
+def test_cli_startup_stays_lightweight(tmp_path):
+    env = {**os.environ, "ECHODRAFT_HOME": str(tmp_path)}
+    env.pop("OPENAI_API_KEY", None)  # no key needed unless a model is actually called
+    out = subprocess.run([sys.executable, "-c", _PROBE], env=env, capture_output=True, text=True, check=True)
+    probe = json.loads(out.stdout.strip().splitlines()[-1])
+    print(f"echodraft.ui.cli import: {probe['import_s'] * 1000:.0f} ms")
+    assert probe["loaded"] == []
+    assert probe["import_s"] < 1.0
@@ -0,0 +1,88 @@
+import json
+import os
+from types import SimpleNamespace
+
+MAIL = b"""From: ana@example.com
+Subject: Can you review the Q3 plan?
+Content-Type: text/plain
+
+Hi, could you take a look at the attached plan before Friday and let me know what you think?
+"""
+
+
+def _fake_triage(fake_llms):
+    prompts = []
+    def invoke(prompt, config=None):
+        prompts.append(prompt)
+        label = "DRAFT_EMAIL" if "Q3 plan" in prompt else "DRAFT_NOTION"
+        return SimpleNamespace(content=json.dumps({"label": label, "reason": "fake", "confidence": 0.8}))
+    fake_llms["triage"] = SimpleNamespace(invoke=invoke)
+    return prompts
+
+
+def test_ingest_only_triages_new_or_changed_files(fake_llms, tmp_path, monkeypatch):
+    from echodraft.io import ingest
+    monkeypatch.setattr(ingest, "MANIFEST_PATH", tmp_path / "ingest.sqlite")
+    prompts = _fake_triage(fake_llms)
+
+    root = tmp_path / "inbox"
+    (root / "mail" / "cur").mkdir(parents=True)
+    (root / "mail" / "cur" / "1700000000.M1.host").write_bytes(MAIL)
+    for i in range(5):
+        (root / f"page{i}.md").write_text(f"# Launch brief {i}\n\n- Goals for launch {i}\n- Scope and owners {i}\n")
+    (root / ".DS_Store").write_text("hidden")
+
+    decided = []
+    stats = ingest.ingest(root, batch_size=2, workers=3, on_result=decided.append)
+    assert (stats["files"], stats["triaged"], stats["errors"]) == (6, 6, 0)
+    assert len(prompts) == 6
+    mail = next(r for r in decided if r["path"].startswith("mail"))
+    assert mail["label"] == "DRAFT_EMAIL"
+
+    stats = ingest.ingest(root)
+    assert (stats["unchanged"], stats["triaged"], len(prompts)) == (6, 0, 6)
+
+    page = root / "page0.md"
+    os.utime(page, ns=(page.stat().st_atime_ns, page.stat().st_mtime_ns + 10**9))  # touched, same bytes
+    page1 = root / "page1.md"
+    page1.write_text(page1.read_text() + "- Open question: pricing\n")
+    (root / "page2.md").unlink()
+    stats = ingest.ingest(root)
+    assert (stats["touched"], stats["triaged"], stats["removed"]) == (1, 1, 1)
+    assert len(prompts) == 7
+
+    assert ingest.ingest(root)["unchanged"] == 5 and len(prompts) == 7
+    manifest = ingest.Manifest()
+    assert len(manifest.decisions(str(root.resolve()))) == 5
+    manifest.close()
+
+
+def test_ingest_keeps_records_it_cannot_see(fake_llms, tmp_path, monkeypatch):
+    import pytest
+    from echodraft.io import ingest
+    monkeypatch.setattr(ingest, "MANIFEST_PATH", tmp_path / "ingest.sqlite")
+    prompts = _fake_triage(fake_llms)
+
+    root = tmp_path / "inbox"
+    (root / "team").mkdir(parents=True)
+    (root / "top.md").write_text("# Launch brief\n\n- Goals\n- Scope\n")
+    (root / "team" / "notes.md").write_text("# Team notes\n\n- Owners\n- Dates\n")
+    assert ingest.ingest(root)["triaged"] == 2
+
+    moved = tmp_path / "elsewhere"
+    root.rename(moved)  # unmounted / moved away
+    with pytest.raises(ValueError):
+        ingest.ingest(root)
+    moved.rename(root)
+
+    real_scandir = os.scandir
+    def scandir(path):
+        if str(path).endswith("team"):
+            raise PermissionError(13, "denied", str(path))
+        return real_scandir(path)
+    monkeypatch.setattr(ingest.os, "scandir", scandir)
+    stats = ingest.ingest(root)
+    assert (stats["unchanged"], stats["removed"], stats["unreadable_dirs"]) == (1, 0, 1)
+
+    monkeypatch.setattr(ingest.os, "scandir", real_scandir)
+    assert ingest.ingest(root)["unchanged"] == 2 and len(prompts) == 2
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+
+def test_cache_hit_miss_ttl_and_lru(tmp_path, monkeypatch):
+    from echodraft.memory.llm_cache import LLMCache
+
+    cache = LLMCache(tmp_path / "c.sqlite", max_entries=10, ttl_seconds=60)
+    k = cache.key("gpt-4o-mini", 0, None, "prompt")
+    assert k != cache.key("gpt-4o-mini", 0, 600, "prompt")
+    assert cache.get(k) is None
+    cache.put(k, "gpt-4o-mini", "answer")
+    assert cache.get(k) == "answer"
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    for i in range(20):
+        cache.put(f"k{i}", "m", str(i))
+    assert cache.stats()["entries"] <= 10
+    assert cache.get("k19") == "19" and cache.get("k0") is None
+
+    reopened = LLMCache(tmp_path / "c.sqlite", ttl_seconds=60)
+    assert reopened.get("k19") == "19"
+    import time
+    monkeypatch.setattr(time, "time", lambda: 10**12)
+    assert reopened.get("k19") is None  # expired
+
+
+def test_cached_invoke_only_caches_deterministic_clients(tmp_path, monkeypatch):
+    from echodraft.memory import llm_cache
+
+    monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMCache(tmp_path / "c.sqlite"))
+    calls = []
+
+    def client(temperature):
+        def invoke(prompt):
+            calls.append(prompt)
+            return SimpleNamespace(content=f"out:{prompt}")
+        return SimpleNamespace(model_name="m", temperature=temperature, max_tokens=None, invoke=invoke)
+
+    det, creative = client(0), client(0.7)
+    assert llm_cache.cached_invoke(det, "p") == llm_cache.cached_invoke(det, "p") == "out:p"
+    llm_cache.cached_invoke(creative, "p")
+    llm_cache.cached_invoke(creative, "p")
+    assert len(calls) == 3
+
+    llm_cache.set_enabled(False)
+    try:
+        llm_cache.cached_invoke(det, "p")
+    finally:
+        llm_cache.set_enabled(True)
+    assert len(calls) == 4
+
+
+def test_replacing_an_entry_does_not_grow_the_count(tmp_path):
+    from echodraft.memory.llm_cache import LLMCache
+
+    cache = LLMCache(tmp_path / "c.sqlite", max_entries=3)
+    for _ in range(5):
+        cache.put("same", "m", "answer")
+    cache.put("a", "m", "1")
+    cache.put("b", "m", "2")
+    assert cache.stats()["entries"] == 3 and cache.get("same") == "answer"  # nothing evicted early
+
+
+def test_cached_invoke_skips_responses_the_validator_rejects(tmp_path, monkeypatch):
+    from echodraft.memory import llm_cache
+
+    monkeypatch.setattr(llm_cache, "_cache", llm_cache.LLMCache(tmp_path / "c.sqlite"))
+    replies = iter(["not json", '{"label": "NOTIFY"}', "unused"])
+    calls = []
+    def invoke(prompt):
+        calls.append(prompt)
+        return SimpleNamespace(content=next(replies))
+    det = SimpleNamespace(model_name="m", temperature=0, max_tokens=None, invoke=invoke)
+    is_json = lambda t: t.startswith("{")
+
+    assert llm_cache.cached_invoke(det, "p", validate=is_json) == "not json"
+    assert llm_cache.cached_invoke(det, "p", validate=is_json) == '{"label": "NOTIFY"}'
+    assert llm_cache.cached_invoke(det, "p", validate=is_json) == '{"label": "NOTIFY"}'
+    assert len(calls) == 2
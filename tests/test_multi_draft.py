@@ -0,0 +1,81 @@
+import threading
+import time
+from types import SimpleNamespace
+
+
+class _FakeLLM:
+    def __init__(self, reply, delay=0.0):
+        self.reply, self.delay, self.calls = reply, delay, 0
+        self._lock = threading.Lock()
+
+    def invoke(self, prompt, config=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return SimpleNamespace(content=self.reply(prompt) if callable(self.reply) else self.reply)
+
+
+def test_multi_draft_triages_once_and_drafts_in_parallel(fake_llms):
+    from echodraft.agents.drafter import multi_draft_texts
+
+    triage = _FakeLLM('{"label": "DRAFT_NOTION", "reason": "skeleton", "confidence": 0.9}')
+    drafter = _FakeLLM(lambda p: p.split("Style: ")[1].split("\n")[0], delay=0.2)
+    fake_llms.update(triage=triage, draft=drafter)
+
+    start = time.perf_counter()
+    out = multi_draft_texts("Launch plan", count=3, max_concurrency=3)
+    elapsed = time.perf_counter() - start
+
+    assert out == ["professional", "persuasive", "story"]
+    assert triage.calls == 1 and drafter.calls == 3
+    assert elapsed < 0.5  # ~one draft, not three in a row
+
+
+def test_multi_draft_returns_triage_reason_when_not_drafting(fake_llms):
+    from echodraft.agents.drafter import multi_draft_texts
+
+    drafter = _FakeLLM("unused")
+    fake_llms.update(triage=_FakeLLM('{"label": "IGNORE", "reason": "promo", "confidence": 0.9}'), draft=drafter)
+
+    assert multi_draft_texts("Weekly digest", count=3) == ["[triage:IGNORE] promo"]
+    assert drafter.calls == 0
+
+
+def test_streamed_variants_do_not_interleave(fake_llms):
+    import itertools
+    from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+    from echodraft.agents.drafter import stream_multi_draft_texts
+
+    replies = itertools.cycle([AIMessage(content=f"variant {w} " * 20) for w in ("one", "two", "three")])
+    fake_llms.update(triage=_FakeLLM('{"label": "DRAFT_NOTION", "reason": "x", "confidence": 0.9}'),
+                     draft=GenericFakeChatModel(messages=replies))
+
+    out = []
+    variants, timing = stream_multi_draft_texts(
+        "Launch plan", on_token=out.append, on_variant=lambda i: out.append(f"<{i}>"), count=3)
+
+    assert "".join(out) == "".join(f"<{i}>{v} " for i, v in enumerate(variants))
+    assert timing["ttft_s"] is not None and timing["total_s"] >= timing["ttft_s"]
+
+
+def test_speculative_draft_overlaps_triage_and_is_discarded_on_ignore(fake_llms):
+    from echodraft.agents.drafter import draft_text
+    from echodraft.graph.speculation import speculation_stats
+
+    def triage(prompt):
+        if "offsite" in prompt:
+            return '{"label": "IGNORE", "reason": "promo", "confidence": 0.9}'
+        return '{"label": "DRAFT_NOTION", "reason": "skeleton", "confidence": 0.9}'
+    drafter = _FakeLLM("speculated body", delay=0.2)
+    fake_llms.update(triage=_FakeLLM(triage, delay=0.2), draft=drafter)
+    start = time.perf_counter()
+    assert draft_text("Launch plan", speculate=True) == "speculated body"
+    assert time.perf_counter() - start < 0.35  # triage and draft ran side by side
+    assert drafter.calls == 1
+
+    assert draft_text("Quarterly offsite", speculate=True) == "[triage:IGNORE] promo"
+    time.sleep(0.3)  # the discarded draft is recorded once it finishes
+    stats = speculation_stats()
+    assert stats["speculated"] == 2 and stats["used"] == 1 and stats["wasted"] == 1
+    assert stats["waste_rate"] == 0.5 and stats["saved_ms_total"] > 0
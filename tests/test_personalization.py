@@ -0,0 +1,28 @@
+def test_personalization_is_cached_until_rules_change(tmp_path, monkeypatch):
+    from echodraft.memory import style_rules
+    from echodraft.memory.personalization import get_personalization
+    from echodraft.memory.feedback_store import FeedbackStore
+    from echodraft.memory.user_profile import UserProfile
+
+    monkeypatch.setattr(style_rules, "RULES_PATH", tmp_path / "style_rules.json")
+    profile = UserProfile(taboo_phrases=["Needless to say"])
+    feedback = FeedbackStore()
+    feedback.add("utilize", "use")
+
+    first = get_personalization(profile, feedback)
+    assert first.bans == ("Needless to say",)
+    assert first.replacements == (("utilize", "use"),)
+    assert get_personalization(profile, feedback) is first
+
+    monkeypatch.setattr(style_rules, "load_rules", lambda: (_ for _ in ()).throw(AssertionError("re-read")))
+    assert get_personalization(profile, feedback) is first  # no file change → no re-read
+    monkeypatch.undo()
+    monkeypatch.setattr(style_rules, "RULES_PATH", tmp_path / "style_rules.json")
+
+    style_rules.update_rules_from_diffs(["- In conclusion, ship it.", "~ We should ==> Let's"])
+    second = get_personalization(profile, feedback)
+    assert second is not first and second.version == 1
+    assert "In conclusion, ship it." in second.bans
+    assert ("We should", "Let's") in second.replacements
+    assert "“We should”→“Let's”" in second.prompt
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["style_rules.json", "style_rules.lock"]
@@ -0,0 +1,15 @@
+from echodraft.graph.policies import pre_triage
+
+
+def test_pre_triage_decides_only_unambiguous_items():
+    promo = {"surface": "email", "title": "Newsletter", "content": "Unsubscribe | limited-time sale"}
+    assert pre_triage(promo)["label"] == "IGNORE"
+
+    tagged = {"surface": "notion", "title": "Launch brief #echodraft", "content": "- Goals\n- Scope"}
+    assert pre_triage(tagged)["label"] == "DRAFT_NOTION"
+
+    # mixed or sensitive cues, or no cues, go to the LLM
+    assert pre_triage({"surface": "email", "title": "FYI", "content": "Sale ends today, just sharing"}) is None
+    assert pre_triage({"surface": "email", "title": "Legal", "content": "unsubscribe request from counsel"}) is None
+    assert pre_triage({"surface": "notion", "title": "Sales enablement brief", "content": "- Audience"}) is None
+    assert pre_triage({"surface": "email", "title": "Promotion to Staff", "content": "Congrats!"}) is None
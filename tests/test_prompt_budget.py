@@ -0,0 +1,32 @@
+def _doc():
+    parts = ["# Launch plan", "Intro line that sets context."]
+    for s in range(1, 6):
+        parts.append(f"## Section {s}")
+        parts += [f"Paragraph {s}.{i} " + "filler words " * 12 for i in range(8)]
+    parts.append("Closing line with the actual ask.")
+    return "\n".join(parts)
+
+
+def test_trim_text_keeps_headings_start_and_end():
+    from echodraft.io.prompt_budget import count_tokens, trim_text
+
+    doc = _doc()
+    out = trim_text(doc, 300)
+    assert count_tokens(out) <= 300 < count_tokens(doc)
+    assert out.startswith("# Launch plan\nIntro line")
+    assert out.endswith("Closing line with the actual ask.")
+    assert all(f"## Section {s}" in out for s in range(1, 6))
+    assert "lines omitted" in out
+    assert trim_text("short", 300) == "short"
+
+
+def test_fit_prompt_trims_only_what_is_needed():
+    from echodraft.io.prompt_budget import count_tokens, fit_prompt
+
+    render = "Fixed instructions.\nMETA: {metadata}\nCONTENT:\n{content}".format
+    sections = {"metadata": '{"from": "a@b.c"}', "content": _doc()}
+    small = fit_prompt("t", lambda **s: render(**s), sections, budget=10_000, trim=("content",))
+    assert small == render(**sections)
+    out = fit_prompt("t", lambda **s: render(**s), sections, budget=400, trim=("content",))
+    assert count_tokens(out) <= 400
+    assert out.startswith('Fixed instructions.\nMETA: {"from": "a@b.c"}') and "# Launch plan" in out
@@ -0,0 +1,30 @@
+import json
+
+
+def test_review_store_filters_pages_and_migrates(tmp_path, monkeypatch):
+    from echodraft.memory import review_store
+
+    legacy = tmp_path / "review_queue"
+    legacy.mkdir()
+    (legacy / "rvw_100_aaaaaa.json").write_text(json.dumps(
+        {"id": "rvw_100_aaaaaa", "title": "Old", "triage_label": "REVIEW", "triage_confidence": 0.3}))
+    monkeypatch.setattr(review_store, "ROOT", legacy)
+    monkeypatch.setattr(review_store, "DB_PATH", tmp_path / "reviews.sqlite")
+
+    # first open imports the legacy queue
+    assert [s["id"] for s in review_store.list_review_summaries()] == ["rvw_100_aaaaaa"]
+    assert review_store.migrate_json_dir(legacy) == 0  # idempotent
+
+    for i, (label, conf) in enumerate([("DRAFT_EMAIL", 0.9), ("REVIEW", 0.4), ("REVIEW", 0.7)]):
+        review_store.enqueue_review({"id": f"r{i}", "title": f"t{i}", "triage_label": label,
+                                     "triage_confidence": conf, "content": "x" * 1000})
+
+    reviews = review_store.list_review_summaries(label="review", sort="confidence", descending=True)
+    assert [r["id"] for r in reviews] == ["r2", "r1", "rvw_100_aaaaaa"]
+    assert "payload" not in reviews[0]
+    assert review_store.count_reviews(min_confidence=0.5) == 2
+    assert [r["id"] for r in review_store.list_review_summaries(sort="id", limit=2, offset=1)] == ["r1", "r2"]
+
+    assert review_store.load_review("r0")["content"] == "x" * 1000
+    assert review_store.delete_review("r0") and not review_store.delete_review("r0")
+    assert len(review_store.list_reviews()) == 3
@@ -0,0 +1,96 @@
+import threading
+import time
+from types import SimpleNamespace
+
+
+DOC = """# Launch plan
+
+Intro paragraph about the launch.
+
+## Timeline
+
+Week one we ship the beta.
+
+```
+# not a heading
+```
+
+## Budget
+
+We spend money carefully.
+
+## Conclusion
+
+Thanks, see you soon.
+"""
+
+
+def test_split_sections_round_trips_and_respects_fences():
+    from echodraft.agents.reviser import split_sections
+
+    sections = split_sections(DOC)
+    assert "".join(sections) == DOC
+    assert [s.splitlines()[0] for s in sections] == ["# Launch plan", "## Timeline", "## Budget", "## Conclusion"]
+
+    plain = "\n\n".join(" ".join(["word"] * 50) for _ in range(10))
+    parts = split_sections(plain, max_words=120)
+    assert "".join(parts) == plain and len(parts) == 5  # two 50-word paragraphs per section
+
+
+def test_revise_long_runs_sections_in_parallel_and_skips_untouched(fake_llms):
+    from echodraft.agents.reviser import revise_long
+
+    prompts, lock = [], threading.Lock()
+    def invoke(prompt, config=None):
+        with lock:
+            prompts.append(prompt)
+        time.sleep(0.2)
+        section = prompt.rsplit("<<<\n", 1)[1].rsplit("\n>>>", 1)[0]
+        return SimpleNamespace(content=section.upper())
+    fake_llms["revise"] = SimpleNamespace(invoke=invoke)
+
+    start = time.perf_counter()
+    out = revise_long(DOC, "make it punchier")
+    assert time.perf_counter() - start < 0.5  # four sections, about one call long
+    assert out["sections"] == out["revised"] == 4 and len(prompts) == 4
+    assert out["text"] == DOC.upper()
+
+    prompts.clear()
+    out = revise_long(DOC, "The budget section is vague; also tighten the conclusion")
+    assert out["revised"] == 2 and len(prompts) == 2
+    assert "WE SPEND MONEY CAREFULLY." in out["text"] and "Week one we ship the beta." in out["text"]
+    assert "~ We spend money carefully. ==> WE SPEND MONEY CAREFULLY." in out["patch"]
+    assert all("2. ## Timeline" in p for p in prompts)  # every call sees the outline
+
+
+def test_whole_document_feedback_is_not_scoped():
+    from echodraft.agents.reviser import _targets, split_sections
+
+    sections = split_sections(DOC)
+    assert _targets(sections, "Tighten the whole document, especially the intro") is None
+    assert _targets(sections, "Make everything shorter; the budget numbers too") is None
+    assert _targets(sections, "Rework the intro") == {0}
+
+
+def test_sections_fit_the_revise_output_cap_and_truncation_keeps_the_original(fake_llms):
+    import random
+    from echodraft.agents.reviser import revise_long, split_sections
+    from echodraft.io.prompt_budget import count_tokens
+    from echodraft.llm import SPECS
+
+    rng = random.Random(0)
+    words = "we ship the new plan to our team on time and it will help them a lot".split()
+    doc = "\n\n".join(" ".join(rng.choice(words) for _ in range(rng.randint(40, 120))) + "."
+                      for _ in range(50))  # ~4k words, no headings
+    sections = split_sections(doc)
+    assert len(sections) > 10
+    assert "".join(sections) == doc
+    assert max(count_tokens(s) for s in sections) < SPECS["revise"]["max_tokens"] * 3 // 4
+
+    def invoke(prompt, config=None):
+        cut = "TRUNCATE" in prompt
+        return SimpleNamespace(content="cut off mid-sent" if cut else "fine",
+                               response_metadata={"finish_reason": "length" if cut else "stop"})
+    fake_llms["revise"] = SimpleNamespace(invoke=invoke)
+    out = revise_long("# A\n\nkeep TRUNCATE me\n\n# B\n\nchange me\n", "shorter")
+    assert out["text"] == "# A\n\nkeep TRUNCATE me\n\nfine\n"
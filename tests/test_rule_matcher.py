@@ -0,0 +1,49 @@
+import time
+
+
+def test_matcher_rewrites_and_reports_in_one_pass():
+    from echodraft.memory.rule_matcher import RuleMatcher
+
+    m = RuleMatcher(bans=["in conclusion", "needless to say"],
+                    replacements=[("utilize", "use"), ("we should", "let's"), ("we shall", "we will")])
+    text, hits = m.apply("We should utilize it. In conclusion, we shall ship; utilized stays.")
+    assert text == "Let's use it. In conclusion, we will ship; utilized stays."
+    assert hits == {"repl:we should": 1, "repl:utilize": 1, "ban:in conclusion": 1, "repl:we shall": 1}
+    assert RuleMatcher().apply("untouched") == ("untouched", {})
+
+
+def test_matcher_scales_to_thousands_of_rules():
+    from echodraft.memory.rule_matcher import RuleMatcher
+
+    repl = [(f"phrase number {i}", f"p{i}") for i in range(5000)]
+    m = RuleMatcher(bans=[f"banned thing {i}" for i in range(2000)], replacements=repl)
+    text = " ".join(["some ordinary words here and phrase number 4321 too"] * 2000)
+    start = time.perf_counter()
+    out, hits = m.apply(text)
+    assert time.perf_counter() - start < 0.5
+    assert hits == {"repl:phrase number 4321": 2000} and "p4321 too" in out
+
+
+def test_prompt_lists_only_top_ranked_rules(tmp_path, monkeypatch):
+    from collections import Counter
+    from echodraft import config
+    from echodraft.memory import personalization, rule_matcher, style_rules
+    from echodraft.memory.feedback_store import FeedbackStore
+    from echodraft.memory.user_profile import UserProfile
+
+    monkeypatch.setattr(style_rules, "RULES_PATH", tmp_path / "style_rules.json")
+    monkeypatch.setattr(config, "STYLE_RULES_PROMPT_K", 3)
+    bans = [f"banned phrase {i}" for i in range(10)]
+    style_rules.save_rules({"bans": bans, "ban_counts": {b: 1 for b in bans},
+                            "replacements": [{"from": f"old{i}", "to": f"new{i}", "count": i + 2}
+                                             for i in range(100)]})
+    p = personalization.get_personalization(UserProfile(), FeedbackStore())
+    assert "“old99”→“new99”" in p.prompt and "“old96”" not in p.prompt
+    assert "+97 more substitutions" in p.prompt
+    assert all(f"“{b}”" in p.prompt for b in bans)  # ranked below every replacement, still shown
+    assert p.matcher.apply("old5 and old50")[0] == "new5 and new50"
+
+    rule_matcher.record_hits(Counter({"repl:old1": 500}))
+    p2 = personalization.get_personalization(UserProfile(), FeedbackStore())
+    assert p2.matcher is p.matcher  # rules unchanged: no recompile, just re-ranked
+    assert p2.prompt.split("Make these substitutions: ")[1].startswith("“old1”→“new1”")
@@ -0,0 +1,97 @@
+import json
+import socket
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+
+class _LLM:
+    def __init__(self, reply):
+        self.reply = reply
+
+    def invoke(self, prompt, config=None):
+        return SimpleNamespace(content=self.reply)
+
+
+def test_cli_forwards_to_running_daemon(monkeypatch, fake_llms, tmp_path):
+    from typer.testing import CliRunner
+    from echodraft import config
+    from echodraft.memory import review_store
+    from echodraft.ui import daemon_client, server
+    from echodraft.ui.cli import app
+
+    monkeypatch.setattr(config, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(review_store, "DB_PATH", tmp_path / "reviews.sqlite")
+    fake_llms.update(triage=_LLM(json.dumps({"label": "NOTIFY", "reason": "fyi", "confidence": 0.9})),
+                     draft=_LLM("draft"), revise=_LLM("revised text"), eval=_LLM("{}"), refine=_LLM(""))
+
+    ready = threading.Event()
+    t = threading.Thread(target=server.serve, kwargs={"on_ready": lambda st: ready.set()}, daemon=True)
+    t.start()
+    assert ready.wait(30)
+    info = daemon_client.daemon_info()
+    assert info and (tmp_path / "daemon.json").stat().st_mode & 0o077 == 0
+
+    calls = []
+    real_call = daemon_client.call
+    monkeypatch.setattr(daemon_client, "call", lambda op, *a, **kw: (calls.append(op), real_call(op, *a, **kw))[1])
+    res = CliRunner().invoke(app, ["triage", "--title", "Status", "--content", "all good"])
+    assert res.exit_code == 0 and "label=NOTIFY" in res.output
+    src = tmp_path / "d.txt"
+    src.write_text("a draft")
+    res = CliRunner().invoke(app, ["revise", str(src), "--feedback", "shorter"])
+    assert res.output.strip() == "revised text"
+    assert calls == ["triage", "revise"]
+    assert real_call("review-queue", {"limit": 5}) == {"items": [], "total": 0}
+
+    real_call("shutdown", timeout=10)
+    t.join(10)
+    assert not t.is_alive() and daemon_client.daemon_info() is None
+
+
+def test_forward_falls_back_only_when_daemon_did_not_run_op(monkeypatch, caplog):
+    from echodraft import config
+    from echodraft.ui import daemon_client
+
+    monkeypatch.setattr(config, "DAEMON_FORWARD", True)
+    monkeypatch.setattr(daemon_client, "daemon_info", lambda: {"pid": 1, "host": "127.0.0.1", "port": 1, "token": "t"})
+    for exc in (daemon_client.DaemonError("busy", 503), daemon_client.DaemonError("unknown op 'x'", 404),
+                ConnectionRefusedError()):
+        def call(*a, exc=exc, **kw):
+            raise exc
+        monkeypatch.setattr(daemon_client, "call", call)
+        with caplog.at_level("WARNING", logger="echodraft.ui.daemon_client"):
+            assert daemon_client.forward("draft", {}) == (False, None)
+    assert "busy" in caplog.text and "unknown op" in caplog.text
+    for exc in (daemon_client.DaemonError("RuntimeError: boom", 500), daemon_client.DaemonError("TimeoutError: timed out")):
+        def call(*a, exc=exc, **kw):
+            raise exc
+        monkeypatch.setattr(daemon_client, "call", call)
+        with pytest.raises(daemon_client.DaemonError):
+            daemon_client.forward("draft", {})
+
+
+def test_slow_daemon_is_reported_not_rerun(monkeypatch, fake_llms):
+    from typer.testing import CliRunner
+    from echodraft import config
+    from echodraft.ui import daemon_client
+    from echodraft.ui.cli import app
+
+    # accepts connections (via the backlog) but never answers
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    info = {"pid": 1, "host": "127.0.0.1", "port": sock.getsockname()[1], "token": "t"}
+    monkeypatch.setattr(config, "DAEMON_FORWARD", True)
+    monkeypatch.setattr(daemon_client, "daemon_info", lambda: info)
+    real_call = daemon_client.call
+    monkeypatch.setattr(daemon_client, "call", lambda op, payload=None, info=None, timeout=600:
+                        real_call(op, payload, info, timeout=0.2))
+    fake_llms.update(triage=_LLM(json.dumps({"label": "NOTIFY", "reason": "fyi", "confidence": 0.9})))
+    try:
+        res = CliRunner().invoke(app, ["triage", "--title", "Status", "--content", "all good"])
+    finally:
+        sock.close()
+    assert res.exit_code == 1 and "daemon failed to run triage" in res.output
+    assert "label=" not in res.output
@@ -0,0 +1,49 @@
+def test_style_index_persists_and_adds_incrementally(tmp_path):
+    from echodraft.memory.style_index import StyleIndex
+
+    index = StyleIndex(tmp_path)
+    index.add_samples([
+        "Hey team, quick one: we ship Friday. Shout if anything blocks you.",
+        "Dear Sir or Madam, I am writing to formally request an extension.",
+    ])
+    assert index.retrieve_hints("quick one team, we ship Monday, shout if blocked", k=1)[0].startswith("Hey team")
+
+    reopened = StyleIndex(tmp_path)
+    assert len(reopened) == 2
+    reopened.add_samples(["lol ok ship it 🚀 no meetings pls"])
+    top = StyleIndex(tmp_path).query(["formally request an extension", "ok ship it lol"], k=1)
+    assert [hits[0][0] for hits in top] == [1, 2]
+
+
+def test_in_memory_index_matches_persisted(tmp_path):
+    from echodraft.memory.style_index import StyleIndex
+
+    texts = [f"sample {i} about launch metrics and onboarding" for i in range(50)] + ["completely different words"]
+    mem, disk = StyleIndex(), StyleIndex(tmp_path)
+    mem.add_samples(texts)
+    disk.add_samples(texts[:20])
+    disk.add_samples(texts[20:])
+    assert mem.query(["different words entirely"], k=3) == StyleIndex(tmp_path).query(["different words entirely"], k=3)
+
+
+def test_samples_from_later_batches_read_back(tmp_path):
+    import numpy as np
+    from echodraft.memory.style_index import StyleIndex
+
+    texts = ["first sample text", "second sample text", "third, added later", "fourth, after a crash"]
+    index = StyleIndex(tmp_path)
+    index.add_samples(texts[:2])
+    index.add_samples(texts[2:3])
+    assert [index.sample(i) for i in range(3)] == texts[:3]
+    assert [StyleIndex(tmp_path).sample(i) for i in range(3)] == texts[:3]
+
+    # a crash after appending rows but before meta.json leaves orphans behind
+    with open(tmp_path / "vectors.f32", "ab") as f:
+        np.ones((2, index.dim), dtype=np.float32).tofile(f)
+    with open(tmp_path / "offsets.u64", "ab") as f:
+        np.asarray([999, 1999], dtype=np.uint64).tofile(f)
+    reopened = StyleIndex(tmp_path)
+    reopened.add_samples(texts[3:])
+    again = StyleIndex(tmp_path)
+    assert [again.sample(i) for i in range(4)] == texts
+    assert again.query(["fourth, after a crash"], k=1)[0][0][0] == 3
@@ -0,0 +1,39 @@
+def test_nodes_and_llm_calls_are_recorded(monkeypatch):
+    from echodraft import llm
+    from echodraft.agents.triager import triage_item
+    from echodraft.evaluation.fake_llm import use_fake_llms
+    from echodraft.evaluation.metrics import summarize_metrics
+    from echodraft.graph.builder import clear_graphs
+    from echodraft.memory import llm_cache, telemetry
+
+    monkeypatch.setattr(llm_cache, "_enabled", False)
+    use_fake_llms(latency=0.01)
+    clear_graphs()
+    try:
+        for i in range(3):
+            triage_item({"surface": "email", "title": f"Question {i}", "content": "thoughts?"}, fast_path=True)
+    finally:
+        llm.set_llm_factory(None)
+
+    rows = {(r["kind"], r["name"]): r for r in telemetry.summarize()["rows"]}
+    assert rows[("node", "pre_triage")]["calls"] == 3
+    triage = rows[("node", "triage")]
+    assert triage["calls"] == 3 and sum(triage["labels"].values()) == 3 and triage["p50_ms"] >= 10
+    assert rows[("llm", "triage")]["calls"] == 3 and rows[("llm", "triage")]["in_tokens"] > 0
+    assert rows[("graph", "LangGraph")]["calls"] == 3
+    assert "pre_triage" in summarize_metrics()
+
+
+def test_metrics_store_rotates(monkeypatch):
+    from echodraft import config
+    from echodraft.memory import telemetry
+
+    monkeypatch.setattr(config, "METRICS_MAX_BYTES", 2000)
+    monkeypatch.setattr(config, "METRICS_KEEP_FILES", 2)
+    for i in range(200):
+        telemetry.record("node", "draft", float(i))
+    files = {p.name for p in telemetry.METRICS_DIR.iterdir()}
+    # events.jsonl is absent when the last write itself triggered a rotation
+    assert files - {"events.jsonl"} == {"events.1.jsonl", "events.2.jsonl"}
+    kept = [e["ms"] for e in telemetry.iter_events()]
+    assert kept == sorted(kept) and kept[-1] == 199.0 and len(kept) < 200
@@ -0,0 +1,81 @@
+import json
+import threading
+
+import pytest
+
+
+class _GateSink:
+    """Blocks every export until `release` is set; `timed_out` shows a caller waited on it."""
+
+    def __init__(self, fail: bool = False):
+        self.release = threading.Event()
+        self.fail = fail
+        self.timed_out = False
+        self.exported = 0
+
+    def export(self, creates, updates):
+        self.timed_out |= not self.release.wait(10)
+        if self.fail:
+            raise RuntimeError("sink down")
+        self.exported += len(creates) + len(updates)
+
+
+def test_trace_run_queues_and_exports_to_jsonl(monkeypatch, tmp_path):
+    from echodraft import config
+    from echodraft.evaluation import trace_export
+    from echodraft.evaluation.langsmith_hooks import trace_run
+
+    gate = _GateSink()
+    monkeypatch.setattr(trace_export, "_sinks", lambda: [trace_export.JsonlSink(tmp_path / "traces.jsonl"), gate])
+    monkeypatch.setattr(config, "TRACE_FLUSH_TIMEOUT", 10)
+    trace_export.reset_exporter()
+    try:
+        for i in range(200):
+            with trace_run("draft", tags=["test"], metadata={"i": i}):
+                pass
+        with pytest.raises(ValueError):
+            with trace_run("triage"):
+                raise ValueError("boom")
+        assert not gate.timed_out  # no trace_run waited for the (stalled) sink
+    finally:
+        gate.release.set()
+        trace_export.reset_exporter()  # flushes
+
+    rows = [json.loads(l) for l in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    assert len({r["id"] for r in rows}) == 201
+    done = {r["id"]: r for r in rows if "end_time" in r}
+    assert len(done) == 201 and sum(r["status"] == "error" for r in done.values()) == 1
+    assert all(r["dotted_order"].endswith(r["id"]) for r in rows)
+
+
+def test_exporter_drops_instead_of_blocking():
+    from echodraft.evaluation.trace_export import TraceExporter
+
+    sink = _GateSink()
+    exp = TraceExporter([sink], max_queue=5, batch_size=1, flush_interval=0.01)
+    accepted = []
+    threads = [threading.Thread(target=lambda t=t: accepted.extend(
+                   exp.submit("create", {"id": f"{t}-{i}"}) for i in range(100))) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not sink.timed_out  # every submit returned while the sink was stalled
+    assert exp.stats["submitted"] == sum(accepted)
+    assert exp.stats["dropped"] == 800 - sum(accepted) > 0
+    sink.release.set()
+    assert exp.close(timeout=5)
+    assert sink.exported == exp.stats["exported"] == sum(accepted)
+
+
+def test_failed_batches_are_not_counted_as_exported():
+    from echodraft.evaluation.trace_export import TraceExporter
+
+    sink = _GateSink(fail=True)
+    sink.release.set()
+    exp = TraceExporter([sink], batch_size=1, flush_interval=0.01)
+    for i in range(10):
+        exp.submit("create", {"id": str(i)})
+    assert exp.flush(timeout=5)
+    assert exp.stats["exported"] == 0 and exp.stats["failed"] == 10
+    exp.close()
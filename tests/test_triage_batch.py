@@ -0,0 +1,59 @@
+import io
+import json
+import random
+import time
+from types import SimpleNamespace
+
+
+class _Triage:
+    def invoke(self, prompt, config=None):
+        time.sleep(random.uniform(0, 0.02))  # finish out of order
+        label = "DRAFT_EMAIL" if "Question" in prompt else "NOTIFY"
+        return SimpleNamespace(content=json.dumps({"label": label, "reason": "fake", "confidence": 0.8}))
+
+
+def test_triage_batch_streams_results(fake_llms):
+    from echodraft.agents.triager import triage_batch
+
+    fake_llms["triage"] = _Triage()
+    items = [json.dumps({"id": i, "surface": "email", "title": f"FYI {i}" if i % 2 else f"Question {i}",
+                         "content": "body"}) for i in range(40)]
+    src = io.StringIO("\n".join(items[:20] + ["not json", ""] + items[20:]) + "\n")
+    dst = io.StringIO()
+
+    stats = triage_batch(src, dst, workers=8, ordered=True)
+    rows = [json.loads(l) for l in dst.getvalue().splitlines()]
+    assert stats["items"] == 41 and stats["errors"] == 1
+    assert [r["line"] for r in rows] == sorted(r["line"] for r in rows)
+    assert "error" in rows[20]
+    ok = [r for r in rows if "error" not in r]
+    assert [r["id"] for r in ok] == list(range(40))
+    assert all(r["label"] == ("NOTIFY" if r["id"] % 2 else "DRAFT_EMAIL") for r in ok)
+
+
+def test_packed_triage_falls_back_per_entry(fake_llms):
+    import re
+    from echodraft.agents.triager import triage_items
+
+    prompts = []
+    def invoke(prompt, config=None):
+        prompts.append(prompt)
+        ids = [int(i) for i in re.findall(r"^### Item (\d+)$", prompt, re.MULTILINE)]
+        if not ids:  # single-item fallback call
+            return SimpleNamespace(content=json.dumps({"label": "REVIEW", "reason": "single", "confidence": 0.6}))
+        rows = [{"id": i, "label": "DRAFT_EMAIL", "reason": "packed", "confidence": 0.9} for i in ids]
+        rows[1]["confidence"] = "high"  # garbled entry
+        del rows[2]                      # dropped entry
+        return SimpleNamespace(content="Here you go:\n" + json.dumps(rows))
+    fake_llms["triage"] = SimpleNamespace(invoke=invoke)
+
+    items = [{"surface": "email", "title": f"Question {i}", "content": f"Can we meet about topic {i}?"}
+             for i in range(5)]
+    items.append({"surface": "email", "title": "Newsletter", "content": "Unsubscribe | limited-time sale"})
+    out = triage_items(items)
+
+    assert [r["reason"] for r in out] == ["packed", "single", "single", "packed", "packed",
+                                          "Rule: promotional cue (sale, unsubscribe)."]
+    assert out[5]["source"] == "rules"
+    assert len(prompts) == 3  # one packed call + two single-item retries
+    assert prompts[0].count("Definitions (decide using these") == 1
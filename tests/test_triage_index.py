@@ -0,0 +1,68 @@
+import json
+from types import SimpleNamespace
+
+NEWSLETTER = ("Weekly product digest. The onboarding flow shipped to all customers on Monday and activation "
+              "is up four points week over week. Pricing page copy was refreshed after the last round of "
+              "interviews, and the enterprise tier now lists SSO and audit logs. Support volume dropped "
+              "again thanks to the new help center articles. The roadmap review moves to Thursday; bring "
+              "your top three asks and any blockers. Hiring: two backend roles and one designer are open, "
+              "referrals welcome. Reply to this email with questions for the team.")
+
+
+def test_minhash_groups_near_duplicates(tmp_path, monkeypatch):
+    from echodraft.memory.triage_index import TriageIndex, minhash
+
+    sig = minhash("Digest #41", NEWSLETTER)
+    edited = minhash("Digest #42", "> " + NEWSLETTER.replace("Thursday", "Friday"))
+    other = minhash("Offsite logistics", "Bus leaves at nine, bring a jacket, lunch is at the lake house, "
+                                         "and the evening session covers next quarter hiring plans.")
+    assert minhash("Hi", "thanks!") is None  # too short to fingerprint
+
+    index = TriageIndex(tmp_path / "idx.sqlite", min_similarity=0.8, ttl_seconds=3600)
+    index.add("email", sig, "NOTIFY", "newsletter", 0.8, fingerprint="v1")
+    hit = index.lookup("email", edited, "v1")
+    assert hit["label"] == "NOTIFY" and hit["similarity"] >= 0.8
+    assert index.lookup("email", edited, "v2") is None  # another model or prompt
+    assert index.lookup("notion", edited, "v1") is None  # labels depend on the surface
+    assert index.lookup("email", other, "v1") is None
+
+    import time
+    monkeypatch.setattr(time, "time", lambda: 10**12)
+    assert index.lookup("email", sig, "v1") is None  # expired
+
+
+def test_triage_graph_reuses_decision_for_near_duplicate(fake_llms, caplog):
+    from echodraft.agents.triager import triage_item
+
+    calls = []
+    def invoke(prompt, config=None):
+        calls.append(prompt)
+        return SimpleNamespace(content=json.dumps({"label": "NOTIFY", "reason": "digest", "confidence": 0.8}))
+    fake_llms["triage"] = SimpleNamespace(invoke=invoke)
+
+    first = triage_item({"surface": "email", "title": "Digest #41", "content": NEWSLETTER})
+    with caplog.at_level("INFO", logger="echodraft.graph.nodes"):
+        again = triage_item({"surface": "email", "title": "Digest #41",
+                             "content": NEWSLETTER + "\n\nSent from my phone"})
+    assert len(calls) == 1
+    assert (first["source"], again["source"]) == ("llm", "dedup")
+    assert again["label"] == "NOTIFY"
+    assert "triage reused" in caplog.text
+
+
+def test_eval_triage_does_not_reuse_earlier_decisions(fake_llms, tmp_path):
+    from echodraft.evaluation.triage_eval import evaluate_triage
+
+    calls = []
+    def invoke(prompt, config=None):
+        calls.append(prompt)
+        return SimpleNamespace(content=json.dumps({"label": "NOTIFY", "reason": "digest", "confidence": 0.8}))
+    fake_llms["triage"] = SimpleNamespace(invoke=invoke)
+    data = tmp_path / "triage.jsonl"
+    data.write_text(json.dumps({"surface": "email", "title": "Digest #41", "content": NEWSLETTER,
+                                "label": "NOTIFY"}))
+
+    first = evaluate_triage(str(data), fast_path=True)
+    second = evaluate_triage(str(data), fast_path=True)
+    assert len(calls) == 2
+    assert first["fast_path"]["reused"] == second["fast_path"]["reused"] == 0